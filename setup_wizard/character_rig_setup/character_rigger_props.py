@@ -37,6 +37,18 @@ class CharacterRiggerPropertyGroup(PropertyGroup):
         description='Use Head Tracker',
         default=False
     )
+    use_rig_cache: BoolProperty(
+        name=' Use Rig Cache',
+        description='Reuse the Rigify rig generated for a previous character with the same skeleton instead of '
+            'generating it again. Rigs are cached in the rig_cache folder of the addon',
+        default=False
+    )
+    use_pupil_bones: BoolProperty(
+        name=' Use Pupil Bones',
+        description='Scale the pupils with a bone per eye instead of the pupils shape key, which stores every vertex '
+            'of the Body',
+        default=False
+    )
 
     @staticmethod
     def get_prop(context, prop_name):
@@ -15,6 +15,9 @@ from setup_wizard.import_order import GENSHIN_RIGIFY_BONE_SHAPES_FILE_PATH, Next
     get_cache
 
 from setup_wizard.character_rig_setup.character_rigger_props import CharacterRiggerPropertyGroup
+from setup_wizard.character_rig_setup.rig_operator_counter import RigOperatorCounter
+from setup_wizard.character_rig_setup.rigify_rig_cache import RIG_CACHE_DIRECTORY
+from setup_wizard.utils.armature_utils import get_target_armature
 
 
 class CharacterRiggerFactory:
@@ -51,7 +54,7 @@ class GenshinImpactCharacterRigger(CharacterRigger):
         if not filepath:
             filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RootShape.blend')
 
-        armature = [obj for obj in bpy.data.objects if obj.type == 'ARMATURE'][0]
+        armature = get_target_armature(self.context)
         hand_bones = [bone for bone in armature.pose.bones.values() if 'Hand' in bone.name]
         number_of_hand_bone_children = max([len(hand_bone.children) for hand_bone in hand_bones])
         is_player_hand = number_of_hand_bone_children >= 5
@@ -60,47 +63,54 @@ class GenshinImpactCharacterRigger(CharacterRigger):
 
         # Important that the Armature is selected before performing rigging operations
         bpy.ops.object.select_all(action='DESELECT')
-        armature: Armature = [object for object in bpy.data.objects if object.type == 'ARMATURE'][0]  # expecting 1 armature
+        armature: Armature = get_target_armature(self.context)
         bpy.context.view_layer.objects.active = armature
         armature.select_set(True)
 
         meshes_joined = not (bpy.data.objects.get('Body') and bpy.data.objects.get('Face'))
-        if [material for material in bpy.data.materials.values() if 'Paimon' in material.name]:
-            rig_paimon(
-                filepath,
-                not character_rigger_props.allow_arm_ik_stretch,
-                not character_rigger_props.allow_leg_ik_stretch,
-                character_rigger_props.use_arm_ik_poles,
-                character_rigger_props.use_leg_ik_poles,
-                character_rigger_props.add_children_of_constraints,
-                character_rigger_props.use_head_tracker,
-            )
-        elif not is_player_hand:
-            rig_npc(
-                filepath,
-                not character_rigger_props.allow_arm_ik_stretch,
-                not character_rigger_props.allow_leg_ik_stretch,
-                character_rigger_props.use_arm_ik_poles,
-                character_rigger_props.use_leg_ik_poles,
-                character_rigger_props.add_children_of_constraints,
-                character_rigger_props.use_head_tracker,
-            )                                 
-        else:
-            rig_character(
-                filepath,
-                not character_rigger_props.allow_arm_ik_stretch,
-                not character_rigger_props.allow_leg_ik_stretch,
-                character_rigger_props.use_arm_ik_poles,
-                character_rigger_props.use_leg_ik_poles,
-                character_rigger_props.add_children_of_constraints,
-                character_rigger_props.use_head_tracker,
-                meshes_joined=meshes_joined
-            )
+        with RigOperatorCounter('Rig Character') as rig_operator_counter:
+            if [material for material in bpy.data.materials.values() if 'Paimon' in material.name]:
+                rig_paimon(
+                    filepath,
+                    not character_rigger_props.allow_arm_ik_stretch,
+                    not character_rigger_props.allow_leg_ik_stretch,
+                    character_rigger_props.use_arm_ik_poles,
+                    character_rigger_props.use_leg_ik_poles,
+                    character_rigger_props.add_children_of_constraints,
+                    character_rigger_props.use_head_tracker,
+                )
+            elif not is_player_hand:
+                rig_npc(
+                    filepath,
+                    not character_rigger_props.allow_arm_ik_stretch,
+                    not character_rigger_props.allow_leg_ik_stretch,
+                    character_rigger_props.use_arm_ik_poles,
+                    character_rigger_props.use_leg_ik_poles,
+                    character_rigger_props.add_children_of_constraints,
+                    character_rigger_props.use_head_tracker,
+                )                                 
+            else:
+                rig_character(
+                    filepath,
+                    not character_rigger_props.allow_arm_ik_stretch,
+                    not character_rigger_props.allow_leg_ik_stretch,
+                    character_rigger_props.use_arm_ik_poles,
+                    character_rigger_props.use_leg_ik_poles,
+                    character_rigger_props.add_children_of_constraints,
+                    character_rigger_props.use_head_tracker,
+                    meshes_joined=meshes_joined,
+                    rig_cache_directory=RIG_CACHE_DIRECTORY if character_rigger_props.use_rig_cache else None,
+                    use_pupil_bones=character_rigger_props.use_pupil_bones
+                )
+        rig_operator_summary = ''
+        if rig_operator_counter.enabled:
+            print(rig_operator_counter.get_report())
+            rig_operator_summary = f' ({rig_operator_counter.get_summary()})'
 
         # head_tracker_constraint_influence = 1.0 if character_rigger_props.use_head_tracker else 0.0
         # self.__set_head_tracker_constraint_influence(head_tracker_constraint_influence)
 
-        self.blender_operator.report({'INFO'}, 'Successfully rigged character')
+        self.blender_operator.report({'INFO'}, f'Successfully rigged character{rig_operator_summary}')
 
         NextStepInvoker().invoke(
             self.blender_operator.next_step_idx,
@@ -0,0 +1,58 @@
+'''
+    Helpers for the drivers of the rig scripts (shape key drivers, skirt constraint influence drivers, etc.).
+
+    Blender evaluates a scripted expression made of the simple expression subset (arithmetic, comparisons, min/max
+    and the other math functions, driver variable names) natively, without Python and without needing Auto Run
+    Python Scripts. Anything else (attribute access, other Python functions, 'self') is evaluated by the Python
+    interpreter on every evaluation.
+'''
+
+
+def add_transforms_variable(driver, name, armature, bone_name, transform_type, transform_space='LOCAL_SPACE'):
+    variable = driver.variables.new()
+    variable.name = name
+    variable.type = 'TRANSFORMS'
+    variable.targets[0].id = armature
+    variable.targets[0].bone_target = bone_name
+    variable.targets[0].transform_space = transform_space
+    variable.targets[0].transform_type = transform_type
+    return variable
+
+
+def add_single_property_variable(driver, name, id, data_path):
+    variable = driver.variables.new()
+    variable.name = name
+    variable.type = 'SINGLE_PROP'
+    variable.targets[0].id = id
+    variable.targets[0].data_path = data_path
+    return variable
+
+
+'''
+    Sets the scripted expression of the driver. Warns if Blender can't evaluate the expression as a simple
+    expression, because that driver goes through Python on every frame.
+'''
+def set_simple_expression(driver, expression):
+    driver.type = 'SCRIPTED'
+    driver.expression = expression
+
+    if not driver.is_simple_expression:
+        print(f'WARNING: Driver expression "{expression}" is not a simple expression and is evaluated by Python')
+
+
+# Scripted drivers of the objects and their shape keys: (owner, driver) for every FCurve driver
+def get_scripted_drivers(objects):
+    scripted_drivers = []
+    for object in objects:
+        animated_ids = [object]
+        if object.type == 'MESH' and object.data.shape_keys:
+            animated_ids.append(object.data.shape_keys)
+
+        for animated_id in animated_ids:
+            animation_data = animated_id.animation_data
+            if not animation_data:
+                continue
+            for fcurve in animation_data.drivers:
+                if fcurve.driver.type == 'SCRIPTED':
+                    scripted_drivers.append((animated_id, fcurve.driver))
+    return scripted_drivers
@@ -6,6 +6,10 @@ import os
 from mathutils import Color, Vector
 from math import pi
 
+from setup_wizard.character_rig_setup.rig_engine import create_selection_sets, get_physics_bone_children, \
+    reattach_physics_bones, rename_bones, set_mode
+from setup_wizard.character_rig_setup.rig_specs import NPC_RIG_SPEC
+
 def rig_character(
         file_path, 
         disallow_arm_ik_stretch, 
@@ -25,7 +29,7 @@ def rig_character(
     head_bone_arm_target = bpy.context.active_object
     temp_armature = head_bone_arm_target.data
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
 
     # Check if toe bones exist
     toe_bones_exist = True
@@ -72,212 +76,10 @@ def rig_character(
         head_bone_temp.tail[1] = head_bone_head_y
         head_bone_temp.tail[2] = head_bone_temp.head[2] + 0.0538
         
-    left_eye_2 = []
-    left_eye_1 = []
-    right_eye_2 = []
-    right_eye_1 = []
-
-    if left_eye_exists:
-        left_eye_2.append(temp_armature.edit_bones['+EyeBone L A02'].head[0])       
-        left_eye_2.append(temp_armature.edit_bones['+EyeBone L A02'].head[1])       
-        left_eye_2.append(temp_armature.edit_bones['+EyeBone L A02'].head[2])
-        
-        left_eye_1.append(temp_armature.edit_bones['+EyeBone L A01'].head[0])       
-        left_eye_1.append(temp_armature.edit_bones['+EyeBone L A01'].head[1])       
-        left_eye_1.append(temp_armature.edit_bones['+EyeBone L A01'].head[2])       
-    if right_eye_exists:
-        right_eye_2.append(temp_armature.edit_bones['+EyeBone R A02'].head[0])       
-        right_eye_2.append(temp_armature.edit_bones['+EyeBone R A02'].head[1])       
-        right_eye_2.append(temp_armature.edit_bones['+EyeBone R A02'].head[2])
-        
-        right_eye_1.append(temp_armature.edit_bones['+EyeBone R A01'].head[0])       
-        right_eye_1.append(temp_armature.edit_bones['+EyeBone R A01'].head[1])       
-        right_eye_1.append(temp_armature.edit_bones['+EyeBone R A01'].head[2])  
-            
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    # THANK YOU: https://blenderartists.org/t/how-to-bpy-ops-transform-resize-in-edit-mode-using-pivot/560381/2
-    def get_override(area_type, region_type):
-        for area in bpy.context.screen.areas: 
-            if area.type == area_type:             
-                for region in area.regions:                 
-                    if region.type == region_type:                    
-                        override = {'area': area, 'region': region} 
-                        return override
-        #error message if the area or region wasn't found
-        raise RuntimeError("Wasn't able to find", region_type," in area ", area_type, " Make sure it's open while executing script.")
-
-    #we need to override the context of our operator    
-    override = get_override( 'VIEW_3D', 'WINDOW' )
-
-    # Function to create shape keys from given arguments: Works with only one element in vg to parse
-    def create_shape_key(obj_get, is_basis, shape_name, shape_index, transform_pivot, vertex_groups_to_parse, transform_type, transformation_1, transformation_2=0, use_eye_1=False):
-        bpy.context.view_layer.objects.active = head_bone_arm_target
-        bpy.ops.object.mode_set(mode='EDIT')
-        for this_group in vertex_groups_to_parse:
-            if use_eye_1:
-                if " R " in this_group:
-                    if right_eye_exists:
-                        bpy.context.scene.cursor.location = (right_eye_1[0],right_eye_1[1],right_eye_1[2])
-                elif " L " in this_group:
-                    if left_eye_exists:
-                        bpy.context.scene.cursor.location = (left_eye_1[0],left_eye_1[1],left_eye_1[2])
-            else:
-                if " R " in this_group:
-                    if right_eye_exists:
-                        bpy.context.scene.cursor.location = (right_eye_2[0],right_eye_2[1],right_eye_2[2])
-                elif " L " in this_group:
-                    if left_eye_exists:
-                        bpy.context.scene.cursor.location = (left_eye_2[0],left_eye_2[1],left_eye_2[2])
-                        
-            # AFTER MOVING 3D CURSOR
-            this_obj = bpy.data.objects.get(obj_get)
-            bpy.context.view_layer.objects.active = this_obj
-            
-            if is_basis:
-                this_obj.shape_key_add(name='Basis')
-                
-            this_obj.shape_key_add(from_mix=False)   
-            sk = this_obj.data.shape_keys.key_blocks[-1]
-            sk.name = shape_name
-            sk.value = 1
-            bpy.context.object.active_shape_key_index = shape_index
-            
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='DESELECT')
-            bpy.context.tool_settings.transform_pivot_point = "CURSOR"   
-        
-            try:
-                bpy.ops.object.vertex_group_set_active(group=this_group)
-                bpy.ops.object.vertex_group_select()
-                
-                if transform_type == "RESIZE":
-                    bpy.ops.transform.resize(override, value=(transformation_1), orient_type='LOCAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL', mirror=False, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False, snap=False, snap_elements={'INCREMENT'}, use_snap_project=False, snap_target='CLOSEST', use_snap_self=True, use_snap_edit=True, use_snap_nonedit=True, use_snap_selectable=False)
-                    bpy.ops.object.vertex_group_deselect()
-                elif transform_type == "TRANSLATE":
-                    bpy.ops.transform.translate(override, value=transformation_1, orient_type='LOCAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL', constraint_axis=(False, True, False), mirror=True, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False, snap=False, snap_elements={'INCREMENT'}, use_snap_project=False, snap_target='CLOSEST', use_snap_self=True, use_snap_edit=True, use_snap_nonedit=True, use_snap_selectable=False)
-                    bpy.ops.transform.resize(override, value=transformation_2)
-                    bpy.ops.object.vertex_group_deselect()
-            except:
-                pass
-        
-            bpy.ops.object.vertex_group_deselect()
-            bpy.ops.mesh.select_all(action='DESELECT')
-            bpy.ops.object.mode_set(mode='OBJECT')
-            sk.value = 0.0
-            bpy.context.scene.cursor.location = (0.0,0.0,0.0)
-      
-    # Function to create shape keys that works with 2 elementsa        
-    def create_shape_key2(obj_get, is_basis, shape_name, shape_index, transform_pivot, vertex_groups_to_parse, transform_type, transformation_1, transformation_2=0, use_eye_1=False):
-        bpy.context.view_layer.objects.active = head_bone_arm_target
-        bpy.ops.object.mode_set(mode='EDIT')
-        if use_eye_1:
-            if " R " in vertex_groups_to_parse[0]:
-                if right_eye_exists:
-                    bpy.context.scene.cursor.location = (right_eye_1[0],right_eye_1[1],right_eye_1[2])
-            elif " L " in vertex_groups_to_parse[0]:
-                if left_eye_exists:
-                    bpy.context.scene.cursor.location = (left_eye_1[0],left_eye_1[1],left_eye_1[2])
-        else:
-            if " R " in vertex_groups_to_parse[0]:
-                if right_eye_exists:
-                    bpy.context.scene.cursor.location = (right_eye_2[0],right_eye_2[1],right_eye_2[2])
-            elif " L " in vertex_groups_to_parse[0]:
-                if left_eye_exists:
-                    bpy.context.scene.cursor.location = (left_eye_2[0],left_eye_2[1],left_eye_2[2])
-                        
-        # AFTER MOVING 3D CURSOR
-        this_obj = bpy.data.objects.get(obj_get)
-        bpy.context.view_layer.objects.active = this_obj
-        
-        if is_basis:
-            this_obj.shape_key_add(name='Basis')
-            
-        this_obj.shape_key_add(from_mix=False)   
-        sk = this_obj.data.shape_keys.key_blocks[-1]
-        sk.name = shape_name
-        sk.value = 1
-        bpy.context.object.active_shape_key_index = shape_index
-        
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='DESELECT')
-        bpy.context.tool_settings.transform_pivot_point = "CURSOR" 
-        
-        try:
-            bpy.ops.object.vertex_group_set_active(group=vertex_groups_to_parse[0])
-            bpy.ops.object.vertex_group_select()
-            
-            if transform_type == "RESIZE":
-                bpy.ops.transform.resize(override, value=(transformation_1), orient_type='LOCAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL', mirror=False, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False, snap=False, snap_elements={'INCREMENT'}, use_snap_project=False, snap_target='CLOSEST', use_snap_self=True, use_snap_edit=True, use_snap_nonedit=True, use_snap_selectable=False)
-                bpy.ops.object.vertex_group_deselect()
-            elif transform_type == "TRANSLATE":
-                bpy.ops.transform.translate(override, value=transformation_1, orient_type='LOCAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL', constraint_axis=(False, True, False), mirror=True, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False, snap=False, snap_elements={'INCREMENT'}, use_snap_project=False, snap_target='CLOSEST', use_snap_self=True, use_snap_edit=True, use_snap_nonedit=True, use_snap_selectable=False)
-                bpy.ops.transform.resize(override, value=transformation_2)
-                bpy.ops.object.vertex_group_deselect()
-        except:
-            pass
-        
-        bpy.ops.mesh.select_all(action='DESELECT')
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-        # REPEAT FOR SECOND BONE!
-        
-        bpy.context.view_layer.objects.active = head_bone_arm_target
-        bpy.ops.object.mode_set(mode='EDIT')
-        if use_eye_1:
-            if " R " in vertex_groups_to_parse[1]:
-                if right_eye_exists:
-                    bpy.context.scene.cursor.location = (right_eye_1[0],right_eye_1[1],right_eye_1[2])
-            elif " L " in vertex_groups_to_parse[1]:
-                if left_eye_exists:
-                    bpy.context.scene.cursor.location = (left_eye_1[0],left_eye_1[1],left_eye_1[2])
-        else:
-            if " R " in vertex_groups_to_parse[1]:
-                if right_eye_exists:
-                    bpy.context.scene.cursor.location = (right_eye_2[0],right_eye_2[1],right_eye_2[2])
-            elif " L " in vertex_groups_to_parse[1]:
-                if left_eye_exists:
-                    bpy.context.scene.cursor.location = (left_eye_2[0],left_eye_2[1],left_eye_2[2])
-                        
-        # AFTER MOVING 3D CURSOR
-        this_obj = bpy.data.objects.get(obj_get)
-        bpy.context.view_layer.objects.active = this_obj
-        
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='DESELECT') 
-        
-        try:
-            bpy.ops.object.vertex_group_set_active(group=vertex_groups_to_parse[1])
-            bpy.ops.object.vertex_group_select()
-            
-            if transform_type == "RESIZE":
-                bpy.ops.transform.resize(override, value=(transformation_1), orient_type='LOCAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL', mirror=False, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False, snap=False, snap_elements={'INCREMENT'}, use_snap_project=False, snap_target='CLOSEST', use_snap_self=True, use_snap_edit=True, use_snap_nonedit=True, use_snap_selectable=False)
-                bpy.ops.object.vertex_group_deselect()
-            elif transform_type == "TRANSLATE":
-                bpy.ops.transform.translate(override, value=transformation_1, orient_type='LOCAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL', constraint_axis=(False, True, False), mirror=True, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False, snap=False, snap_elements={'INCREMENT'}, use_snap_project=False, snap_target='CLOSEST', use_snap_self=True, use_snap_edit=True, use_snap_nonedit=True, use_snap_selectable=False)
-                bpy.ops.transform.resize(override, value=transformation_2)
-                bpy.ops.object.vertex_group_deselect()
-        except:
-            pass
-        
-        bpy.ops.mesh.select_all(action='DESELECT')
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-        # DONE
-        sk.value = 0.0
-        bpy.context.scene.cursor.location = (0.0,0.0,0.0)
-
-
-    # Shape key to shrink pupils    
-    #create_shape_key2("Body", True, "pupils", 1, "CURSOR", ["+EyeBoneA02.L","+EyeBoneA02.R"], "RESIZE", (0.5,0.5,0.5))
-    # Shape keys to adjust eye during blink
-    #create_shape_key("Body", False, "pupil-pushback-R", 2, "CURSOR", ["+EyeBoneA02.R"], "TRANSLATE", (0, 0.00703, 0), (1.1,1.1,1.1),use_eye_1=True) # 0.0069, 70
-    #create_shape_key("Body", False, "pupil-pushback-L", 3, "CURSOR", ["+EyeBoneA02.L"], "TRANSLATE", (0, 0.00703, 0), (1.1,1.1,1.1),use_eye_1=True)
-
-    bpy.context.tool_settings.transform_pivot_point = "MEDIAN_POINT"
+    set_mode('OBJECT')
 
     bpy.context.view_layer.objects.active = head_bone_arm_target
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
 
     if not toe_bones_exist:
         r_foot_bone = temp_armature.edit_bones["Bip001 R Foot"]
@@ -288,7 +90,7 @@ def rig_character(
         l_foot_bone.tail = (0.040187,-0.078244,0.005803)
         l_foot_bone.roll =  1.5708
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.context.view_layer.objects.active = head_bone_arm_target
 
     # Let's let the RigUI script that poke made execute.
@@ -300,74 +102,9 @@ def rig_character(
     print("New Run\n\n")
     ## Rename all bones in selected armature to ORG
     original_name = obj.name
-    abadidea = {
-        'Bip001 Pelvis': 'spine',
-        'Bip001 L Thigh': 'thigh.L',
-        'Bip001 L Calf': 'shin.L',
-        'Bip001 L Foot': 'foot.L',
-        'Bip001 L Toe0': 'toe.L',
-        'Bip001 R Thigh': 'thigh.R',
-        'Bip001 R Calf': 'shin.R',
-        'Bip001 R Foot': 'foot.R',
-        'Bip001 R Toe0': 'toe.R',
-        'Bip001 Spine': 'spine.001',
-        'Bip001 Spine1': 'spine.002',
-        'Bip001 L Clavicle': 'shoulder.L',
-        'Bip001 L UpperArm': 'upper_arm.L',
-        'Bip001 L Forearm': 'forearm.L',
-        'Bip001 L Hand': 'hand.L',
-        'Bip001 L Finger0': 'thumb.01.L',
-        'DMZ L 01': 'thumb.01.L',  ##WHERE DO THESE SIX COME FROM LMAO
-        'DMZ L 02': 'thumb.02.L',
-        'DMZ L 03': 'thumb.03.L',
-        'DMZ R 01': 'thumb.01.R',
-        'DMZ R 02': 'thumb.02.R',
-        'DMZ R 03': 'thumb.03.R',    
-        'Bip001 L Finger01': 'thumb.02.L',
-        'Bip001 L Finger02': 'thumb.03.L',
-        'Bip001 L Finger1': 'f_index.01.L',
-        'Bip001 L Finger11': 'f_index.02.L',
-        'Bip001 L Finger12': 'f_index.03.L',
-        'Bip001 L Finger2': 'f_middle.01.L',
-        'Bip001 L Finger21': 'f_middle.02.L',
-        'Bip001 L Finger22': 'f_middle.03.L',
-        'Bip001 L Finger3': 'f_ring.01.L',
-        'Bip001 L Finger31': 'f_ring.02.L',
-        'Bip001 L Finger32': 'f_ring.03.L',
-        'Bip001 L Finger4': 'f_pinky.01.L',
-        'Bip001 L Finger41': 'f_pinky.02.L',
-        'Bip001 L Finger42': 'f_pinky.03.L',
-        'Bip001 Neck': 'spine.004', #YO
-        'Bip001 Head': 'spine.006', #RUHROH
-        'Bip001 R Clavicle': 'shoulder.R',
-        'Bip001 R UpperArm': 'upper_arm.R',
-        'Bip001 R Forearm': 'forearm.R',
-        'Bip001 R Hand': 'hand.R',
-        'Bip001 R Finger0': 'thumb.01.R',
-        'Bip001 R Finger01': 'thumb.02.R',
-        'Bip001 R Finger02': 'thumb.03.R',
-        'Bip001 R Finger1': 'f_index.01.R',
-        'Bip001 R Finger11': 'f_index.02.R',
-        'Bip001 R Finger12': 'f_index.03.R',
-        'Bip001 R Finger2': 'f_middle.01.R',
-        'Bip001 R Finger21': 'f_middle.02.R',
-        'Bip001 R Finger22': 'f_middle.03.R',
-        'Bip001 R Finger3': 'f_ring.01.R',
-        'Bip001 R Finger31': 'f_ring.02.R',
-        'Bip001 R Finger32': 'f_ring.03.R',
-        'Bip001 R Finger4': 'f_pinky.01.R',
-        'Bip001 R Finger41': 'f_pinky.02.R',
-        'Bip001 R Finger42': 'f_pinky.03.R',
-        '+EyeBone R A01': 'eye.R',
-        '+EyeBone L A01': 'eye.L', 
-        '+Breast L A01': 'breast.L',
-        '+Breast R A01': 'breast.R', 
-        }
-    if not toe_bones_exist:
-        del abadidea['Bip001 L Toe0']
-        del abadidea['Bip001 R Toe0']
+    bone_renames = NPC_RIG_SPEC.get_bone_renames(toe_bones_exist)
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     armature = bpy.context.selected_objects[0].data
 
     bpy.ops.armature.select_all(action='DESELECT')
@@ -396,9 +133,7 @@ def rig_character(
         pass
 
     bones_list = obj.pose.bones
-    for bone in bones_list:
-        if bone.name in abadidea:
-            bone.name = abadidea[bone.name]
+    rename_bones(bones_list, bone_renames)
             
 
     #Aw shit here we go again.  This second loop is for making it possible to symmetrize pose bones properly.
@@ -483,7 +218,7 @@ def rig_character(
     except:
         pass
 
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
 
     bpy.ops.object.expykit_convert_bone_names(src_preset='Rigify_Metarig.py', trg_preset='Rigify_Deform.py')
     bpy.ops.object.expykit_extract_metarig(rig_preset='Rigify_Metarig.py', assign_metarig=True)
@@ -493,7 +228,7 @@ def rig_character(
     ## Fixes the tiddy bones.  Expykit, why did you neglect them
 
     metarm = bpy.data.objects["metarig"].data
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     armature = bpy.data.objects[obj.name].data
 
     ## Left side first, right side's xyz is same as left, but x is negative
@@ -533,14 +268,14 @@ def rig_character(
 
 
     # Fixes the finger rolls
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     metapose = bpy.data.objects['metarig'].pose
     metapose.bones["thumb.01.L"].rigify_parameters.primary_rotation_axis = '-X'
     metapose.bones["thumb.01.R"].rigify_parameters.primary_rotation_axis = '-X'                                                                           
                                           
 
     ## This part corrects metarm finger rolls
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
 
     armature = obj.data
@@ -551,7 +286,7 @@ def rig_character(
             o.select_set(True)
 
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     for bone in metarm.edit_bones:
         if "f_" in bone.name or "thumb" in bone.name:
             try:
@@ -562,34 +297,16 @@ def rig_character(
 
     ###########  DETACH PHYSICS BONES,  
 
-    metanames = ['eye.L', 'eye.R', 'spine', 'thigh.L', 'shin.L', 'foot.L', 'toe.L', 'thigh.R', 'shin.R', 'foot.R', 'toe.R', 'spine.001', 'spine.002', 'spine.003', 'breast.L', 'breast.R', 'shoulder.L', 'upper_arm.L', 'forearm.L', 'hand.L', 'thumb.01.L', 'thumb.02.L', 'thumb.03.L', 'f_index.01.L', 'f_index.02.L', 'f_index.03.L', 'f_middle.01.L', 'f_middle.02.L', 'f_middle.03.L', 'f_ring.01.L', 'f_ring.02.L', 'f_ring.03.L', 'f_pinky.01.L', 'f_pinky.02.L', 'f_pinky.03.L', 'spine.004', 'spine.006', 'shoulder.R', 'upper_arm.R', 'forearm.R', 'hand.R', 'thumb.01.R', 'thumb.02.R', 'thumb.03.R', 'f_index.01.R', 'f_index.02.R', 'f_index.03.R', 'f_middle.01.R', 'f_middle.02.R', 'f_middle.03.R', 'f_ring.01.R', 'f_ring.02.R', 'f_ring.03.R', 'f_pinky.01.R', 'f_pinky.02.R', 'f_pinky.03.R']
-    if not toe_bones_exist:
-        metanames.remove("toe.L")
-        metanames.remove("toe.R")
-
-
-    pre_res = ["DEF-" + bonename for bonename in metanames]
+    pre_res = NPC_RIG_SPEC.get_deform_bone_names(toe_bones_exist)
     armature = obj.data ## Original char rig
 
 
     ## Make a dictionary.  Key is a main body bone that exists in the Rigify (arm, leg, spine, etc), and the value is a list of all the children bones that aren't other main body bones (usually hair, clothes, deform, etc.)
-    savethechildren = {
-        
-    }
-    bpy.ops.object.mode_set(mode='EDIT')
-    for bone in armature.edit_bones:
-        if bone.name in pre_res:
-            childlist = []
-            for childbone in armature.edit_bones[bone.name].children:
-                if childbone.name not in pre_res: # Adds only non-main body bones, avoids like forearm or knee etc
-                    childlist.append(childbone.name)
-            if childlist: # If list isn't empty, add it to dict
-                wtf = bone.name
-                savethechildren[wtf] = childlist
+    set_mode('EDIT')
+    savethechildren = get_physics_bone_children(armature.edit_bones, pre_res)
 
-        
     ## Duplicates the physics bones
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     bpy.ops.armature.select_all(action='DESELECT')
     bones = armature.edit_bones[:]
     for bone in bones:
@@ -615,7 +332,7 @@ def rig_character(
             
     # THEN REATTACH PHYSICS
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     ### BLENDER ARE U GOOD LMAO WTF IS THIS (this joins two objects together)
     newrig = armature.name + ".001" ## New temporary armature with the physics bones. Hopefully you didnt touch any names lmao
 
@@ -630,7 +347,7 @@ def rig_character(
     c["object"] = c["active_object"] = bpy.data.objects.get("rigify")
                                             
     c["selected_objects"] = c["selected_editable_objects"] = obs
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
     
     with bpy.context.temp_override(active_object=bpy.data.objects.get("rigify"), selected_editable_objects=obs):
@@ -641,7 +358,7 @@ def rig_character(
     
     setup_neck_and_head_follow(neck_follow_value=1.0, head_follow_value=1.0)
     setup_finger_scale_controls_on_x_axis_to_curl_just_the_fingertips(rigifyr)
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
 
     #### whats this for???
     #oh i think it's useless now bc there's only one rig LMAOLMAO
@@ -651,16 +368,14 @@ def rig_character(
 
     ## Reattach the physics bones to their parents
     #Go back into rigify, find the main body bones, and reattach every bone in the corresponding dict list
-    for mainbone in savethechildren:    
-        for childbone in savethechildren[mainbone]:
-            rigifyr.data.edit_bones[childbone].parent = rigifyr.data.edit_bones[mainbone]
+    reattach_physics_bones(rigifyr.data.edit_bones, savethechildren)
 
     print("donelol\n")
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.data.objects["rigify"].show_in_front = True
 
     # Symmetrize clothes/hair bones
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     for bone in rigifyr.data.edit_bones:
         if " L " in bone.name:  # Finds clothes/hair bones with symmetrical bones
             y = bone.name.find(' L ')  # Finds index of "Hair L 1"
@@ -685,11 +400,8 @@ def rig_character(
     #bpy.ops.object.mode_set(mode='OBJECT')
 
     # This part puts all the main bones I use into the secoond bone layer
-    listofbones = ["root", "foot_heel_ik.R", "foot_heel_ik.L", "toe_ik.R", "toe_ik.L", "foot_ik.R", "foot_ik.L", "thigh_ik_target.R", "thigh_ik_target.L", "hips", "torso", "chest", "neck", "head", "shoulder.L", "shoulder.R", "upper_arm_fk.L", "upper_arm_fk.R", "forearm_fk.L", "forearm_fk.R", "hand_fk.L", "hand_fk.R", "upper_arm_ik_target.L", "upper_arm_ik_target.R", "hand_ik.R", "hand_ik.L", ]
+    listofbones = NPC_RIG_SPEC.get_main_control_bone_names(toe_bones_exist)
     rigifyr = obj
-    if not toe_bones_exist:
-        listofbones.remove("toe_ik.R")
-        listofbones.remove("toe_ik.L")
     if not is_version_4:
         for bone in listofbones:
             bpy.context.active_object.pose.bones[bone].bone.layers[1] = True
@@ -699,46 +411,17 @@ def rig_character(
     bpy.data.objects["rigify"].name = char_name
 
                 
-    bpy.ops.object.mode_set(mode='POSE')   
+    set_mode('POSE')   
     bpy.ops.pose.select_all(action='DESELECT')
     bones_list = obj.pose.bones
 
     # Creates selection sets for FK arms + shoulders, hair bones, and clothes bones.  Selection Sets is an addon that comes with Blender.
     try:
-        bpy.ops.object.mode_set(mode='POSE')
-
-        arms = ['upper_arm_fk', 'forearm_fk', 'hand_fk', 'shoulder']
-        bpy.ops.pose.select_all(action='DESELECT')
-        for side in ['.L', '.R']:
-            for bone in arms:
-                bonename = bone + side
-                rigifyr.pose.bones[bonename].bone.select= True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-
-        ## Hair
-        for bone in bones_list:
-            if "Hair" in bone.name:
-                rigifyr.pose.bones[bone.name].bone.select = True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-
-        ## Clothes
-        for bone in bones_list:
-            if "Amice" in bone.name or ("fk" not in bone.name and "tweak" not in bone.name and "Twist" not in bone.name and "Hair" not in bone.name and (bone.name[-1].isdigit() or bone.name[-3].isdigit())):
-                rigifyr.pose.bones[bone.name].bone.select = True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-        bpy.context.object.selection_sets[0].name = "FK Arms"
-        bpy.context.object.selection_sets[1].name = "Hair"
-        bpy.context.object.selection_sets[2].name = "Clothes...and teeth and eyes lmao"
+        create_selection_sets(rigifyr, NPC_RIG_SPEC.selection_set_specs)
     except:
         pass
 
-    bpy.ops.object.mode_set(mode='EDIT') 
+    set_mode('EDIT') 
     # Deletes the extra useless finger bones
     eatthis = ['f_index.03.L', 'f_index.01.L.001', 'thumb.03.L', 'thumb.01.L.001', 'f_middle.03.L', 'f_middle.01.L.001', 'f_ring.01_master.L', 'f_ring.01.L', 'f_ring.02.L', 'f_ring.03.L', 'f_ring.01.L.001', 'f_pinky.01_master.L', 'f_pinky.01.L', 'f_pinky.02.L', 'f_pinky.03.L', 'f_pinky.01.L.001', 'palm.L', 'f_index.03.R', 'f_index.01.R.001', 'thumb.03.R', 'thumb.01.R.001', 'f_middle.03.R', 'f_middle.01.R.001', 'f_ring.01_master.R', 'f_ring.01.R', 'f_ring.02.R', 'f_ring.03.R', 'f_ring.01.R.001', 'f_pinky.01_master.R', 'f_pinky.01.R', 'f_pinky.02.R', 'f_pinky.03.R', 'f_pinky.01.R.001', 'palm.R']
     for this in eatthis:
@@ -746,27 +429,27 @@ def rig_character(
         rigifyr.data.edit_bones.remove(ugh)
         
     # This workaround is for an issue so stupid i dont even want to explain this lmao                                                                                     
-    bpy.ops.object.mode_set(mode='POSE') 
+    set_mode('POSE') 
     wtf = ['MCH-f_index.02.L', 'MCH-thumb.02.L', 'MCH-f_middle.02.L', 'MCH-f_index.02.R', 'MCH-thumb.02.R', 'MCH-f_middle.02.R', 'MCH-f_index.03.L', 'MCH-thumb.03.L', 'MCH-f_middle.03.L', 'MCH-f_index.03.R', 'MCH-thumb.03.R', 'MCH-f_middle.03.R']
     for this in wtf:
         rigifyr.pose.bones[this].constraints[0].enabled = False
         
         
-    bpy.ops.object.mode_set(mode='EDIT') 
+    set_mode('EDIT') 
     # The scale controls for the fingers are big as hell lmao what.
     sizethis = ['thumb.01_master.L', 'f_index.01_master.L', 'f_middle.01_master.L', 'thumb.01_master.R', 'f_index.01_master.R', 'f_middle.01_master.R']
     for this in sizethis:
         rigifyr.data.edit_bones[this].length *= .25
 
     # This corrects the drivers on the superscale control. Without this fix, the scales operate opposite to how they should.
-    bpy.ops.object.mode_set(mode='POSE')                                                   
+    set_mode('POSE')                                                   
     for oDrv in rigifyr.animation_data.drivers:
         for variable in oDrv.driver.variables:
             for target in variable.targets:
                 if "MCH-f_middle.02_drv" in oDrv.data_path or "MCH-f_index.02_drv" in oDrv.data_path:
                     oDrv.driver.expression += "* -1"        
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     try:
         head_driver_obj = bpy.data.objects.get("Head Driver") or bpy.data.objects.get("Head Origin")
         bpy.context.view_layer.objects.active = head_driver_obj
@@ -894,7 +577,7 @@ def rig_character(
         our_char.select_set(True)
         bpy.context.view_layer.objects.active = our_char
         
-        bpy.ops.object.mode_set(mode='POSE')
+        set_mode('POSE')
 
     # Function to automatically move a bone (if it exists) to the specified bone layer        
     def move_bone(bone_name,to_layer):
@@ -1003,7 +686,7 @@ def rig_character(
     
 
     # Merge the armatures; go into object mode and make sure nothing is selected
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
 
     # Select custom face armature
@@ -1077,7 +760,7 @@ def rig_character(
     armature = ob.data
 
     # In edit mode, select platebone and head controller and set their parent bones.
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     armature.edit_bones['plate-border'].parent = armature.edit_bones['head']                 
     armature.edit_bones['plate-settings'].parent = armature.edit_bones['head']                                                                            
     
@@ -1412,7 +1095,7 @@ def rig_character(
     del_bone("VIS_thigh_ik_pole.R")               
     
     # In pose mode select the rig, then select the bone
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
     faceplate_arm =  bpy.context.scene.objects[char_name]
     selected_bone = faceplate_arm.pose.bones["Plate"]
 
@@ -1468,7 +1151,7 @@ def rig_character(
     ourRig = char_name
 
     # Let's go into object mode and select the three face parts to begin adding shape key drivers
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
 
     bpy.ops.object.select_all(action='DESELECT')
@@ -1586,7 +1269,7 @@ def rig_character(
         our_char.select_set(True)
         bpy.context.view_layer.objects.active = our_char
         
-        bpy.ops.object.mode_set(mode='POSE')
+        set_mode('POSE')
         
 
     # Disable IK Stretching & Turn on IK Poles. Toggle manually as needed.
@@ -1694,7 +1377,7 @@ def rig_character(
     def assign_bone_to_group(bone_name, group_name):
         if not is_version_4:                                                      
             # Switch to object mode
-            bpy.ops.object.mode_set(mode='OBJECT')
+            set_mode('OBJECT')
 
             # Get the armature object
             armature_obj = our_char
@@ -1703,7 +1386,7 @@ def rig_character(
 
             # Switch to pose mode
             bpy.context.view_layer.objects.active = armature_obj
-            bpy.ops.object.mode_set(mode='POSE')
+            set_mode('POSE')
 
             # Get the pose bone
             pose_bone = armature_obj.pose.bones.get(bone_name)
@@ -2496,7 +2179,7 @@ def setup_neck_and_head_follow(neck_follow_value, head_follow_value):
 
 # Make it so that the finger scale controls can be scaled on the X axis to curl in just the fingertips instead of the entire finger.
 def setup_finger_scale_controls_on_x_axis_to_curl_just_the_fingertips(rigified_rig):
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
 
     for oDrv in rigified_rig.animation_data.drivers:
         for variable in oDrv.driver.variables:
@@ -3,6 +3,12 @@
 
 import bpy
 
+from mathutils import Vector
+
+from setup_wizard.character_rig_setup.rig_engine import create_selection_sets, duplicate_edit_bone, \
+    extrude_edit_bone, get_physics_bone_children, reattach_physics_bones, rename_bones, set_mode
+from setup_wizard.character_rig_setup.rig_specs import PAIMON_RIG_SPEC
+
 
 def rig_character(
         file_path, 
@@ -23,71 +29,9 @@ def rig_character(
     print("New Run\n\n")
     ## Rename all bones in selected armature to ORG
     original_name = obj.name
-    abadidea = {
-        'Bip001 Pelvis': 'spine',
-        'Bip001 L Thigh': 'thigh.L',
-        'Bip001 L Calf': 'shin.L',
-        'Bip001 L Foot': 'foot.L',
-        'Bip001 L Toe0': 'toe.L',
-        'Bip001 R Thigh': 'thigh.R',
-        'Bip001 R Calf': 'shin.R',
-        'Bip001 R Foot': 'foot.R',
-        'Bip001 R Toe0': 'toe.R',
-        'Bip001 Spine': 'spine.001',
-        'Bip001 Spine1': 'spine.002',
-        'Bip001 L Clavicle': 'shoulder.L',
-        'Bip001 L UpperArm': 'upper_arm.L',
-        'Bip001 L Forearm': 'forearm.L',
-        'Bip001 L Hand': 'hand.L',
-        'Bip001 L Finger0': 'thumb.01.L',
-        'DMZ L 01': 'thumb.01.L',  ##WHERE DO THESE SIX COME FROM LMAO
-        'DMZ L 02': 'thumb.02.L',
-        'DMZ L 03': 'thumb.03.L',
-        'DMZ R 01': 'thumb.01.R',
-        'DMZ R 02': 'thumb.02.R',
-        'DMZ R 03': 'thumb.03.R',    
-        'Bip001 L Finger01': 'thumb.02.L',
-        'Bip001 L Finger0Nub': 'thumb.03.L',
-        'Bip001 L Finger1': 'f_index.01.L',
-        'Bip001 L Finger11': 'f_index.02.L',
-        'Bip001 L Finger1Nub': 'f_index.03.L',
-        'Bip001 L Finger2': 'f_middle.01.L',
-        'Bip001 L Finger21': 'f_middle.02.L',
-        'Bip001 L Finger2Nub': 'f_middle.03.L',
-        'Bip001 L Finger3': 'f_ring.01.L',
-        'Bip001 L Finger31': 'f_ring.02.L',
-        'Bip001 L Finger3Nub': 'f_ring.03.L',
-        'Bip001 L Finger4': 'f_pinky.01.L',
-        'Bip001 L Finger41': 'f_pinky.02.L',
-        'Bip001 L Finger4Nub': 'f_pinky.03.L',
-        'Bip001 Neck': 'spine.004', #YO
-        'Bip001 Head': 'spine.006', #RUHROH
-        'Bip001 R Clavicle': 'shoulder.R',
-        'Bip001 R UpperArm': 'upper_arm.R',
-        'Bip001 R Forearm': 'forearm.R',
-        'Bip001 R Hand': 'hand.R',
-        'Bip001 R Finger0': 'thumb.01.R',
-        'Bip001 R Finger01': 'thumb.02.R',
-        'Bip001 R Finger0Nub': 'thumb.03.R',
-        'Bip001 R Finger1': 'f_index.01.R',
-        'Bip001 R Finger11': 'f_index.02.R',
-        'Bip001 R Finger1Nub': 'f_index.03.R',
-        'Bip001 R Finger2': 'f_middle.01.R',
-        'Bip001 R Finger21': 'f_middle.02.R',
-        'Bip001 R Finger2Nub': 'f_middle.03.R',
-        'Bip001 R Finger3': 'f_ring.01.R',
-        'Bip001 R Finger31': 'f_ring.02.R',
-        'Bip001 R Finger3Nub': 'f_ring.03.R',
-        'Bip001 R Finger4': 'f_pinky.01.R',
-        'Bip001 R Finger41': 'f_pinky.02.R',
-        'Bip001 R Finger4Nub': 'f_pinky.03.R',
-        '+EyeBone R A01': 'eye.R',
-        '+EyeBone L A01': 'eye.L',   
-        '+Breast L A01': 'breast.L',
-        '+Breast R A01': 'breast.R', 
-        }
-
-    bpy.ops.object.mode_set(mode='EDIT')
+    bone_renames = PAIMON_RIG_SPEC.get_bone_renames()
+
+    set_mode('EDIT')
     armature = bpy.context.selected_objects[0].data
 
     bpy.ops.armature.select_all(action='DESELECT')
@@ -113,9 +57,7 @@ def rig_character(
         pass
 
     bones_list = obj.pose.bones
-    for bone in bones_list:
-        if bone.name in abadidea:
-            bone.name = abadidea[bone.name]
+    rename_bones(bones_list, bone_renames)
             
     #Aw shit here we go again.  This second loop is for making it possible to symmetrize pose bones properly.
     for bone in bones_list:
@@ -189,7 +131,7 @@ def rig_character(
 
     armature.edit_bones["eye.L"].name = "DEF-eye.L"
     armature.edit_bones["eye.R"].name = "DEF-eye.R"
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
 
     bpy.ops.object.expykit_convert_bone_names(src_preset='Rigify_Metarig.py', trg_preset='Rigify_Deform.py')
     bpy.ops.object.expykit_extract_metarig(rig_preset='Rigify_Metarig.py', assign_metarig=True)
@@ -199,7 +141,7 @@ def rig_character(
     ## Fixes the tiddy bones.  Expykit, why did you neglect them
 
     metarm = bpy.data.objects["metarig"].data
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     armature = bpy.data.objects[obj.name].data
 
     ## Left side first, right side's xyz is same as left, but x is negative
@@ -239,7 +181,7 @@ def rig_character(
         
         
     # Fixes the finger rolls
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     metapose = bpy.data.objects['metarig'].pose
     for bone_name in ['f_index', 'f_middle', 'f_ring', 'f_pinky']:
         metapose.bones[f"{bone_name}.01.L"].rigify_parameters.primary_rotation_axis = '-Z'
@@ -249,7 +191,7 @@ def rig_character(
     metapose.bones["thumb.01.R"].rigify_parameters.primary_rotation_axis = '-X'
 
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
 
     armature = obj.data
@@ -258,7 +200,7 @@ def rig_character(
         if o.name in ("metarig", armature.name):
             o.select_set(True)
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     for bone in metarm.edit_bones:
         if "f_" in bone.name or "thumb" in bone.name:
             bone.roll =  armature.edit_bones["DEF-"+bone.name].roll
@@ -266,30 +208,16 @@ def rig_character(
 
     ##########  DETACH PHYSICS BONES,  
 
-    metanames = ['eye.L', 'eye.R', 'spine', 'thigh.L', 'shin.L', 'foot.L', 'toe.L', 'thigh.R', 'shin.R', 'foot.R', 'toe.R', 'spine.001', 'spine.002', 'spine.003', 'breast.L', 'breast.R', 'shoulder.L', 'upper_arm.L', 'forearm.L', 'hand.L', 'thumb.01.L', 'thumb.02.L', 'thumb.03.L', 'f_index.01.L', 'f_index.02.L', 'f_index.03.L', 'f_middle.01.L', 'f_middle.02.L', 'f_middle.03.L', 'f_ring.01.L', 'f_ring.02.L', 'f_ring.03.L', 'f_pinky.01.L', 'f_pinky.02.L', 'f_pinky.03.L', 'spine.004', 'spine.006', 'shoulder.R', 'upper_arm.R', 'forearm.R', 'hand.R', 'thumb.01.R', 'thumb.02.R', 'thumb.03.R', 'f_index.01.R', 'f_index.02.R', 'f_index.03.R', 'f_middle.01.R', 'f_middle.02.R', 'f_middle.03.R', 'f_ring.01.R', 'f_ring.02.R', 'f_ring.03.R', 'f_pinky.01.R', 'f_pinky.02.R', 'f_pinky.03.R']
-
-    pre_res = ["DEF-" + bonename for bonename in metanames]
+    pre_res = PAIMON_RIG_SPEC.get_deform_bone_names()
     armature = obj.data ## Original char rig
 
 
     ## Make a dictionary.  Key is a main body bone that exists in the Rigify (arm, leg, spine, etc), and the value is a list of all the children bones that aren't other main body bones (usually hair, clothes, deform, etc.)
-    savethechildren = {
-        
-    }
-    bpy.ops.object.mode_set(mode='EDIT')
-    for bone in armature.edit_bones:
-        if bone.name in pre_res:
-            childlist = []
-            for childbone in armature.edit_bones[bone.name].children:
-                if childbone.name not in pre_res: # Adds only non-main body bones, avoids like forearm or knee etc
-                    childlist.append(childbone.name)
-            if childlist: # If list isn't empty, add it to dict
-                wtf = bone.name
-                savethechildren[wtf] = childlist
+    set_mode('EDIT')
+    savethechildren = get_physics_bone_children(armature.edit_bones, pre_res)
 
-        
     ## Duplicates the physics bones
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     bpy.ops.armature.select_all(action='DESELECT')
     bones = armature.edit_bones[:]
     for bone in bones:
@@ -313,7 +241,7 @@ def rig_character(
             
     # THEN REATTACH PHYSICS
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     ### BLENDER ARE U GOOD LMAO WTF IS THIS (this joins two objects together)
     newrig = armature.name + ".001" ## New temporary armature with the physics bones. Hopefully you didnt touch any names lmao
 
@@ -328,12 +256,12 @@ def rig_character(
     c["active_object"] = bpy.data.objects[rigifyr.name]
     c["selected_objects"] = obs
     c["selected_editable_objects"] = obs
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.join(c)
 
 
     bpy.context.view_layer.objects.active = bpy.data.objects["rigify"]
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
 
     #### whats this for???
     #oh i think it's useless now bc there's only one rig LMAOLMAO
@@ -343,51 +271,18 @@ def rig_character(
 
     ## Reattach the physics bones to their parents
     #Go back into rigify, find the main body bones, and reattach every bone in the corresponding dict list
-    for mainbone in savethechildren:    
-        for childbone in savethechildren[mainbone]:
-            rigifyr.data.edit_bones[childbone].parent = rigifyr.data.edit_bones[mainbone]
+    reattach_physics_bones(rigifyr.data.edit_bones, savethechildren)
 
     print("donelol\n")
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.data.objects["rigify"].show_in_front = True
 
 
     # # Part 4 te eye rig
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     bpy.ops.armature.select_all(action='DESELECT')    
 
-    select_bone(rigifyr.data.edit_bones["eye.R"])
-    bpy.ops.armature.extrude_move(ARMATURE_OT_extrude={"forked":False}, TRANSFORM_OT_translate={"value":(-0, -0.0473746, -0), "orient_type":'GLOBAL', "orient_matrix":((1, 0, 0), (0, 1, 0), (0, 0, 1)), "orient_matrix_type":'GLOBAL', "constraint_axis":(False, True, False), "mirror":False, "use_proportional_edit":False, "proportional_edit_falloff":'SMOOTH', "proportional_size":1, "use_proportional_connected":False, "use_proportional_projected":False, "snap":False, "snap_elements":{'INCREMENT'}, "use_snap_project":False, "snap_target":'CLOSEST', "use_snap_self":True, "use_snap_edit":True, "use_snap_nonedit":True, "snap_point":(0, 0, 0), "snap_align":False, "snap_normal":(0, 0, 0), "gpencil_strokes":False, "cursor_transform":False, "texture_space":False, "remove_on_cancel":False, "view2d_edge_pan":False, "release_confirm":False, "use_accurate":False, "use_automerge_and_split":False})
-
-
-    rigifyr.data.edit_bones["eye.R.001"].name = "eyeTrack.R"
-
-    select_bone(rigifyr.data.edit_bones["eyeTrack.R"])
-
-    bpy.ops.armature.parent_clear(type='DISCONNECT')
-
-    bpy.ops.transform.translate(value=(-0, -0.110905, -0), orient_type='GLOBAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='GLOBAL', constraint_axis=(False, True, False), mirror=False, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False)
-
-    bpy.ops.armature.duplicate_move(ARMATURE_OT_duplicate={"do_flip_names":False}, TRANSFORM_OT_translate={"value":(-0, -0, -0), "orient_type":'GLOBAL', "orient_matrix":((1, 0, 0), (0, 1, 0), (0, 0, 1)), "orient_matrix_type":'GLOBAL', "constraint_axis":(True, False, False), "mirror":False, "use_proportional_edit":False, "proportional_edit_falloff":'SMOOTH', "proportional_size":1, "use_proportional_connected":False, "use_proportional_projected":False, "snap":False, "snap_elements":{'INCREMENT'}, "use_snap_project":False, "snap_target":'CLOSEST', "use_snap_self":True, "use_snap_edit":True, "use_snap_nonedit":True, "snap_point":(0, 0, 0), "snap_align":False, "snap_normal":(0, 0, 0), "gpencil_strokes":False, "cursor_transform":False, "texture_space":False, "remove_on_cancel":False, "view2d_edge_pan":False, "release_confirm":False, "use_accurate":False, "use_automerge_and_split":False})
-
-    rigifyr.data.edit_bones["eyeTrack.R.001"].name = "eyeRoot"
-
-    rigifyr.data.edit_bones["eyeRoot"].tail.x = rigifyr.data.edit_bones["eyeRoot"].head.x = 0
-
-    bpy.ops.armature.select_all(action='DESELECT')
-
-    rigifyr.data.edit_bones['eyeTrack.R'].parent = rigifyr.data.edit_bones['eyeRoot']
-    rigifyr.data.edit_bones['eyeRoot'].parent = rigifyr.data.edit_bones['head']
-
-
-    select_bone(rigifyr.data.edit_bones["eyeTrack.R"])
-
-    bpy.ops.armature.symmetrize()
-    rigifyr.data.edit_bones['eyeRoot'].parent = None
-            
-    rigifyr.data.edit_bones["eyeTrack.R"].roll = 0
-    rigifyr.data.edit_bones["eyeTrack.L"].roll = 0
-    rigifyr.data.edit_bones["eyeRoot"].roll = 0
+    add_eye_track_bones(rigifyr)
 
     rigifyr.data.edit_bones["+EyeBone L A02"].name = "eye2.L"
     rigifyr.data.edit_bones["+EyeBone R A02"].name = "eye2.R"
@@ -405,7 +300,7 @@ def rig_character(
                 pass
 
 
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
     for bone in ['L', 'R']:
         nc = rigifyr.pose.bones['eye.' + bone].constraints.new(type='DAMPED_TRACK')
         nc.target = bpy.data.objects["rigify"]
@@ -419,15 +314,15 @@ def rig_character(
     rigifyr.pose.bones["thigh_parent.L"]["pole_parent"] = 2
     rigifyr.pose.bones["thigh_parent.R"]["pole_parent"] = 2
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     #change active object to rigifyr
 
     bpy.context.view_layer.objects.active = bpy.data.objects["rigify"]
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
 
     # This part puts all the main bones I use into the secoond bone layer
-    listofbones = ["root", "foot_heel_ik.R", "foot_heel_ik.L", "toe_ik.R", "toe_ik.L", "foot_ik.R", "foot_ik.L", "thigh_ik_target.R", "thigh_ik_target.L", "hips", "torso", "chest", "neck", "head", "eyeRoot", "shoulder.L", "shoulder.R", "upper_arm_fk.L", "upper_arm_fk.R", "forearm_fk.L", "forearm_fk.R", "hand_fk.L", "hand_fk.R", "upper_arm_ik_target.L", "upper_arm_ik_target.R", "hand_ik.R", "hand_ik.L", ]
+    listofbones = PAIMON_RIG_SPEC.get_main_control_bone_names()
 
     for bone in listofbones:
         bpy.context.active_object.pose.bones[bone].bone.layers[1] = True
@@ -439,7 +334,7 @@ def rig_character(
 
 
     # Change any physics bones attached to shoulder to be attached to spine instead bc it's a pain in the ass
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     bones = rigifyr.data.edit_bones[:]
 
     for bone in bones:
@@ -449,46 +344,17 @@ def rig_character(
                 #this is a physics bone, so duplicate it.
                 bone.parent = rigifyr.data.edit_bones["DEF-spine.004"]
                 
-    bpy.ops.object.mode_set(mode='POSE')   
+    set_mode('POSE')   
     bpy.ops.pose.select_all(action='DESELECT')
     bones_list = obj.pose.bones
 
     # Creates selection sets for FK arms + shoulders, hair bones, and clothes bones.  Selection Sets is an addon that comes with Blender.
     try:
-        bpy.ops.object.mode_set(mode='POSE')
-
-        arms = ['upper_arm_fk', 'forearm_fk', 'hand_fk', 'shoulder']
-        bpy.ops.pose.select_all(action='DESELECT')
-        for side in ['.L', '.R']:
-            for bone in arms:
-                bonename = bone + side
-                rigifyr.pose.bones[bonename].bone.select= True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-
-        ## Hair
-        for bone in bones_list:
-            if "Hair" in bone.name:
-                rigifyr.pose.bones[bone.name].bone.select = True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-
-        ## Clothes
-        for bone in bones_list:
-            if "Amice" in bone.name or ("fk" not in bone.name and "tweak" not in bone.name and "Twist" not in bone.name and "Hair" not in bone.name and (bone.name[-1].isdigit() or bone.name[-3].isdigit())):
-                rigifyr.pose.bones[bone.name].bone.select = True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-        bpy.context.object.selection_sets[0].name = "FK Arms"
-        bpy.context.object.selection_sets[1].name = "Hair"
-        bpy.context.object.selection_sets[2].name = "Clothes...and teeth and eyes lmao"
+        create_selection_sets(rigifyr, PAIMON_RIG_SPEC.selection_set_specs)
     except:
         pass
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     try:
         bpy.context.view_layer.objects.active = bpy.data.objects["Head Driver"] or bpy.data.objects["Head Origin"]
         bpy.ops.constraint.childof_set_inverse(constraint="Child Of", owner='OBJECT')
@@ -499,3 +365,45 @@ def rig_character(
     rigifyr.pose.bones["upper_arm_parent.R"]["IK_Stretch"] = 0
     rigifyr.pose.bones["thigh_parent.L"]["IK_Stretch"] = 0
     rigifyr.pose.bones["thigh_parent.R"]["IK_Stretch"] = 0
+
+
+'''
+    Part 4 of the rig, the eye rig: eyeTrack.R/L in front of the eyes, parented to eyeRoot between them.
+    Edit bone data instead of the extrude/translate/duplicate operators, which need a 3D Viewport (no background mode).
+    Needs edit mode.
+'''
+def add_eye_track_bones(rigifyr):
+    # Global translations of the operators, in armature space
+    global_to_armature = rigifyr.matrix_world.inverted().to_3x3()
+
+    # Extrude eyeTrack.R from the tail of eye.R
+    eye_bone = rigifyr.data.edit_bones["eye.R"]
+    eye_track_bone = extrude_edit_bone(
+        rigifyr.data, eye_bone, "eyeTrack.R", eye_bone.tail + global_to_armature @ Vector((0, -0.0473746, 0))
+    )
+
+    # Disconnected and moved forward
+    eye_track_bone.use_connect = False
+    eye_track_offset = global_to_armature @ Vector((0, -0.110905, 0))
+    eye_track_bone.head += eye_track_offset
+    eye_track_bone.tail += eye_track_offset
+
+    # Duplicate of eyeTrack.R in the middle
+    duplicate_edit_bone(rigifyr.data, eye_track_bone, "eyeRoot")
+
+    rigifyr.data.edit_bones["eyeRoot"].tail.x = rigifyr.data.edit_bones["eyeRoot"].head.x = 0
+
+    bpy.ops.armature.select_all(action='DESELECT')
+
+    rigifyr.data.edit_bones['eyeTrack.R'].parent = rigifyr.data.edit_bones['eyeRoot']
+    rigifyr.data.edit_bones['eyeRoot'].parent = rigifyr.data.edit_bones['head']
+
+    eye_track_bone = rigifyr.data.edit_bones["eyeTrack.R"]
+    eye_track_bone.select = eye_track_bone.select_head = eye_track_bone.select_tail = True
+
+    bpy.ops.armature.symmetrize()
+    rigifyr.data.edit_bones['eyeRoot'].parent = None
+
+    rigifyr.data.edit_bones["eyeTrack.R"].roll = 0
+    rigifyr.data.edit_bones["eyeTrack.L"].roll = 0
+    rigifyr.data.edit_bones["eyeRoot"].roll = 0
@@ -0,0 +1,60 @@
+import bpy
+
+from setup_wizard.character_rig_setup.driver_utils import add_transforms_variable, set_simple_expression
+from setup_wizard.character_rig_setup.rig_engine import new_edit_bone_like, set_mode
+
+# Eye bone of the pupil vertex group, after the symmetrize rename of the rig ('+EyeBone L A02' -> '+EyeBoneA02.L')
+EYE_BONE_NAME_FORMATS = ['+EyeBoneA02.{side}', '+EyeBone {side} A02']
+PUPIL_BONE_NAME_FORMAT = 'DEF-pupil.{side}'
+
+
+'''
+    Bone-driven replacement for the pupils shape key. Instead of a shape key that stores every vertex of the mesh,
+    the pupil vertices are deformed by a pupil bone per eye that scales about the eye.
+
+    Adds a pupil bone in the place of each eye bone, parented to it so the pupils still follow the eye, moves the eye
+    bone's vertex group of the mesh to the pupil bone and drives the pupil bone's scale from the control bone the same
+    way the pupils shape key value is driven: control_expression is the shape key driver expression (clamped to 0-1
+    like the shape key value) and pupil_scale the scale of the pupils at value 1.
+    Unlike the shape key, vertices partially weighted to the eye bone are scaled by their weight.
+
+    Returns: True if the pupil bones were set up, False if the rig or the mesh has no eye bones
+'''
+def set_up_pupil_bones(rig, mesh_object, control_bone_name, control_expression, pupil_scale):
+    eye_bone_names = {
+        side: eye_bone_name for side, eye_bone_name in
+            [(side, get_eye_bone_name(rig, mesh_object, side)) for side in ['L', 'R']] if eye_bone_name
+    }
+    if not eye_bone_names or control_bone_name not in rig.pose.bones:
+        return False
+
+    bpy.context.view_layer.objects.active = rig
+    set_mode('EDIT')
+    for side, eye_bone_name in eye_bone_names.items():
+        eye_edit_bone = rig.data.edit_bones[eye_bone_name]
+        pupil_edit_bone = new_edit_bone_like(rig.data, eye_edit_bone, PUPIL_BONE_NAME_FORMAT.format(side=side))
+        pupil_edit_bone.head = eye_edit_bone.head
+        pupil_edit_bone.tail = eye_edit_bone.tail
+        pupil_edit_bone.roll = eye_edit_bone.roll
+        pupil_edit_bone.parent = eye_edit_bone
+        pupil_edit_bone.use_deform = True
+    set_mode('OBJECT')
+
+    for side, eye_bone_name in eye_bone_names.items():
+        pupil_bone_name = PUPIL_BONE_NAME_FORMAT.format(side=side)
+        mesh_object.vertex_groups[eye_bone_name].name = pupil_bone_name
+
+        pupil_pose_bone = rig.pose.bones[pupil_bone_name]
+        for index in range(3):
+            driver = pupil_pose_bone.driver_add('scale', index).driver
+            add_transforms_variable(driver, 'bone', rig, control_bone_name, 'LOC_Y')
+            set_simple_expression(driver, f'1 - {1 - pupil_scale} * min(max({control_expression}, 0), 1)')
+    return True
+
+
+def get_eye_bone_name(rig, mesh_object, side):
+    for eye_bone_name_format in EYE_BONE_NAME_FORMATS:
+        eye_bone_name = eye_bone_name_format.format(side=side)
+        if rig.data.bones.get(eye_bone_name) and mesh_object.vertex_groups.get(eye_bone_name):
+            return eye_bone_name
+    return None
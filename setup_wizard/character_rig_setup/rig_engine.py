@@ -0,0 +1,142 @@
+import bpy
+
+'''
+    Rig steps shared by the avatar (rig_script), NPC (npc_rig_script) and Paimon (paimon_rig_script) rig scripts.
+    The steps take the bone names from the RigSpec (rig_specs) of the rig type.
+'''
+
+
+# mode_set to the mode the active object is already in still runs the operator (and pushes an undo step), skip it
+def set_mode(mode):
+    if bpy.context.object is None or bpy.context.object.mode != mode:
+        bpy.ops.object.mode_set(mode=mode)
+
+
+# Renames the original bones to the metarig bone names (ex. 'Bip001 L Thigh' -> 'thigh.L')
+def rename_bones(pose_bones, bone_renames):
+    for pose_bone in pose_bones:
+        new_bone_name = bone_renames.get(pose_bone.name)
+        if new_bone_name:
+            pose_bone.name = new_bone_name
+
+
+# Settings ARMATURE_OT_extrude copies from the extruded bone (B-Bone shape, envelope weight and display)
+EXTRUDED_EDIT_BONE_ATTRIBUTES = [
+    'display_type', 'use_relative_parent', 'envelope_weight', 'bbone_x', 'bbone_z', 'bbone_rollin', 'bbone_rollout',
+    'bbone_curveinx', 'bbone_curveinz', 'bbone_curveoutx', 'bbone_curveoutz', 'bbone_easein', 'bbone_easeout',
+    'bbone_scalein', 'bbone_scaleout',
+]
+# Settings ARMATURE_OT_duplicate copies, all of them
+DUPLICATED_EDIT_BONE_ATTRIBUTES = EXTRUDED_EDIT_BONE_ATTRIBUTES + [
+    'head', 'tail', 'roll', 'parent', 'use_connect', 'use_inherit_rotation', 'use_envelope_multiply', 'use_deform',
+    'inherit_scale', 'use_local_location', 'show_wire', 'use_cyclic_offset', 'hide_select', 'lock',
+    'envelope_distance', 'head_radius', 'tail_radius', 'bbone_segments', 'bbone_mapping_mode',
+    'bbone_handle_type_start', 'bbone_custom_handle_start', 'bbone_handle_use_scale_start',
+    'bbone_handle_use_ease_start', 'bbone_handle_type_end', 'bbone_custom_handle_end', 'bbone_handle_use_scale_end',
+    'bbone_handle_use_ease_end', 'use_endroll_as_inroll', 'use_scale_easing',
+]
+
+
+# New edit bone in the same bone layers/collections and bone color as the edit bone, like extrude and duplicate
+def new_edit_bone_like(armature, edit_bone, name):
+    new_edit_bone = armature.edit_bones.new(name)
+    if hasattr(edit_bone, 'collections'):
+        for bone_collection in edit_bone.collections:
+            bone_collection.assign(new_edit_bone)
+        new_edit_bone.color.palette = edit_bone.color.palette
+    else:
+        new_edit_bone.layers = edit_bone.layers
+    return new_edit_bone
+
+
+'''
+    Edit bone data version of extrude_move on the tail of the edit bone: a new bone connected to the edit bone,
+    from its tail to the given tail (armature space). The envelope is set like the translate of extrude_move sets it
+    for a bone that had no length. The roll is the edit bone's roll, extrude_move recalculates it from the move.
+'''
+def extrude_edit_bone(armature, edit_bone, name, tail):
+    extruded_edit_bone = new_edit_bone_like(armature, edit_bone, name)
+    copy_edit_bone_attributes(edit_bone, extruded_edit_bone, EXTRUDED_EDIT_BONE_ATTRIBUTES)
+    extruded_edit_bone.head = edit_bone.tail
+    extruded_edit_bone.tail = tail
+    extruded_edit_bone.roll = edit_bone.roll
+
+    length = extruded_edit_bone.length
+    extruded_edit_bone.envelope_distance = 0.25 * length
+    extruded_edit_bone.head_radius = min(0.25 * length, edit_bone.tail_radius)
+    extruded_edit_bone.tail_radius = 0.1 * length
+
+    # After the envelope, the head radius of a connected bone is the tail radius of its parent
+    extruded_edit_bone.parent = edit_bone
+    extruded_edit_bone.use_connect = True
+    return extruded_edit_bone
+
+
+# Edit bone data version of duplicate: a copy of every setting and custom property of the edit bone
+def duplicate_edit_bone(armature, edit_bone, name):
+    duplicated_edit_bone = new_edit_bone_like(armature, edit_bone, name)
+    copy_edit_bone_attributes(edit_bone, duplicated_edit_bone, DUPLICATED_EDIT_BONE_ATTRIBUTES)
+    for property_name, property_value in edit_bone.items():
+        duplicated_edit_bone[property_name] = property_value
+    return duplicated_edit_bone
+
+
+def copy_edit_bone_attributes(edit_bone, target_edit_bone, attribute_names):
+    for attribute_name in attribute_names:
+        if hasattr(edit_bone, attribute_name):
+            setattr(target_edit_bone, attribute_name, getattr(edit_bone, attribute_name))
+
+
+'''
+    Key is a main body bone that exists in the Rigify rig (arm, leg, spine, etc.), and the value is a list of all its
+    children bones that aren't other main body bones (usually hair, clothes, etc.). Needs edit mode.
+'''
+def get_physics_bone_children(edit_bones, deform_bone_names):
+    physics_bone_children = {}
+    for edit_bone in edit_bones:
+        if edit_bone.name in deform_bone_names:
+            child_bone_names = [
+                child_bone.name for child_bone in edit_bone.children if child_bone.name not in deform_bone_names
+            ]
+            if child_bone_names:
+                physics_bone_children[edit_bone.name] = child_bone_names
+    return physics_bone_children
+
+
+# Reattaches the physics bones to their main body bone in the generated rig. Needs edit mode.
+def reattach_physics_bones(edit_bones, physics_bone_children):
+    for main_bone_name, child_bone_names in physics_bone_children.items():
+        main_edit_bone = edit_bones[main_bone_name]
+        for child_bone_name in child_bone_names:
+            edit_bones[child_bone_name].parent = main_edit_bone
+
+
+'''
+    Creates the selection sets (Selection Sets addon, comes with Blender) of the SelectionSetSpecs on the rig.
+    Adds the sets to the rig's data instead of selecting bones and running the selection set operators per set.
+    Like selection_set_assign, which assigns the selected bones, only visible bones are added (hidden ORG-/DEF-/MCH-
+    bones of the Rigify rig can't be selected).
+    Raises AttributeError if the Selection Sets addon is not enabled.
+'''
+def create_selection_sets(rig, selection_set_specs):
+    visible_bone_names = {pose_bone.name for pose_bone in rig.pose.bones if is_pose_bone_visible(rig, pose_bone)}
+    for selection_set_spec in selection_set_specs:
+        bone_names = selection_set_spec.get_bone_names(rig.pose.bones)
+        selection_set = rig.selection_sets.add()
+        selection_set.name = selection_set_spec.name
+        for bone_name in bone_names:
+            if bone_name in visible_bone_names:
+                selection_set.bone_ids.add().name = bone_name
+
+
+# Not hidden and in a visible bone collection (Blender 4.0+) or bone layer
+def is_pose_bone_visible(rig, pose_bone):
+    bone = pose_bone.bone
+    if getattr(pose_bone, 'hide', bone.hide):  # Pose mode hide is on the pose bone from Blender 5.0
+        return False
+    if hasattr(bone, 'collections'):
+        return not bone.collections or any(
+            getattr(bone_collection, 'is_visible_effectively', bone_collection.is_visible) for
+                bone_collection in bone.collections
+        )
+    return any(bone_layer and armature_layer for bone_layer, armature_layer in zip(bone.layers, rig.data.layers))
@@ -0,0 +1,89 @@
+import bpy
+import os
+import time
+
+from collections import Counter
+
+# When set (ex. by the test driver or a benchmark run), the rig operator calls are counted and reported
+COUNT_RIG_OPERATORS_ENVIRONMENT_VARIABLE = 'SETUP_WIZARD_COUNT_RIG_OPERATORS'
+
+
+'''
+    Counts the bpy.ops calls made while rigging a character, so regressions in the number of operator calls and
+    mode switches of the rig scripts are visible.
+    Wraps the call of every bpy.ops operator for the duration of the with block and restores it afterwards.
+    Only enabled when the COUNT_RIG_OPERATORS_ENVIRONMENT_VARIABLE environment variable is set, otherwise the with
+    block leaves bpy.ops untouched and nothing is counted.
+
+    A mode_set to the mode the active object is already in is counted as redundant instead of as a mode switch.
+
+    Usage:
+        with RigOperatorCounter('rig_character') as rig_operator_counter:
+            rig_character(...)
+        if rig_operator_counter.enabled:
+            print(rig_operator_counter.get_report())
+'''
+class RigOperatorCounter:
+    MODE_SET_IDNAME = 'object.mode_set'
+
+    def __init__(self, name):
+        self.name = name
+        self.enabled = is_rig_operator_counter_enabled()
+        self.operator_calls = Counter()
+        self.mode_switches = 0
+        self.redundant_mode_sets = 0
+        self.elapsed_time = 0.0
+        self.__operator_class = None
+        self.__original_call = None
+        self.__start_time = None
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        rig_operator_counter = self
+        self.__operator_class = type(bpy.ops.object.mode_set)
+        self.__original_call = original_call = self.__operator_class.__call__
+
+        def counted_call(operator, *args, **kwargs):
+            rig_operator_counter.count_operator_call(operator.idname_py(), kwargs)
+            return original_call(operator, *args, **kwargs)
+
+        self.__operator_class.__call__ = counted_call
+        self.__start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.enabled:
+            return False
+        self.elapsed_time = time.perf_counter() - self.__start_time
+        self.__operator_class.__call__ = self.__original_call
+        return False
+
+    def count_operator_call(self, idname, kwargs):
+        self.operator_calls[idname] += 1
+
+        if idname == self.MODE_SET_IDNAME:
+            active_object = bpy.context.object
+            if active_object and active_object.mode == kwargs.get('mode') and not kwargs.get('toggle'):
+                self.redundant_mode_sets += 1
+            else:
+                self.mode_switches += 1
+
+    def get_operator_call_count(self):
+        return sum(self.operator_calls.values())
+
+    def get_summary(self):
+        return f'{self.get_operator_call_count()} operator calls, {self.mode_switches} mode switches'
+
+    def get_report(self, number_of_operators=10):
+        report_lines = [
+            f'{self.name}: {self.get_summary()} ({self.redundant_mode_sets} redundant mode sets) '
+            f'in {self.elapsed_time:.2f}s'
+        ]
+        for idname, calls in self.operator_calls.most_common(number_of_operators):
+            report_lines.append(f'    {idname:<45}{calls:>6}')
+        return '\n'.join(report_lines)
+
+
+def is_rig_operator_counter_enabled():
+    return bool(os.environ.get(COUNT_RIG_OPERATORS_ENVIRONMENT_VARIABLE))
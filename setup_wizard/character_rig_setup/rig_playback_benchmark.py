@@ -0,0 +1,241 @@
+import bpy
+import time
+
+from bpy.props import BoolProperty, IntProperty, StringProperty
+from bpy.types import Operator
+
+from setup_wizard.character_rig_setup.driver_utils import get_scripted_drivers
+from setup_wizard.character_rig_setup.rig_specs import MAIN_CONTROL_BONE_NAMES
+from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+from setup_wizard.utils.armature_utils import get_objects_of_armature, get_target_armature
+
+TEST_ANIMATION_ACTION_NAME = 'Rig Playback Benchmark'
+TEST_ANIMATION_OFFSET = 0.05  # Location (m) and rotation (rad) offset of the animated bones halfway the animation
+
+
+class GI_OT_BenchmarkRigPlayback(Operator, CustomOperatorProperties):
+    """Plays the animation of the character and reports the evaluation time per frame of the rig and each mesh"""
+    bl_idname = "hoyoverse.benchmark_rig_playback"
+    bl_label = "Benchmark Rig Playback"
+
+    number_of_frames: IntProperty(
+        name='Number of Frames',
+        default=100,
+        min=1,
+    )
+
+    use_test_animation: BoolProperty(
+        name='Use Test Animation',
+        description='Animate the main controls and the driver bones of the rig instead of playing the rig\'s action',
+        default=True,
+    )
+
+    report_file_path: StringProperty(
+        name='Report File Path',
+        description='Also write the report to this file',
+        default='',
+        subtype='FILE_PATH',
+    )
+
+    def execute(self, context):
+        armature = get_target_armature(context)
+        if not armature:
+            self.report({'ERROR'}, 'No armature found to benchmark')
+            super().clear_custom_properties()
+            return {'CANCELLED'}
+
+        objects = [object for object in get_objects_of_armature(armature, context.scene.objects) if
+                   object.type == 'MESH']
+        rig_playback_benchmark = benchmark_rig_playback(
+            context.scene, armature, objects, self.number_of_frames, self.use_test_animation
+        )
+        report = format_rig_playback_benchmark(rig_playback_benchmark)
+        print(report)
+
+        if self.report_file_path:
+            try:
+                with open(bpy.path.abspath(self.report_file_path), 'w', encoding='utf-8') as report_file:
+                    report_file.write(report + '\n')
+            except OSError as ex:
+                self.report({'WARNING'}, f'Unable to write rig playback benchmark report: {ex}')
+
+        frame_time = rig_playback_benchmark['frame_time']
+        self.report({'INFO'}, f'{armature.name}: {frame_time * 1000:.2f} ms per frame '
+            f'({1 / frame_time if frame_time else 0.0:.1f} FPS), see the console for the breakdown per object')
+        super().clear_custom_properties()
+        return {'FINISHED'}
+
+
+'''
+    Plays the animation with frame_set and measures the evaluation time per frame: once with everything enabled,
+    then once per component with only that component disabled. The time saved is the cost of the component:
+    - the rig: the bone constraints and drivers of the armature
+    - per mesh: its Armature modifiers, its geometry nodes modifiers (outlines, light vectors) and its shape keys
+      (with their drivers)
+    Everything that is disabled is restored afterwards. With use_test_animation the main controls and the driver
+    bones of the rig are keyframed in a temporary action, also removed afterwards.
+
+    Returns: dict with the frame time of the full evaluation and the frame time of each component
+'''
+def benchmark_rig_playback(scene, armature, objects, number_of_frames, use_test_animation=True):
+    original_frame = scene.frame_current
+    original_action = armature.animation_data.action if armature.animation_data else None
+    original_pose = get_pose(armature)
+    test_action = create_test_animation(armature, scene.frame_start, number_of_frames) if use_test_animation else None
+
+    try:
+        frame_time = play_animation(scene, number_of_frames)
+        components = []
+        for object_name, component_name, toggles in get_benchmark_components(armature, objects):
+            original_values = disable(toggles)
+            try:
+                component_frame_time = play_animation(scene, number_of_frames)
+            finally:
+                restore(toggles, original_values)
+            components.append({
+                'object': object_name,
+                'component': component_name,
+                'frame_time': max(0.0, frame_time - component_frame_time),
+            })
+    finally:
+        if test_action:
+            armature.animation_data.action = original_action
+            bpy.data.actions.remove(test_action)
+        set_pose(armature, original_pose)
+        scene.frame_set(original_frame)
+
+    return {
+        'armature': armature.name,
+        'frames': number_of_frames,
+        'frame_time': frame_time,
+        'components': components,
+    }
+
+
+def play_animation(scene, number_of_frames):
+    scene.frame_set(scene.frame_start - 1)  # Warm up, and the first frame is a frame change
+    start = time.perf_counter()
+    for frame in range(scene.frame_start, scene.frame_start + number_of_frames):
+        scene.frame_set(frame)
+    return (time.perf_counter() - start) / number_of_frames
+
+
+'''
+    The components to benchmark: (object name, component name, toggles), where toggles is a list of
+    (data, attribute name, value that disables it). Components without toggles are left out.
+'''
+def get_benchmark_components(armature, objects):
+    rig_toggles = [
+        (constraint, 'mute', True) for pose_bone in armature.pose.bones for constraint in pose_bone.constraints
+    ] + [
+        (fcurve, 'mute', True) for fcurve in (armature.animation_data.drivers if armature.animation_data else [])
+    ]
+    components = [(armature.name, 'Rig (constraints, drivers)', rig_toggles)]
+
+    for object in objects:
+        shape_keys = object.data.shape_keys
+        components.extend([
+            (object.name, 'Armature modifiers', [
+                (modifier, 'show_viewport', False) for modifier in object.modifiers if modifier.type == 'ARMATURE'
+            ]),
+            (object.name, 'Geometry nodes modifiers', [
+                (modifier, 'show_viewport', False) for modifier in object.modifiers if modifier.type == 'NODES'
+            ]),
+            (object.name, 'Shape keys', [
+                (key_block, 'mute', True) for key_block in (shape_keys.key_blocks[1:] if shape_keys else [])
+            ] + [
+                (fcurve, 'mute', True) for fcurve in
+                    (shape_keys.animation_data.drivers if shape_keys and shape_keys.animation_data else [])
+            ]),
+        ])
+    return [component for component in components if component[2]]
+
+
+def disable(toggles):
+    original_values = [getattr(data, attribute_name) for data, attribute_name, _ in toggles]
+    for data, attribute_name, disabled_value in toggles:
+        setattr(data, attribute_name, disabled_value)
+    return original_values
+
+
+def restore(toggles, original_values):
+    for (data, attribute_name, _), original_value in zip(toggles, original_values):
+        setattr(data, attribute_name, original_value)
+
+
+'''
+    Keyframes the main controls of the rig and the bones its drivers read (face controls, etc.):
+    rest pose, offset halfway the animation and back to the rest pose.
+'''
+def create_test_animation(armature, frame_start, number_of_frames):
+    driver_bone_names = {
+        target.bone_target for _, driver in get_scripted_drivers(bpy.data.objects) for variable in driver.variables
+            if variable.type == 'TRANSFORMS' for target in variable.targets if
+                target.id == armature and target.bone_target
+    }
+    pose_bones = [
+        pose_bone for pose_bone in armature.pose.bones if
+            pose_bone.name in MAIN_CONTROL_BONE_NAMES or pose_bone.name in driver_bone_names
+    ]
+
+    if not armature.animation_data:
+        armature.animation_data_create()
+    test_action = bpy.data.actions.new(TEST_ANIMATION_ACTION_NAME)
+    armature.animation_data.action = test_action
+
+    for frame, offset in [
+        (frame_start, 0.0),
+        (frame_start + number_of_frames // 2, TEST_ANIMATION_OFFSET),
+        (frame_start + number_of_frames, 0.0),
+    ]:
+        for pose_bone in pose_bones:
+            pose_bone.location = (offset, offset, offset)
+            pose_bone.keyframe_insert('location', frame=frame)
+            if pose_bone.rotation_mode == 'QUATERNION':
+                pose_bone.rotation_quaternion = (1.0, offset, offset, offset)
+                pose_bone.keyframe_insert('rotation_quaternion', frame=frame)
+            elif pose_bone.rotation_mode != 'AXIS_ANGLE':
+                pose_bone.rotation_euler = (offset, offset, offset)
+                pose_bone.keyframe_insert('rotation_euler', frame=frame)
+    return test_action
+
+
+def get_pose(armature):
+    return {
+        pose_bone.name: (
+            pose_bone.location.copy(),
+            pose_bone.rotation_quaternion.copy(),
+            pose_bone.rotation_euler.copy(),
+            pose_bone.scale.copy(),
+        ) for pose_bone in armature.pose.bones
+    }
+
+
+def set_pose(armature, pose):
+    for pose_bone in armature.pose.bones:
+        if pose_bone.name in pose:
+            pose_bone.location, pose_bone.rotation_quaternion, pose_bone.rotation_euler, pose_bone.scale = \
+                pose[pose_bone.name]
+
+
+def format_rig_playback_benchmark(rig_playback_benchmark):
+    frame_time = rig_playback_benchmark['frame_time']
+    report_lines = [
+        f'Rig playback benchmark: {rig_playback_benchmark["armature"]}, {rig_playback_benchmark["frames"]} frames, '
+        f'{frame_time * 1000:.2f} ms per frame ({1 / frame_time if frame_time else 0.0:.1f} FPS)',
+        f'    {"Object":<30}{"Component":<30}{"ms/frame":>10}{"%":>7}',
+    ]
+
+    attributed_frame_time = 0.0
+    for component in sorted(rig_playback_benchmark['components'], key=lambda component: -component['frame_time']):
+        attributed_frame_time += component['frame_time']
+        report_lines.append(format_component_line(component['object'], component['component'], component['frame_time'],
+                                                  frame_time))
+    report_lines.append(format_component_line('', 'Not attributed', max(0.0, frame_time - attributed_frame_time),
+                                              frame_time))
+    return '\n'.join(report_lines)
+
+
+def format_component_line(object_name, component_name, component_frame_time, frame_time):
+    percentage = component_frame_time / frame_time * 100 if frame_time else 0.0
+    return f'    {object_name:<30}{component_name:<30}{component_frame_time * 1000:>10.3f}{percentage:>7.1f}'
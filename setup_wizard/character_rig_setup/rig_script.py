@@ -6,6 +6,18 @@ import os
 from mathutils import Color, Vector
 from math import pi
 
+from setup_wizard.character_rig_setup.driver_utils import add_single_property_variable, add_transforms_variable, \
+    set_simple_expression
+from setup_wizard.character_rig_setup.rigify_rig_cache import generate_rigify_rig
+from setup_wizard.character_rig_setup.rig_engine import create_selection_sets, get_physics_bone_children, \
+    reattach_physics_bones, rename_bones, set_mode
+from setup_wizard.character_rig_setup.rig_specs import AVATAR_RIG_SPEC
+from setup_wizard.character_rig_setup.rig_timing_report import RigTimingReport
+from setup_wizard.character_rig_setup.pupil_bones import set_up_pupil_bones
+from setup_wizard.character_rig_setup.shape_key_utils import ShapeKeyTransform, add_transformed_shape_key, \
+    get_shape_key_size, remove_unchanged_shape_keys
+from setup_wizard.character_rig_setup.skirt_bones import BACK, FRONT, SIDE, get_skirt_bone_names
+
 def rig_character(
         file_path, 
         disallow_arm_ik_stretch, 
@@ -14,7 +26,10 @@ def rig_character(
         use_leg_ik_poles,
         add_child_of_constraints,
         use_head_tracker,
-        meshes_joined=False):
+        meshes_joined=False,
+        use_shape_key_operators=False,
+        rig_cache_directory=None,
+        use_pupil_bones=False):
     
     # Firstly, let's make a flag to identify the blender version.
     is_version_4 = False
@@ -24,8 +39,10 @@ def rig_character(
                
     head_bone_arm_target = bpy.context.active_object
     temp_armature = head_bone_arm_target.data
+    rig_timing_report = RigTimingReport(head_bone_arm_target.name)
+    rig_timing_report.start_section('Eye Repair')
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
 
     # Check if toe bones exist
     toe_bones_exist = True
@@ -94,7 +111,7 @@ def rig_character(
         right_eye_1.append(temp_armature.edit_bones['+EyeBone R A01'].head[1])       
         right_eye_1.append(temp_armature.edit_bones['+EyeBone R A01'].head[2])  
             
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     
     # THANK YOU: https://blenderartists.org/t/how-to-bpy-ops-transform-resize-in-edit-mode-using-pivot/560381/2
     def get_override(area_type, region_type):
@@ -107,13 +124,39 @@ def rig_character(
         #error message if the area or region wasn't found
         raise RuntimeError("Wasn't able to find", region_type," in area ", area_type, " Make sure it's open while executing script.")
 
-    #we need to override the context of our operator    
-    override = get_override( 'VIEW_3D', 'WINDOW' )
+    #we need to override the context of our operator (only the shape key operators use it, not available in background mode)
+    override = get_override( 'VIEW_3D', 'WINDOW' ) if use_shape_key_operators else None
+
+    def get_eye_pivot(vertex_group_name, use_eye_1):
+        if " R " in vertex_group_name and right_eye_exists:
+            return right_eye_1 if use_eye_1 else right_eye_2
+        elif " L " in vertex_group_name and left_eye_exists:
+            return left_eye_1 if use_eye_1 else left_eye_2
+        return None
+
+    # Same shape key as the edit mode operators below, written directly to the shape key data (no VIEW_3D needed)
+    def create_shape_key_from_data(obj_get, is_basis, shape_name, vertex_groups_to_parse, transform_type, transformation_1, transformation_2=0, use_eye_1=False):
+        this_obj = bpy.data.objects.get(obj_get)
+        pivot = None  # Like the 3D cursor, keeps the previous eye position if the eye does not exist
+        shape_key_transforms = []
+        for this_group in vertex_groups_to_parse:
+            pivot = get_eye_pivot(this_group, use_eye_1) or pivot
+            shape_key_transforms.append(ShapeKeyTransform(this_group, pivot, transform_type, transformation_1, transformation_2))
+        add_transformed_shape_key(this_obj, shape_name, is_basis, shape_key_transforms)
+
+    # Shape keys made by create_shape_key/create_shape_key2 per object name, checked for unchanged shape keys at the end
+    generated_shape_key_names = {}
 
     # Function to create shape keys from given arguments: Works with only one element in vg to parse
     def create_shape_key(obj_get, is_basis, shape_name, transform_pivot, vertex_groups_to_parse, transform_type, transformation_1, transformation_2=0, use_eye_1=False):
+        generated_shape_key_names.setdefault(obj_get, []).append(shape_name)
+        if not use_shape_key_operators:
+            for this_group in vertex_groups_to_parse:
+                create_shape_key_from_data(obj_get, is_basis, shape_name, [this_group], transform_type, transformation_1, transformation_2, use_eye_1)
+            return
+
         bpy.context.view_layer.objects.active = head_bone_arm_target
-        bpy.ops.object.mode_set(mode='EDIT')
+        set_mode('EDIT')
         for this_group in vertex_groups_to_parse:
             if use_eye_1:
                 if " R " in this_group:
@@ -144,7 +187,7 @@ def rig_character(
             shape_index = this_obj.data.shape_keys.key_blocks.keys().index(shape_name)
             bpy.context.object.active_shape_key_index = shape_index
             
-            bpy.ops.object.mode_set(mode='EDIT')
+            set_mode('EDIT')
             bpy.ops.mesh.select_all(action='DESELECT')
             bpy.context.tool_settings.transform_pivot_point = "CURSOR"   
         
@@ -173,14 +216,19 @@ def rig_character(
         
             bpy.ops.object.vertex_group_deselect()
             bpy.ops.mesh.select_all(action='DESELECT')
-            bpy.ops.object.mode_set(mode='OBJECT')
+            set_mode('OBJECT')
             sk.value = 0.0
             bpy.context.scene.cursor.location = (0.0,0.0,0.0)
       
     # Function to create shape keys that works with 2 elementsa        
     def create_shape_key2(obj_get, is_basis, shape_name, transform_pivot, vertex_groups_to_parse, transform_type, transformation_1, transformation_2=0, use_eye_1=False):
+        generated_shape_key_names.setdefault(obj_get, []).append(shape_name)
+        if not use_shape_key_operators:
+            create_shape_key_from_data(obj_get, is_basis, shape_name, vertex_groups_to_parse[:2], transform_type, transformation_1, transformation_2, use_eye_1)
+            return
+
         bpy.context.view_layer.objects.active = head_bone_arm_target
-        bpy.ops.object.mode_set(mode='EDIT')
+        set_mode('EDIT')
         if use_eye_1:
             if " R " in vertex_groups_to_parse[0]:
                 if right_eye_exists:
@@ -210,7 +258,7 @@ def rig_character(
         shape_index = this_obj.data.shape_keys.key_blocks.keys().index(shape_name)
         bpy.context.object.active_shape_key_index = shape_index
         
-        bpy.ops.object.mode_set(mode='EDIT')
+        set_mode('EDIT')
         bpy.ops.mesh.select_all(action='DESELECT')
         bpy.context.tool_settings.transform_pivot_point = "CURSOR" 
         
@@ -239,12 +287,12 @@ def rig_character(
             pass
         
         bpy.ops.mesh.select_all(action='DESELECT')
-        bpy.ops.object.mode_set(mode='OBJECT')
+        set_mode('OBJECT')
         
         # REPEAT FOR SECOND BONE!
         
         bpy.context.view_layer.objects.active = head_bone_arm_target
-        bpy.ops.object.mode_set(mode='EDIT')
+        set_mode('EDIT')
         if use_eye_1:
             if " R " in vertex_groups_to_parse[1]:
                 if right_eye_exists:
@@ -264,7 +312,7 @@ def rig_character(
         this_obj = bpy.data.objects.get(obj_get)
         bpy.context.view_layer.objects.active = this_obj
         
-        bpy.ops.object.mode_set(mode='EDIT')
+        set_mode('EDIT')
         bpy.ops.mesh.select_all(action='DESELECT') 
         
         try:
@@ -291,13 +339,14 @@ def rig_character(
             pass
         
         bpy.ops.mesh.select_all(action='DESELECT')
-        bpy.ops.object.mode_set(mode='OBJECT')
+        set_mode('OBJECT')
         
         # DONE
         sk.value = 0.0
         bpy.context.scene.cursor.location = (0.0,0.0,0.0)
 
 
+    rig_timing_report.start_section('Shape Keys')
     # Shape key to shrink pupils    
     create_shape_key2("Body", True, "pupils", "CURSOR", ["+EyeBone L A02","+EyeBone R A02"], "RESIZE", (0.5,0.5,0.5))
     # Shape keys to adjust eye during blink
@@ -323,7 +372,7 @@ def rig_character(
     bpy.context.tool_settings.transform_pivot_point = "MEDIAN_POINT"
 
     bpy.context.view_layer.objects.active = head_bone_arm_target
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
 
     if not toe_bones_exist:
         r_foot_bone = temp_armature.edit_bones["Bip001 R Foot"]
@@ -334,9 +383,11 @@ def rig_character(
         l_foot_bone.tail = (0.040187,-0.078244,0.005803)
         l_foot_bone.roll =  1.5708
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.context.view_layer.objects.active = head_bone_arm_target
 
+    rig_timing_report.start_section('Metarig')
+
     # Let's let the RigUI script that poke made execute.
 
     context = bpy.context
@@ -346,75 +397,9 @@ def rig_character(
     print("New Run\n\n")
     ## Rename all bones in selected armature to ORG
     original_name = obj.name
-    abadidea = {
-        'Bip001 Pelvis': 'spine',
-        'Bip001 L Thigh': 'thigh.L',
-        'Bip001 L Calf': 'shin.L',
-        'Bip001 L Foot': 'foot.L',
-        'Bip001 L Toe0': 'toe.L',
-        'Bip001 R Thigh': 'thigh.R',
-        'Bip001 R Calf': 'shin.R',
-        'Bip001 R Foot': 'foot.R',
-        'Bip001 R Toe0': 'toe.R',
-        'Bip001 Spine': 'spine.001',
-        'Bip001 Spine1': 'spine.002',
-        'Bip001 Spine2': 'spine.003',
-        'Bip001 L Clavicle': 'shoulder.L',
-        'Bip001 L UpperArm': 'upper_arm.L',
-        'Bip001 L Forearm': 'forearm.L',
-        'Bip001 L Hand': 'hand.L',
-        'Bip001 L Finger0': 'thumb.01.L',
-        'DMZ L 01': 'thumb.01.L',  ##WHERE DO THESE SIX COME FROM LMAO
-        'DMZ L 02': 'thumb.02.L',
-        'DMZ L 03': 'thumb.03.L',
-        'DMZ R 01': 'thumb.01.R',
-        'DMZ R 02': 'thumb.02.R',
-        'DMZ R 03': 'thumb.03.R',    
-        'Bip001 L Finger01': 'thumb.02.L',
-        'Bip001 L Finger02': 'thumb.03.L',
-        'Bip001 L Finger1': 'f_index.01.L',
-        'Bip001 L Finger11': 'f_index.02.L',
-        'Bip001 L Finger12': 'f_index.03.L',
-        'Bip001 L Finger2': 'f_middle.01.L',
-        'Bip001 L Finger21': 'f_middle.02.L',
-        'Bip001 L Finger22': 'f_middle.03.L',
-        'Bip001 L Finger3': 'f_ring.01.L',
-        'Bip001 L Finger31': 'f_ring.02.L',
-        'Bip001 L Finger32': 'f_ring.03.L',
-        'Bip001 L Finger4': 'f_pinky.01.L',
-        'Bip001 L Finger41': 'f_pinky.02.L',
-        'Bip001 L Finger42': 'f_pinky.03.L',
-        'Bip001 Neck': 'spine.004', #YO
-        'Bip001 Head': 'spine.006', #RUHROH
-        'Bip001 R Clavicle': 'shoulder.R',
-        'Bip001 R UpperArm': 'upper_arm.R',
-        'Bip001 R Forearm': 'forearm.R',
-        'Bip001 R Hand': 'hand.R',
-        'Bip001 R Finger0': 'thumb.01.R',
-        'Bip001 R Finger01': 'thumb.02.R',
-        'Bip001 R Finger02': 'thumb.03.R',
-        'Bip001 R Finger1': 'f_index.01.R',
-        'Bip001 R Finger11': 'f_index.02.R',
-        'Bip001 R Finger12': 'f_index.03.R',
-        'Bip001 R Finger2': 'f_middle.01.R',
-        'Bip001 R Finger21': 'f_middle.02.R',
-        'Bip001 R Finger22': 'f_middle.03.R',
-        'Bip001 R Finger3': 'f_ring.01.R',
-        'Bip001 R Finger31': 'f_ring.02.R',
-        'Bip001 R Finger32': 'f_ring.03.R',
-        'Bip001 R Finger4': 'f_pinky.01.R',
-        'Bip001 R Finger41': 'f_pinky.02.R',
-        'Bip001 R Finger42': 'f_pinky.03.R',
-        '+EyeBone R A01': 'eye.R',
-        '+EyeBone L A01': 'eye.L', 
-        '+Breast L A01': 'breast.L',
-        '+Breast R A01': 'breast.R', 
-        }
-    if not toe_bones_exist:
-        del abadidea['Bip001 L Toe0']
-        del abadidea['Bip001 R Toe0']
+    bone_renames = AVATAR_RIG_SPEC.get_bone_renames(toe_bones_exist)
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     armature = bpy.context.selected_objects[0].data
 
     bpy.ops.armature.select_all(action='DESELECT')
@@ -444,9 +429,10 @@ def rig_character(
         pass
 
     bones_list = obj.pose.bones
-    for bone in bones_list:
-        if bone.name in abadidea:
-            bone.name = abadidea[bone.name]
+    rename_bones(bones_list, bone_renames)
+
+    # Name -> edit bone, built once for this edit mode session instead of looking up edit_bones by name in the loops
+    edit_bones_by_name = {edit_bone.name: edit_bone for edit_bone in armature.edit_bones}
     
     # Fix finger rolls - Thanks Poke!
     how_not = ['f_index.01.L', 'f_index.02.L', 'f_index.03.L']
@@ -471,9 +457,9 @@ def rig_character(
         if ".L" in bone.name: 
             whee = bone.name[:-2] + ".R"
             if "f_" in bone.name or "thumb" in bone.name:
-                armature.edit_bones[whee].roll = -armature.edit_bones[bone.name].roll
+                edit_bones_by_name[whee].roll = -edit_bones_by_name[bone.name].roll
             else:
-                armature.edit_bones[bone.name].roll = -armature.edit_bones[whee].roll
+                edit_bones_by_name[bone.name].roll = -edit_bones_by_name[whee].roll
 
     armature.edit_bones["shoulder.L"].roll += 3.14
     armature.edit_bones["shoulder.R"].roll -= 3.14  
@@ -493,17 +479,17 @@ def rig_character(
     for bone in armature.edit_bones:
         if "thumb" in bone.name or "index" in bone.name or "middle" in bone.name or "ring" in bone.name or "pinky" in bone.name:
             if ".L" in bone.name:
-                armature.edit_bones[bone.name].roll -= 1.571 
+                bone.roll -= 1.571 
             else:
-                armature.edit_bones[bone.name].roll += 1.571 
+                bone.roll += 1.571 
         ## Not sure why this bone exist but it's gotta go lmao                                                      
         if bone.name == "Bip001": 
             for childbone in bone.children:
                 if childbone.name != "spine":
-                    armature.edit_bones[childbone.name].parent = armature.edit_bones['spine'] 
+                    childbone.parent = edit_bones_by_name['spine'] 
             armature.edit_bones.remove(bone)
         elif ".L" not in bone.name and ".R" not in bone.name:
-            armature.edit_bones[bone.name].roll = 0
+            bone.roll = 0
 
             
     ## Fixes the weirdass pelvis/spine bone.  Sets the spine's head and tail X to 0.  
@@ -559,7 +545,7 @@ def rig_character(
     except:
         pass
 
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
 
     bpy.ops.object.expykit_convert_bone_names(src_preset='Rigify_Metarig.py', trg_preset='Rigify_Deform.py')
     bpy.ops.object.expykit_extract_metarig(rig_preset='Rigify_Metarig.py', assign_metarig=True)
@@ -569,7 +555,7 @@ def rig_character(
     ## Fixes the tiddy bones.  Expykit, why did you neglect them
 
     metarm = bpy.data.objects["metarig"].data
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     armature = bpy.data.objects[obj.name].data
 
     ## Left side first, right side's xyz is same as left, but x is negative
@@ -609,7 +595,7 @@ def rig_character(
 
 
     # Fixes the finger rolls
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     metapose = bpy.data.objects['metarig'].pose
     for bone_name in ['f_index', 'f_middle', 'f_ring', 'f_pinky']:
         metapose.bones[f"{bone_name}.01.L"].rigify_parameters.primary_rotation_axis = 'Z'
@@ -620,7 +606,7 @@ def rig_character(
                                           
 
     ## This part corrects metarm finger rolls
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
 
     armature = obj.data
@@ -631,42 +617,26 @@ def rig_character(
             o.select_set(True)
 
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     for bone in metarm.edit_bones:
         if "f_" in bone.name or "thumb" in bone.name:
             bone.roll =  armature.edit_bones["DEF-"+bone.name].roll
 
 
-    ##########  DETACH PHYSICS BONES,  
-
-    metanames = ['eye.L', 'eye.R', 'spine', 'thigh.L', 'shin.L', 'foot.L', 'toe.L', 'thigh.R', 'shin.R', 'foot.R', 'toe.R', 'spine.001', 'spine.002', 'spine.003', 'breast.L', 'breast.R', 'shoulder.L', 'upper_arm.L', 'forearm.L', 'hand.L', 'thumb.01.L', 'thumb.02.L', 'thumb.03.L', 'f_index.01.L', 'f_index.02.L', 'f_index.03.L', 'f_middle.01.L', 'f_middle.02.L', 'f_middle.03.L', 'f_ring.01.L', 'f_ring.02.L', 'f_ring.03.L', 'f_pinky.01.L', 'f_pinky.02.L', 'f_pinky.03.L', 'spine.004', 'spine.006', 'shoulder.R', 'upper_arm.R', 'forearm.R', 'hand.R', 'thumb.01.R', 'thumb.02.R', 'thumb.03.R', 'f_index.01.R', 'f_index.02.R', 'f_index.03.R', 'f_middle.01.R', 'f_middle.02.R', 'f_middle.03.R', 'f_ring.01.R', 'f_ring.02.R', 'f_ring.03.R', 'f_pinky.01.R', 'f_pinky.02.R', 'f_pinky.03.R']
-    if not toe_bones_exist:
-        metanames.remove("toe.L")
-        metanames.remove("toe.R")
+    rig_timing_report.start_section('Rigify Generate')
 
+    ##########  DETACH PHYSICS BONES,  
 
-    pre_res = ["DEF-" + bonename for bonename in metanames]
+    pre_res = AVATAR_RIG_SPEC.get_deform_bone_names(toe_bones_exist)
     armature = obj.data ## Original char rig
 
 
     ## Make a dictionary.  Key is a main body bone that exists in the Rigify (arm, leg, spine, etc), and the value is a list of all the children bones that aren't other main body bones (usually hair, clothes, deform, etc.)
-    savethechildren = {
-        
-    }
-    bpy.ops.object.mode_set(mode='EDIT')
-    for bone in armature.edit_bones:
-        if bone.name in pre_res:
-            childlist = []
-            for childbone in armature.edit_bones[bone.name].children:
-                if childbone.name not in pre_res: # Adds only non-main body bones, avoids like forearm or knee etc
-                    childlist.append(childbone.name)
-            if childlist: # If list isn't empty, add it to dict
-                wtf = bone.name
-                savethechildren[wtf] = childlist
+    set_mode('EDIT')
+    savethechildren = get_physics_bone_children(armature.edit_bones, pre_res)
 
-        
     ## Duplicates the physics bones
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     bpy.ops.armature.select_all(action='DESELECT')
     bones = armature.edit_bones[:]
     for bone in bones:
@@ -677,8 +647,11 @@ def rig_character(
             bone.select_head = True
 
     bpy.ops.armature.separate()
-    # Generates rigify rig and renames it to 'rigify'
-    bpy.ops.pose.rigify_generate()
+    # Generates rigify rig (or reuses the cached rig of the same skeleton) and renames it to 'rigify'
+    rigify_rig = generate_rigify_rig(bpy.data.objects["metarig"], obj, rig_cache_directory)
+    if rigify_rig != obj:
+        # The cached rig replaced the original armature and took over its object and armature names
+        obj, armature = rigify_rig, rigify_rig.data
     bpy.data.objects[obj.name].name = "rigify"
     bpy.context.view_layer.objects.active = bpy.data.objects[armature.name + ".001"]
 
@@ -690,7 +663,7 @@ def rig_character(
             
     # THEN REATTACH PHYSICS
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     ### BLENDER ARE U GOOD LMAO WTF IS THIS (this joins two objects together)
     newrig = armature.name + ".001" ## New temporary armature with the physics bones. Hopefully you didnt touch any names lmao
 
@@ -703,7 +676,7 @@ def rig_character(
     c={}
     c["object"] = c["active_object"] = bpy.data.objects.get("rigify")
     c["selected_objects"] = c["selected_editable_objects"] = obs
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
     
     with bpy.context.temp_override(active_object=bpy.data.objects.get("rigify"), selected_editable_objects=obs):
@@ -715,7 +688,7 @@ def rig_character(
     setup_neck_and_head_follow(neck_follow_value=1.0, head_follow_value=1.0)
     setup_finger_scale_controls_on_x_axis_to_curl_just_the_fingertips(rigifyr)
 
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
 
     #### whats this for???
     #oh i think it's useless now bc there's only one rig LMAOLMAO
@@ -725,16 +698,14 @@ def rig_character(
 
     ## Reattach the physics bones to their parents
     #Go back into rigify, find the main body bones, and reattach every bone in the corresponding dict list
-    for mainbone in savethechildren:    
-        for childbone in savethechildren[mainbone]:
-            rigifyr.data.edit_bones[childbone].parent = rigifyr.data.edit_bones[mainbone]
+    reattach_physics_bones(rigifyr.data.edit_bones, savethechildren)
 
     print("donelol\n")
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.data.objects["rigify"].show_in_front = True
 
     # Symmetrize clothes/hair bones
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     for bone in rigifyr.data.edit_bones:
         if " L " in bone.name:  # Finds clothes/hair bones with symmetrical bones
             y = bone.name.find(' L ')  # Finds index of "Hair L 1"
@@ -751,19 +722,15 @@ def rig_character(
     rigifyr.pose.bones["thigh_parent.L"]["pole_parent"] = 2
     rigifyr.pose.bones["thigh_parent.R"]["pole_parent"] = 2
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     #change active object to rigifyr
 
     bpy.context.view_layer.objects.active = bpy.data.objects["rigify"]
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
 
     # This part puts all the main bones I use into the secoond bone layer
-    listofbones = ["root", "foot_heel_ik.R", "foot_heel_ik.L", "toe_ik.R", "toe_ik.L", "foot_ik.R", "foot_ik.L", "thigh_ik_target.R", "thigh_ik_target.L", "hips", "torso", "chest", "neck", "head", "shoulder.L", "shoulder.R", "upper_arm_fk.L", "upper_arm_fk.R", "forearm_fk.L", "forearm_fk.R", "hand_fk.L", "hand_fk.R", "upper_arm_ik_target.L", "upper_arm_ik_target.R", "hand_ik.R", "hand_ik.L", ]
-
-    if not toe_bones_exist:
-        listofbones.remove("toe_ik.R")
-        listofbones.remove("toe_ik.L")
+    listofbones = AVATAR_RIG_SPEC.get_main_control_bone_names(toe_bones_exist)
         
     if not is_version_4:
         for bone in listofbones:
@@ -778,42 +745,13 @@ def rig_character(
     char_name = x[-1]
     bpy.data.objects["rigify"].name = char_name + "Rig"
                 
-    bpy.ops.object.mode_set(mode='POSE')   
+    set_mode('POSE')   
     bpy.ops.pose.select_all(action='DESELECT')
     bones_list = obj.pose.bones
 
     # Creates selection sets for FK arms + shoulders, hair bones, and clothes bones.  Selection Sets is an addon that comes with Blender.
     try:
-        bpy.ops.object.mode_set(mode='POSE')
-
-        arms = ['upper_arm_fk', 'forearm_fk', 'hand_fk', 'shoulder']
-        bpy.ops.pose.select_all(action='DESELECT')
-        for side in ['.L', '.R']:
-            for bone in arms:
-                bonename = bone + side
-                rigifyr.pose.bones[bonename].bone.select= True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-
-        ## Hair
-        for bone in bones_list:
-            if "Hair" in bone.name:
-                rigifyr.pose.bones[bone.name].bone.select = True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-
-        ## Clothes
-        for bone in bones_list:
-            if "Amice" in bone.name or ("fk" not in bone.name and "tweak" not in bone.name and "Twist" not in bone.name and "Hair" not in bone.name and (bone.name[-1].isdigit() or bone.name[-3].isdigit())):
-                rigifyr.pose.bones[bone.name].bone.select = True
-        bpy.ops.pose.selection_set_add()
-        bpy.ops.pose.selection_set_assign()
-        bpy.ops.pose.select_all(action='DESELECT')
-        bpy.context.object.selection_sets[0].name = "FK Arms"
-        bpy.context.object.selection_sets[1].name = "Hair"
-        bpy.context.object.selection_sets[2].name = "Clothes...and teeth and eyes lmao"
+        create_selection_sets(rigifyr, AVATAR_RIG_SPEC.selection_set_specs)
     except:
         pass
     
@@ -833,7 +771,7 @@ def rig_character(
             rig.pose.bones[bone + side].lock_scale[0] = False
 
     # Fix face shading being offset 90 degrees
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     try:
         head_driver_obj = bpy.data.objects.get("Head Driver") or bpy.data.objects.get("Head Origin")
         bpy.context.view_layer.objects.active = head_driver_obj
@@ -841,6 +779,8 @@ def rig_character(
     except:
         pass
 
+    rig_timing_report.start_section('Custom Bones')
+
     # POST RIGIFY SCRIPT EXECUTION ----------------->
 
     # Hide metarig (I think you can actually delete it instead?)
@@ -961,7 +901,7 @@ def rig_character(
         our_char.select_set(True)
         bpy.context.view_layer.objects.active = our_char
         
-        bpy.ops.object.mode_set(mode='POSE')
+        set_mode('POSE')
 
     # Function to automatically move a bone (if it exists) to the specified bone layer. pass in num+1 than layer desired.        
     def move_bone(bone_name,to_layer):
@@ -1073,7 +1013,7 @@ def rig_character(
     
 
     # Merge the armatures; go into object mode and make sure nothing is selected
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
 
     # Select custom face armature
@@ -1152,7 +1092,7 @@ def rig_character(
     armature = ob.data
 
     # In edit mode, select platebone and head controller and set their parent bones.
-    bpy.ops.object.mode_set(mode='EDIT')
+    set_mode('EDIT')
     armature.edit_bones['plate-border'].parent = armature.edit_bones['head']
     armature.edit_bones['plate-settings'].parent = armature.edit_bones['head']
     
@@ -1487,88 +1427,21 @@ def rig_character(
     del_bone("palm.L")
     del_bone("palm.R")
 
-    # Function that validates bone name given for respective area. (if bone passes checks to be considered front)
-    def validate_skirt(bone_name, area):
-        # Below is the list of bone 'prefix's we consider valid to send into the skirt/dress lists
-        if bone_name.startswith("+Skirt"):
-            temp_name = bone_name[6:]
-        elif bone_name.startswith("+Hem"):
-            temp_name = bone_name[4:]
-        elif bone_name.startswith("+Overcoat"):
-            temp_name = bone_name[9:]
-        elif bone_name.startswith("+VisionPelvis"):
-            temp_name = bone_name[13:]
-        else: return False
-                  
-        if area == "FRONT":
-            if temp_name[0] == "F":
-                return True
-            
-        elif area == "SIDE":
-            if temp_name[0] == "S":
-                return True
-            
-        elif area == "BACK":
-            if temp_name[0] == "B":
-                return True
-            
-        else: return False
-    # Certain bones with skirt naming exist with pelvis spine as parent, but theyre NOT skirt bones we want. remove them.    
-    def trunc_bad_bones(pb, current=None):
-        bad = []
-        if current is None:
-            current = pb
-        
-        current_bone = armature.edit_bones[current]
-        
-        for bone in armature.edit_bones:
-            if bone.parent == current_bone:
-                bad.append(bone.name)
-                bad.extend(trunc_bad_bones(pb, bone.name))
-                
-        return bad
-    
-    list_of_bad_bones = trunc_bad_bones("DEF-spine.003")
+    rig_timing_report.start_section('Skirt Constraints')
 
-    # Functions that loop through skirt bones (Front, Sides, Back) each return a list
-    def identify_children_for_skirt(pb, current=None, excluded_parent="DEF-spine.003"):
-        child_bones = []
-        if current is None:
-            current = pb
-        
-        current_bone = armature.edit_bones[current]
-        
-        for bone in armature.edit_bones:
-            if bone.parent == excluded_parent:
-                continue
-            elif bone.parent == current_bone:
-                child_bones.append(bone)
-                child_bones.extend(identify_children_for_skirt(pb, bone.name, excluded_parent))
-                
-        return child_bones
-    
+    # Skirt bones (Front, Sides, Back) under the pelvis. Bones with skirt naming parented to the chest are NOT skirt bones we want.
     parent_bone_name = "DEF-spine.001"
     weird_skeletons = ["Clorinde"]
     for s in weird_skeletons:
         if s in char_name:
             parent_bone_name = "+PelvisTwist CF A01"
-            
-    skirt_children = identify_children_for_skirt(parent_bone_name)
-    
-    def scan_skirt(area):
-        skirt_bones = []
-             
-        for edit_bone in skirt_children:
-            if edit_bone.name not in list_of_bad_bones:
-                if validate_skirt(edit_bone.name, area):
-                    skirt_bones.append(edit_bone.name)
 
-        return skirt_bones
+    skirt_bone_names = get_skirt_bone_names(armature.edit_bones, parent_bone_name, excluded_bone_name="DEF-spine.003")
 
     # On each list, straighten the bone (Straighten on the head)
-    front_skirt_bones = scan_skirt("FRONT")
-    side_skirt_bones = scan_skirt("SIDE")
-    back_skirt_bones = scan_skirt("BACK")
+    front_skirt_bones = skirt_bone_names[FRONT]
+    side_skirt_bones = skirt_bone_names[SIDE]
+    back_skirt_bones = skirt_bone_names[BACK]
 
     def zero_roll(bone_name):
         this_bone = armature.edit_bones[bone_name].roll = 0
@@ -1581,7 +1454,7 @@ def rig_character(
     for bone in back_skirt_bones:
         zero_roll(bone)                                                            
     # In pose mode select the rig, then select the bone
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
     faceplate_arm =  bpy.context.scene.objects[char_name+"Rig"]
     selected_bone = faceplate_arm.pose.bones["Plate"]
 
@@ -1666,45 +1539,17 @@ def rig_character(
         if driver and name != "X":
             influence_driver = co.driver_add("influence").driver
             # DRIVER STUFF
-            var = influence_driver.variables.new()
-            var.name = "bone"
-            var.type = 'TRANSFORMS'
-            
-            var.targets[0].id = armature
-            var.targets[0].bone_target = bone
-            var.targets[0].transform_space = 'LOCAL_SPACE'
-            var.targets[0].transform_type = trans_rot
-            
-            var2 = influence_driver.variables.new()
-            var2.name = "toggle"
-            var2.type = "SINGLE_PROP"
-            
-            var2.targets[0].id = armature
-            var2.targets[0].data_path = "pose.bones[\"plate-settings\"][\"Toggle Skirt Constraints\"]"
-
-            influence_driver.type = 'SCRIPTED'
-            influence_driver.expression = "(" + expression + ")*toggle" 
-
-            depsgraph = bpy.context.evaluated_depsgraph_get()
-            depsgraph.update()
+            add_transforms_variable(influence_driver, "bone", armature, bone, trans_rot)
+            add_single_property_variable(influence_driver, "toggle", armature, "pose.bones[\"plate-settings\"][\"Toggle Skirt Constraints\"]")
+            set_simple_expression(influence_driver, "(" + expression + ")*toggle")
             # END DRIVER STUFF
             
         # drivers for just the sides    
         elif driver and name == "X":
             influence_driver = co.driver_add("influence").driver
             # DRIVER STUFF
-            var2 = influence_driver.variables.new()
-            var2.name = "toggle"
-            var2.type = "SINGLE_PROP"
-            
-            var2.targets[0].id = armature
-            var2.targets[0].data_path = "pose.bones[\"plate-settings\"][\"Toggle Skirt Constraints\"]"
-
-            influence_driver.type = 'SCRIPTED'
-            influence_driver.expression = "toggle" 
-
-            depsgraph = bpy.context.evaluated_depsgraph_get()
-            depsgraph.update()
+            add_single_property_variable(influence_driver, "toggle", armature, "pose.bones[\"plate-settings\"][\"Toggle Skirt Constraints\"]")
+            set_simple_expression(influence_driver, "toggle")
             
         co.target_space = "LOCAL"
         co.owner_space = "LOCAL"
@@ -1857,8 +1702,10 @@ def rig_character(
     for bone in back_skirt_bones:
         add_leg_follow_const(bone, "BACK")
 
+    rig_timing_report.start_section('Drivers')
+
     # Let's go into object mode and select the three face parts to begin adding shape key drivers
-    bpy.ops.object.mode_set(mode='OBJECT')
+    set_mode('OBJECT')
     bpy.ops.object.select_all(action='DESELECT')
 
     bpy.ops.object.select_all(action='DESELECT')
@@ -1874,21 +1721,10 @@ def rig_character(
         driver = shape_key.driver_add("value").driver
 
         # Create variables for the driver
-        var = driver.variables.new()
-        var.name = "bone"
-        var.type = 'TRANSFORMS'
-        var.targets[0].id = armature
-        var.targets[0].bone_target = bone_name
-        var.targets[0].transform_space = 'LOCAL_SPACE'
-        var.targets[0].transform_type = transform
+        add_transforms_variable(driver, "bone", armature, bone_name, transform)
 
         # Create the scripted expression driver
-        driver.type = 'SCRIPTED'
-        driver.expression = expression  
-
-        # Update the dependencies
-        depsgraph = bpy.context.evaluated_depsgraph_get()
-        depsgraph.update()
+        set_simple_expression(driver, expression)
         
     # BROW SHAPE KEYS 
     # Get the selected object with the shape key
@@ -1967,39 +1803,12 @@ def rig_character(
         driver = shape_key.driver_add("value").driver
 
         # Create variables for the driver
-        var = driver.variables.new()
-        var.name = "invisA"
-        var.type = 'TRANSFORMS'
-        var.targets[0].id = armature
-        var.targets[0].bone_target = bn1
-        var.targets[0].transform_space = 'LOCAL_SPACE'
-        var.targets[0].transform_type = transform
-        
-        # Create variables for the driver
-        var1 = driver.variables.new()
-        var1.name = "invisB"
-        var1.type = 'TRANSFORMS'
-        var1.targets[0].id = armature
-        var1.targets[0].bone_target = bn2
-        var1.targets[0].transform_space = 'LOCAL_SPACE'
-        var1.targets[0].transform_type = transform
-        
-        # Create variables for the driver
-        var2 = driver.variables.new()
-        var2.name = "invisC"
-        var2.type = 'TRANSFORMS'
-        var2.targets[0].id = armature
-        var2.targets[0].bone_target = bn3
-        var2.targets[0].transform_space = 'LOCAL_SPACE'
-        var2.targets[0].transform_type = transform
+        add_transforms_variable(driver, "invisA", armature, bn1, transform)
+        add_transforms_variable(driver, "invisB", armature, bn2, transform)
+        add_transforms_variable(driver, "invisC", armature, bn3, transform)
 
         # Create the scripted expression driver
-        driver.type = 'SCRIPTED'
-        driver.expression = expression  
-
-        # Update the dependencies
-        depsgraph = bpy.context.evaluated_depsgraph_get()
-        depsgraph.update()
+        set_simple_expression(driver, expression)
     obj = bpy.data.objects.get("Body")
     try:
         makeCon2("pupil-pushback-R","WinkA-R-Invis","WinkB-R-Invis","WinkC-R-Invis","max(invisA * -1.55, invisB * -1.55, invisC * -1.55)","LOC_Y") # -1.45
@@ -2022,10 +1831,19 @@ def rig_character(
     obj = bpy.data.objects.get("Body")  
     bpy.ops.object.select_all(action='DESELECT')
 
-    try:
-        makeCon("pupils","Eye-Pupil-Control","bone * -2.4","LOC_Y")
-    except:
-        pass
+    # Pupil bones scale the pupils like the pupils shape key (0.5 at full control) without a shape key of the whole Body
+    removed_shape_key_names = []
+    saved_shape_key_size = 0
+    if use_pupil_bones and obj and obj.data.shape_keys and obj.data.shape_keys.key_blocks.get("pupils") and \
+            set_up_pupil_bones(bpy.data.objects[ourRig], obj, "Eye-Pupil-Control", "bone * -2.4", 0.5):
+        obj.shape_key_remove(obj.data.shape_keys.key_blocks["pupils"])
+        removed_shape_key_names.append("pupils")
+        saved_shape_key_size += get_shape_key_size(obj)
+    else:
+        try:
+            makeCon("pupils","Eye-Pupil-Control","bone * -2.4","LOC_Y")
+        except:
+            pass
 
     # Going into pose mode with our character selected.
     bpy.ops.object.select_all(action='DESELECT')
@@ -2034,34 +1852,27 @@ def rig_character(
         our_char.select_set(True)
         bpy.context.view_layer.objects.active = our_char
         
-        bpy.ops.object.mode_set(mode='POSE')
+        set_mode('POSE')
         
         
     def add_driver_to_eyelid():
         eyelid_invis_bone = bpy.context.scene.objects[char_name+"Rig"].pose.bones["eyelid-invis-control"]
         eyelid_control_driver = eyelid_invis_bone.driver_add('location', 1).driver
         # Create variables for the driver
-        var = eyelid_control_driver.variables.new()
-        var.name = "bone"
-        var.type = 'TRANSFORMS'
-        var.targets[0].id = bpy.data.objects.get(ourRig)
-        var.targets[0].bone_target = "eyetrack"
-        var.targets[0].transform_space = 'LOCAL_SPACE'
-        var.targets[0].transform_type = "LOC_Y"
+        add_transforms_variable(eyelid_control_driver, "bone", bpy.data.objects.get(ourRig), "eyetrack", "LOC_Y")
 
         # Create the scripted expression driver
-        eyelid_control_driver.type = 'SCRIPTED'
-        eyelid_control_driver.expression = "bone * 5"  
-
-        # Update the dependencies
-        depsgraph = bpy.context.evaluated_depsgraph_get()
-        depsgraph.update()
+        set_simple_expression(eyelid_control_driver, "bone * 5")
 
     try:
         add_driver_to_eyelid()
     except: 
         pass
 
+    # Update the dependencies of the skirt constraint and shape key drivers once, instead of after every driver
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    depsgraph.update()
+
     # Disable IK Stretching & Turn on IK Poles. Toggle manually as needed.
     if disallow_leg_ik_stretch:
         bpy.data.objects[char_name+"Rig"].pose.bones["thigh_parent.L"]["IK_Stretch"] = 0.0
@@ -2164,12 +1975,14 @@ def rig_character(
         head_pole_const.target = bpy.data.objects.get("Head_Pole") 
         head_pole_const.track_axis = "TRACK_NEGATIVE_Z"
 
+    rig_timing_report.start_section('Bone Collections/Layers')
+
     # We can now make our final bone groups look good! (Both 3.6 and 4.0 functionality.)
     def assign_bone_to_group(bone_name, group_name):
         # Perform old functionality to make BGs to then color.
         if not is_version_4:
             # Switch to object mode
-            bpy.ops.object.mode_set(mode='OBJECT')
+            set_mode('OBJECT')
 
             # Get the armature object
             armature_obj = our_char
@@ -2178,7 +1991,7 @@ def rig_character(
 
             # Switch to pose mode
             bpy.context.view_layer.objects.active = armature_obj
-            bpy.ops.object.mode_set(mode='POSE')
+            set_mode('POSE')
 
             # Get the pose bone
             pose_bone = armature_obj.pose.bones.get(bone_name)
@@ -3024,6 +2837,8 @@ def rig_character(
     bone_to_layer("breast.L",20,"Physics")
     bone_to_layer("breast.R",20,"Physics")
     
+    rig_timing_report.start_section('Physics Placement')
+
     def loop_place_physics():
         if is_version_4:
             armature = bpy.context.object.data
@@ -3056,6 +2871,19 @@ def rig_character(
     loop_place_def()
 
     # MOVING OF BONES END -------------------------------    
+
+    rig_timing_report.start_section('Prune Shape Keys')
+    for obj_get, shape_key_names in generated_shape_key_names.items():
+        this_obj = bpy.data.objects.get(obj_get)
+        if this_obj:
+            unchanged_shape_key_names = remove_unchanged_shape_keys(this_obj, shape_key_names)
+            removed_shape_key_names.extend(unchanged_shape_key_names)
+            saved_shape_key_size += len(unchanged_shape_key_names) * get_shape_key_size(this_obj)
+    if removed_shape_key_names:
+        print(f'{char_name}: removed {len(removed_shape_key_names)} shape keys ({", ".join(removed_shape_key_names)}), '
+              f'{saved_shape_key_size / 1024:.1f} KB of shape key data saved')
+
+    rig_timing_report.finish()
     
 def setup_neck_and_head_follow(neck_follow_value, head_follow_value):
     bpy.context.object.pose.bones["torso"]["neck_follow"] = neck_follow_value
@@ -3064,7 +2892,7 @@ def setup_neck_and_head_follow(neck_follow_value, head_follow_value):
 
 # Make it so that the finger scale controls can be scaled on the X axis to curl in just the fingertips instead of the entire finger.
 def setup_finger_scale_controls_on_x_axis_to_curl_just_the_fingertips(rigified_rig):
-    bpy.ops.object.mode_set(mode='POSE')
+    set_mode('POSE')
 
     for oDrv in rigified_rig.animation_data.drivers:
         for variable in oDrv.driver.variables:
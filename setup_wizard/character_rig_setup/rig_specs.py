@@ -0,0 +1,184 @@
+'''
+    Rig specifications: the bone names and selection sets that differ between the avatar (rig_script), NPC
+    (npc_rig_script) and Paimon (paimon_rig_script) rigs. The rig scripts build their rig from a spec with the shared
+    steps in rig_engine, so a change to a shared step applies to every rig type.
+'''
+
+TOE_BONE_NAMES = ['Bip001 L Toe0', 'Bip001 R Toe0', 'toe.L', 'toe.R', 'toe_ik.L', 'toe_ik.R']
+
+# Original bone name -> Rigify metarig bone name
+AVATAR_BONE_RENAMES = {
+    'Bip001 Pelvis': 'spine',
+    'Bip001 L Thigh': 'thigh.L',
+    'Bip001 L Calf': 'shin.L',
+    'Bip001 L Foot': 'foot.L',
+    'Bip001 L Toe0': 'toe.L',
+    'Bip001 R Thigh': 'thigh.R',
+    'Bip001 R Calf': 'shin.R',
+    'Bip001 R Foot': 'foot.R',
+    'Bip001 R Toe0': 'toe.R',
+    'Bip001 Spine': 'spine.001',
+    'Bip001 Spine1': 'spine.002',
+    'Bip001 Spine2': 'spine.003',
+    'Bip001 L Clavicle': 'shoulder.L',
+    'Bip001 L UpperArm': 'upper_arm.L',
+    'Bip001 L Forearm': 'forearm.L',
+    'Bip001 L Hand': 'hand.L',
+    'Bip001 L Finger0': 'thumb.01.L',
+    'DMZ L 01': 'thumb.01.L',
+    'DMZ L 02': 'thumb.02.L',
+    'DMZ L 03': 'thumb.03.L',
+    'DMZ R 01': 'thumb.01.R',
+    'DMZ R 02': 'thumb.02.R',
+    'DMZ R 03': 'thumb.03.R',
+    'Bip001 L Finger01': 'thumb.02.L',
+    'Bip001 L Finger02': 'thumb.03.L',
+    'Bip001 L Finger1': 'f_index.01.L',
+    'Bip001 L Finger11': 'f_index.02.L',
+    'Bip001 L Finger12': 'f_index.03.L',
+    'Bip001 L Finger2': 'f_middle.01.L',
+    'Bip001 L Finger21': 'f_middle.02.L',
+    'Bip001 L Finger22': 'f_middle.03.L',
+    'Bip001 L Finger3': 'f_ring.01.L',
+    'Bip001 L Finger31': 'f_ring.02.L',
+    'Bip001 L Finger32': 'f_ring.03.L',
+    'Bip001 L Finger4': 'f_pinky.01.L',
+    'Bip001 L Finger41': 'f_pinky.02.L',
+    'Bip001 L Finger42': 'f_pinky.03.L',
+    'Bip001 Neck': 'spine.004',
+    'Bip001 Head': 'spine.006',
+    'Bip001 R Clavicle': 'shoulder.R',
+    'Bip001 R UpperArm': 'upper_arm.R',
+    'Bip001 R Forearm': 'forearm.R',
+    'Bip001 R Hand': 'hand.R',
+    'Bip001 R Finger0': 'thumb.01.R',
+    'Bip001 R Finger01': 'thumb.02.R',
+    'Bip001 R Finger02': 'thumb.03.R',
+    'Bip001 R Finger1': 'f_index.01.R',
+    'Bip001 R Finger11': 'f_index.02.R',
+    'Bip001 R Finger12': 'f_index.03.R',
+    'Bip001 R Finger2': 'f_middle.01.R',
+    'Bip001 R Finger21': 'f_middle.02.R',
+    'Bip001 R Finger22': 'f_middle.03.R',
+    'Bip001 R Finger3': 'f_ring.01.R',
+    'Bip001 R Finger31': 'f_ring.02.R',
+    'Bip001 R Finger32': 'f_ring.03.R',
+    'Bip001 R Finger4': 'f_pinky.01.R',
+    'Bip001 R Finger41': 'f_pinky.02.R',
+    'Bip001 R Finger42': 'f_pinky.03.R',
+    '+EyeBone R A01': 'eye.R',
+    '+EyeBone L A01': 'eye.L',
+    '+Breast L A01': 'breast.L',
+    '+Breast R A01': 'breast.R',
+}
+
+# NPC skeletons keep Bip001 Spine2 as is
+NPC_BONE_RENAMES = {
+    bone_name: new_bone_name for bone_name, new_bone_name in AVATAR_BONE_RENAMES.items() if
+        bone_name != 'Bip001 Spine2'
+}
+
+# Paimon's fingers have two bones and a nub bone, the nub bone is the third finger bone
+PAIMON_FINGER_NUB_BONE_RENAMES = {
+    f'Bip001 {side} Finger{finger_index}Nub': f'{finger}.03.{side}' for side in ['L', 'R'] for finger_index, finger in
+        enumerate(['thumb', 'f_index', 'f_middle', 'f_ring', 'f_pinky'])
+}
+PAIMON_BONE_RENAMES = {
+    **{
+        bone_name: new_bone_name for bone_name, new_bone_name in NPC_BONE_RENAMES.items() if
+            not (bone_name.startswith('Bip001 ') and bone_name[-2:] in ['02', '12', '22', '32', '42'])
+    },
+    **PAIMON_FINGER_NUB_BONE_RENAMES,
+}
+
+# Main body bones of the metarig, everything else is a physics bone (hair, clothes, etc.)
+METARIG_BONE_NAMES = [
+    'eye.L', 'eye.R', 'spine', 'thigh.L', 'shin.L', 'foot.L', 'toe.L', 'thigh.R', 'shin.R', 'foot.R', 'toe.R',
+    'spine.001', 'spine.002', 'spine.003', 'breast.L', 'breast.R', 'shoulder.L', 'upper_arm.L', 'forearm.L', 'hand.L',
+    'thumb.01.L', 'thumb.02.L', 'thumb.03.L', 'f_index.01.L', 'f_index.02.L', 'f_index.03.L', 'f_middle.01.L',
+    'f_middle.02.L', 'f_middle.03.L', 'f_ring.01.L', 'f_ring.02.L', 'f_ring.03.L', 'f_pinky.01.L', 'f_pinky.02.L',
+    'f_pinky.03.L', 'spine.004', 'spine.006', 'shoulder.R', 'upper_arm.R', 'forearm.R', 'hand.R', 'thumb.01.R',
+    'thumb.02.R', 'thumb.03.R', 'f_index.01.R', 'f_index.02.R', 'f_index.03.R', 'f_middle.01.R', 'f_middle.02.R',
+    'f_middle.03.R', 'f_ring.01.R', 'f_ring.02.R', 'f_ring.03.R', 'f_pinky.01.R', 'f_pinky.02.R', 'f_pinky.03.R',
+]
+
+# Main controls of the generated rig, put on the second bone layer (Blender 3.6)
+MAIN_CONTROL_BONE_NAMES = [
+    'root', 'foot_heel_ik.R', 'foot_heel_ik.L', 'toe_ik.R', 'toe_ik.L', 'foot_ik.R', 'foot_ik.L', 'thigh_ik_target.R',
+    'thigh_ik_target.L', 'hips', 'torso', 'chest', 'neck', 'head', 'shoulder.L', 'shoulder.R', 'upper_arm_fk.L',
+    'upper_arm_fk.R', 'forearm_fk.L', 'forearm_fk.R', 'hand_fk.L', 'hand_fk.R', 'upper_arm_ik_target.L',
+    'upper_arm_ik_target.R', 'hand_ik.R', 'hand_ik.L',
+]
+PAIMON_MAIN_CONTROL_BONE_NAMES = [
+    *MAIN_CONTROL_BONE_NAMES[:MAIN_CONTROL_BONE_NAMES.index('head') + 1],
+    'eyeRoot',
+    *MAIN_CONTROL_BONE_NAMES[MAIN_CONTROL_BONE_NAMES.index('head') + 1:],
+]
+
+
+'''
+    A selection set (Selection Sets addon) of the bones with the given names, or of the bones whose name passes the
+    filter, in pose bone order.
+'''
+class SelectionSetSpec:
+    def __init__(self, name, bone_names=None, bone_name_filter=None):
+        self.name = name
+        self.bone_names = bone_names
+        self.bone_name_filter = bone_name_filter
+
+    def get_bone_names(self, pose_bones):
+        if self.bone_names is not None:
+            return [pose_bones[bone_name].name for bone_name in self.bone_names]  # KeyError if a bone is missing
+        return [pose_bone.name for pose_bone in pose_bones if self.bone_name_filter(pose_bone.name)]
+
+
+def is_clothes_bone_name(bone_name):
+    return 'Amice' in bone_name or (
+        'fk' not in bone_name and 'tweak' not in bone_name and 'Twist' not in bone_name and
+        'Hair' not in bone_name and (bone_name[-1].isdigit() or bone_name[-3].isdigit())
+    )
+
+
+SELECTION_SET_SPECS = [
+    SelectionSetSpec(
+        'FK Arms',
+        bone_names=[f'{bone_name}{side}' for side in ['.L', '.R'] for bone_name in
+                    ['upper_arm_fk', 'forearm_fk', 'hand_fk', 'shoulder']]
+    ),
+    SelectionSetSpec('Hair', bone_name_filter=lambda bone_name: 'Hair' in bone_name),
+    SelectionSetSpec('Clothes...and teeth and eyes lmao', bone_name_filter=is_clothes_bone_name),
+]
+
+
+class RigSpec:
+    def __init__(self, name, bone_renames, metarig_bone_names, main_control_bone_names, selection_set_specs):
+        self.name = name
+        self.bone_renames = bone_renames
+        self.metarig_bone_names = metarig_bone_names
+        self.main_control_bone_names = main_control_bone_names
+        self.selection_set_specs = selection_set_specs
+
+    def get_bone_renames(self, toe_bones_exist=True):
+        return {
+            bone_name: new_bone_name for bone_name, new_bone_name in self.bone_renames.items() if
+                toe_bones_exist or bone_name not in TOE_BONE_NAMES
+        }
+
+    # Deform bone names of the main body bones in the generated rig
+    def get_deform_bone_names(self, toe_bones_exist=True):
+        return {
+            f'DEF-{bone_name}' for bone_name in self.metarig_bone_names if
+                toe_bones_exist or bone_name not in TOE_BONE_NAMES
+        }
+
+    def get_main_control_bone_names(self, toe_bones_exist=True):
+        return [
+            bone_name for bone_name in self.main_control_bone_names if
+                toe_bones_exist or bone_name not in TOE_BONE_NAMES
+        ]
+
+
+AVATAR_RIG_SPEC = RigSpec('Avatar', AVATAR_BONE_RENAMES, METARIG_BONE_NAMES, MAIN_CONTROL_BONE_NAMES, SELECTION_SET_SPECS)
+NPC_RIG_SPEC = RigSpec('NPC', NPC_BONE_RENAMES, METARIG_BONE_NAMES, MAIN_CONTROL_BONE_NAMES, SELECTION_SET_SPECS)
+PAIMON_RIG_SPEC = RigSpec('Paimon', PAIMON_BONE_RENAMES, METARIG_BONE_NAMES, PAIMON_MAIN_CONTROL_BONE_NAMES,
+                          SELECTION_SET_SPECS)
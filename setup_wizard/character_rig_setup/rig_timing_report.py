@@ -0,0 +1,118 @@
+import json
+import os
+import time
+
+# When set, every finished report is appended as a JSON line to this file (ex. one line per character of a batch run)
+RIG_TIMING_REPORTS_FILE_PATH_ENVIRONMENT_VARIABLE = 'SETUP_WIZARD_RIG_TIMING_REPORTS_FILE_PATH'
+
+# Finished reports of this Blender session
+rig_timing_reports = []
+
+
+'''
+    Times the named sections of a rig script. The rig scripts are single long functions, so a section runs from
+    start_section() until the next start_section() or finish(). Starting a section that was already timed adds to it.
+
+    Usage:
+        rig_timing_report = RigTimingReport(character_name)
+        rig_timing_report.start_section('Shape Keys')
+        ...
+        rig_timing_report.start_section('Metarig')
+        ...
+        rig_timing_report.finish()
+'''
+class RigTimingReport:
+    def __init__(self, character_name):
+        self.character_name = character_name
+        self.section_times = {}
+        self.start_time = time.perf_counter()
+        self.total_time = 0.0
+        self.__section_name = None
+        self.__section_start_time = None
+
+    def start_section(self, section_name):
+        self.__end_section()
+        self.__section_name = section_name
+        self.__section_start_time = time.perf_counter()
+
+    def finish(self):
+        self.__end_section()
+        self.total_time = time.perf_counter() - self.start_time
+
+        rig_timing_report = self.to_dict()
+        rig_timing_reports.append(rig_timing_report)
+        write_rig_timing_report(rig_timing_report, os.environ.get(RIG_TIMING_REPORTS_FILE_PATH_ENVIRONMENT_VARIABLE))
+        print(self.get_report())
+        return rig_timing_report
+
+    def to_dict(self):
+        return {
+            'character': self.character_name,
+            'total': self.total_time,
+            'sections': dict(self.section_times),
+        }
+
+    def get_report(self):
+        return format_rig_timing_report(self.to_dict())
+
+    def __end_section(self):
+        if self.__section_name:
+            self.section_times[self.__section_name] = self.section_times.get(self.__section_name, 0.0) + \
+                time.perf_counter() - self.__section_start_time
+            self.__section_name = None
+
+
+def format_rig_timing_report(rig_timing_report):
+    total_time = rig_timing_report['total']
+    report_lines = [f'Rig timing report: {rig_timing_report["character"]} ({total_time:.2f}s)']
+    for section_name, section_time in rig_timing_report['sections'].items():
+        percentage = section_time / total_time * 100 if total_time else 0.0
+        report_lines.append(f'    {section_name:<30}{section_time:>9.3f}s{percentage:>7.1f}%')
+    return '\n'.join(report_lines)
+
+
+def write_rig_timing_report(rig_timing_report, rig_timing_reports_file_path):
+    if not rig_timing_reports_file_path:
+        return
+    try:
+        with open(rig_timing_reports_file_path, 'a', encoding='utf-8') as rig_timing_reports_file:
+            rig_timing_reports_file.write(json.dumps(rig_timing_report) + '\n')
+    except OSError as ex:
+        print(f'WARNING: Unable to write rig timing report to {rig_timing_reports_file_path}: {ex}')
+
+
+def read_rig_timing_reports(rig_timing_reports_file_path):
+    if not os.path.exists(rig_timing_reports_file_path):
+        return []
+    with open(rig_timing_reports_file_path, encoding='utf-8') as rig_timing_reports_file:
+        return [json.loads(line) for line in rig_timing_reports_file if line.strip()]
+
+
+'''
+    Aggregates the reports of a batch run: total, mean and max time per section across the rigged characters,
+    and the slowest character of each section.
+'''
+def format_aggregate_rig_timing_report(rig_timing_reports):
+    if not rig_timing_reports:
+        return 'Rig timing report: no characters rigged'
+
+    total_time = sum(rig_timing_report['total'] for rig_timing_report in rig_timing_reports)
+    section_times = {}
+    for rig_timing_report in rig_timing_reports:
+        for section_name, section_time in rig_timing_report['sections'].items():
+            section_times.setdefault(section_name, []).append((section_time, rig_timing_report['character']))
+
+    report_lines = [
+        f'Rig timing report: {len(rig_timing_reports)} characters ({total_time:.2f}s, '
+        f'{total_time / len(rig_timing_reports):.2f}s per character)',
+        f'    {"Section":<30}{"Total (s)":>11}{"Mean (s)":>10}{"Max (s)":>10}{"%":>7}  Slowest',
+    ]
+    for section_name, times in section_times.items():
+        section_total_time = sum(section_time for section_time, _ in times)
+        max_time, slowest_character = max(times)
+        percentage = section_total_time / total_time * 100 if total_time else 0.0
+        report_lines.append(
+            f'    {section_name:<30}{section_total_time:>11.3f}{section_total_time / len(times):>10.3f}'
+            f'{max_time:>10.3f}{percentage:>7.1f}  {slowest_character}'
+        )
+    return '\n'.join(report_lines)
@@ -0,0 +1,173 @@
+import bpy
+import hashlib
+import os
+import random
+import string
+
+RIG_CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rig_cache')
+RIG_CACHE_SIGNATURE_PROPERTY_NAME = 'Rig Cache Signature'
+WIDGETS_COLLECTION_PREFIX = 'WGTS'
+POSITION_DECIMALS = 4  # Rest positions are quantized to 0.1 mm, so float noise doesn't change the signature
+
+
+'''
+    Generates the Rigify rig from the metarig into the target rig, or reuses the rig generated for a previous
+    character with the same skeleton.
+
+    The rigs are cached per skeleton signature (see get_skeleton_signature) in a library .blend file in the
+    rig cache directory. On a cache hit the cached rig is appended and retargeted: it takes over the name,
+    transform and users (mesh Armature modifiers and parents, the metarig's target rig) of the target rig.
+    On a cache miss (or if the cached rig can't be loaded) the rig is generated and written to the cache.
+
+    Returns: the generated rig, the target rig itself unless the cached rig was used
+'''
+def generate_rigify_rig(metarig, target_rig, rig_cache_directory=None):
+    if not rig_cache_directory:
+        bpy.ops.pose.rigify_generate()
+        return target_rig
+
+    bpy.ops.object.mode_set(mode='OBJECT')  # Syncs the edit bones of the metarig before reading its bones
+    skeleton_signature = get_skeleton_signature(metarig)
+    cached_rig_file_path = os.path.join(rig_cache_directory, f'{skeleton_signature}.blend')
+
+    if os.path.exists(cached_rig_file_path):
+        rig = append_cached_rig(cached_rig_file_path, skeleton_signature, metarig, target_rig)
+        if rig:
+            print(f'Reused cached Rigify rig: {cached_rig_file_path}')
+            return rig
+        print(f'WARNING: Unable to load cached Rigify rig: {cached_rig_file_path}, generating the rig')
+
+    bpy.ops.pose.rigify_generate()
+    write_cached_rig(cached_rig_file_path, skeleton_signature, metarig, target_rig)
+    return target_rig
+
+
+'''
+    Hash of the bone names, hierarchy, quantized rest matrices and lengths, and Rigify rig types/parameters of the
+    armature, plus the Blender version (Rigify ships with Blender and its output changes between versions).
+'''
+def get_skeleton_signature(armature_object):
+    signature = hashlib.sha1(bpy.app.version_string.encode())
+
+    for bone in sorted(armature_object.data.bones, key=lambda bone: bone.name):
+        pose_bone = armature_object.pose.bones[bone.name]
+        signature.update(repr((
+            bone.name,
+            bone.parent.name if bone.parent else None,
+            bone.use_connect,
+            [round(value, POSITION_DECIMALS) + 0.0 for row in bone.matrix_local for value in row],
+            [round(value, POSITION_DECIMALS) + 0.0 for value in bone.tail_local],
+            getattr(pose_bone, 'rigify_type', ''),
+            get_rigify_parameters(pose_bone),
+        )).encode())
+    return signature.hexdigest()[:16]
+
+
+def get_rigify_parameters(pose_bone):
+    rigify_parameters = getattr(pose_bone, 'rigify_parameters', None)
+    if rigify_parameters is None:
+        return []
+    return sorted(
+        (key, value.to_list() if hasattr(value, 'to_list') else value) for key, value in rigify_parameters.items()
+    )
+
+
+def append_cached_rig(cached_rig_file_path, skeleton_signature, metarig, target_rig):
+    with bpy.data.libraries.load(cached_rig_file_path) as (data_from, data_to):
+        data_to.objects = list(data_from.objects)
+        data_to.collections = [name for name in data_from.collections if name.startswith(WIDGETS_COLLECTION_PREFIX)]
+        data_to.texts = list(data_from.texts)
+
+    objects = [object for object in data_to.objects if object]
+    collections = [collection for collection in data_to.collections if collection]
+    texts = [text for text in data_to.texts if text]
+    rig = next((object for object in objects if object.type == 'ARMATURE' and
+                object.get(RIG_CACHE_SIGNATURE_PROPERTY_NAME) == skeleton_signature), None)
+
+    if not rig:
+        for object in objects:
+            bpy.data.objects.remove(object)
+        for collection in collections:
+            bpy.data.collections.remove(collection)
+        for text in texts:
+            bpy.data.texts.remove(text)
+        return None
+
+    del rig[RIG_CACHE_SIGNATURE_PROPERTY_NAME]
+    retarget_rig(rig, target_rig)
+
+    for collection in collections:
+        parent_collection = metarig.users_collection[0] if metarig.users_collection else bpy.context.scene.collection
+        parent_collection.children.link(collection)
+        collection.hide_viewport = True
+        collection.hide_render = True
+
+    if texts:
+        set_up_rig_ui_text(rig, texts[0], metarig)
+
+    bpy.context.view_layer.objects.active = rig
+    rig.select_set(True)
+    return rig
+
+
+'''
+    Replaces the target rig with the rig: every user of the target rig (collections, mesh Armature modifiers and
+    parents, the metarig's target rig) now uses the rig, which takes over the name of the target rig and its armature.
+'''
+def retarget_rig(rig, target_rig):
+    target_rig_name = target_rig.name
+    target_armature = target_rig.data
+    target_armature_name = target_armature.name
+
+    rig.matrix_world = target_rig.matrix_world.copy()
+    target_rig.user_remap(rig)
+    bpy.data.objects.remove(target_rig)
+    if target_armature.users == 0:
+        bpy.data.armatures.remove(target_armature)
+
+    rig.name = target_rig_name
+    rig.data.name = target_armature_name
+
+
+'''
+    Renames the Rig UI script after the rig and gives the rig a new rig_id, so the Rig UI of this character does not
+    also show up for the character the rig was cached from.
+'''
+def set_up_rig_ui_text(rig, rig_ui_text, metarig):
+    rig_ui_text.name = f'{rig.name}_ui.py'
+
+    rig_id = rig.data.get('rig_id')
+    if rig_id:
+        new_rig_id = ''.join(random.choices(string.ascii_lowercase + string.digits, k=len(rig_id)))
+        rig_ui_text.from_string(rig_ui_text.as_string().replace(rig_id, new_rig_id))
+        rig.data['rig_id'] = new_rig_id
+
+    if hasattr(metarig.data, 'rigify_rig_ui'):
+        metarig.data.rigify_rig_ui = rig_ui_text
+
+
+'''
+    Writes the generated rig with its widgets collection and Rig UI script to a library .blend file.
+    The armature data and the widget objects are written along with the rig because the rig uses them.
+'''
+def write_cached_rig(cached_rig_file_path, skeleton_signature, metarig, rig):
+    widgets_collections = {
+        collection for pose_bone in rig.pose.bones if pose_bone.custom_shape
+            for collection in pose_bone.custom_shape.users_collection if
+                collection.name.startswith(WIDGETS_COLLECTION_PREFIX)
+    }
+    rig_ui_text = getattr(metarig.data, 'rigify_rig_ui', None) or bpy.data.texts.get(f'{rig.name}_ui.py')
+
+    rig[RIG_CACHE_SIGNATURE_PROPERTY_NAME] = skeleton_signature
+    try:
+        os.makedirs(os.path.dirname(cached_rig_file_path), exist_ok=True)
+        bpy.data.libraries.write(
+            cached_rig_file_path,
+            {rig, *widgets_collections, *([rig_ui_text] if rig_ui_text else [])},
+            compress=True
+        )
+        print(f'Cached Rigify rig: {cached_rig_file_path}')
+    except OSError as ex:
+        print(f'WARNING: Unable to cache Rigify rig: {ex}')
+    finally:
+        del rig[RIG_CACHE_SIGNATURE_PROPERTY_NAME]
@@ -0,0 +1,137 @@
+import numpy
+
+from mathutils import Vector
+
+UNCHANGED_SHAPE_KEY_TOLERANCE = 1e-6  # Max vertex offset (local units) of a shape key that does not change the mesh
+
+
+'''
+    Data-level replacement for building a shape key with edit mode operators (vertex_group_select, moving the 3D
+    cursor and transform.resize/translate about it). Reads the coordinates with foreach_get, transforms the vertices
+    of each vertex group about its pivot with NumPy and writes the shape key with foreach_set.
+    Does not need edit mode, a VIEW_3D area or the 3D cursor, so it also works in background mode.
+
+    shape_key_transforms: list of ShapeKeyTransform, applied in order
+'''
+def add_transformed_shape_key(mesh_object, shape_name, is_basis, shape_key_transforms, vertex_group_indices=None):
+    if is_basis:
+        mesh_object.shape_key_add(name='Basis')
+    shape_key = mesh_object.shape_key_add(name=shape_name, from_mix=False)
+
+    vertex_group_indices = vertex_group_indices if vertex_group_indices is not None else \
+        get_vertex_group_vertex_indices(mesh_object)
+    coordinates = numpy.empty(len(shape_key.data) * 3, dtype=numpy.float32)
+    shape_key.data.foreach_get('co', coordinates)
+    coordinates = coordinates.reshape(-1, 3)
+
+    for shape_key_transform in shape_key_transforms:
+        vertex_indices = vertex_group_indices.get(shape_key_transform.vertex_group_name)
+        if vertex_indices is None or not len(vertex_indices):
+            continue  # Same as the operators: a missing vertex group leaves the shape key unchanged
+        coordinates[vertex_indices] = shape_key_transform.apply(mesh_object, coordinates[vertex_indices])
+
+    shape_key.data.foreach_set('co', coordinates.ravel())
+    mesh_object.data.update()
+    shape_key.value = 0.0
+    return shape_key
+
+
+class ShapeKeyTransform:
+    RESIZE = 'RESIZE'
+    TRANSLATE = 'TRANSLATE'
+
+    '''
+        pivot: world space pivot, (0, 0, 0) if None (same as the reset 3D cursor)
+        transformation_1: scale (RESIZE) or world axis translation in world units (TRANSLATE)
+        transformation_2: scale about the pivot after the translation (TRANSLATE only)
+    '''
+    def __init__(self, vertex_group_name, pivot, transform_type, transformation_1, transformation_2=None):
+        self.vertex_group_name = vertex_group_name
+        self.pivot = Vector(pivot) if pivot else Vector((0.0, 0.0, 0.0))
+        self.transform_type = transform_type
+        self.transformation_1 = transformation_1
+        self.transformation_2 = transformation_2
+
+    def apply(self, mesh_object, coordinates):
+        pivot = numpy.array(mesh_object.matrix_world.inverted() @ self.pivot, dtype=numpy.float32)
+
+        if self.transform_type == self.RESIZE:
+            return scale_about_pivot(coordinates, pivot, self.transformation_1)
+        elif self.transform_type == self.TRANSLATE:
+            # The translate operator gets an identity orient_matrix, so the translation is along the world axes
+            local_translation = mesh_object.matrix_world.to_3x3().inverted() @ Vector(self.transformation_1)
+            coordinates = coordinates + numpy.array(local_translation, dtype=numpy.float32)
+            return scale_about_pivot(coordinates, pivot, self.transformation_2) if self.transformation_2 else coordinates
+        raise ValueError(f'Unknown shape key transform type: {self.transform_type}')
+
+
+def scale_about_pivot(coordinates, pivot, scale):
+    return pivot + (coordinates - pivot) * numpy.array(scale, dtype=numpy.float32)
+
+
+'''
+    Returns: vertex group name -> indices of the vertices assigned to the vertex group (any weight), the same
+    vertices bpy.ops.object.vertex_group_select selects. Built in a single pass over the vertices.
+'''
+def get_vertex_group_vertex_indices(mesh_object):
+    vertex_indices_by_group_index = {}
+    for vertex in mesh_object.data.vertices:
+        for vertex_group_element in vertex.groups:
+            vertex_indices_by_group_index.setdefault(vertex_group_element.group, []).append(vertex.index)
+
+    return {
+        vertex_group.name: numpy.array(vertex_indices_by_group_index.get(vertex_group.index, []), dtype=numpy.int64)
+            for vertex_group in mesh_object.vertex_groups
+    }
+
+
+'''
+    Returns: shape key name -> (number of vertices, 3) coordinates of the shape keys of the mesh object
+'''
+def get_shape_key_coordinates(mesh_object):
+    shape_keys = mesh_object.data.shape_keys
+    shape_key_coordinates = {}
+    for key_block in (shape_keys.key_blocks if shape_keys else []):
+        coordinates = numpy.empty(len(key_block.data) * 3, dtype=numpy.float32)
+        key_block.data.foreach_get('co', coordinates)
+        shape_key_coordinates[key_block.name] = coordinates.reshape(-1, 3)
+    return shape_key_coordinates
+
+
+# Memory of one shape key of the mesh: every shape key stores the coordinates of every vertex (3 floats)
+def get_shape_key_size(mesh_object):
+    return len(mesh_object.data.vertices) * 3 * numpy.dtype(numpy.float32).itemsize
+
+
+def get_key_block_coordinates(key_block):
+    coordinates = numpy.empty(len(key_block.data) * 3, dtype=numpy.float32)
+    key_block.data.foreach_get('co', coordinates)
+    return coordinates
+
+
+'''
+    Removes the shape keys (and their drivers) that don't move any vertex further than the tolerance from their
+    relative key, ex. a shape key of a vertex group that doesn't exist on this character.
+    The reference key (Basis) is never removed.
+
+    Returns: names of the removed shape keys
+'''
+def remove_unchanged_shape_keys(mesh_object, shape_key_names, tolerance=UNCHANGED_SHAPE_KEY_TOLERANCE):
+    shape_keys = mesh_object.data.shape_keys
+    if not shape_keys:
+        return []
+
+    removed_shape_key_names = []
+    for shape_key_name in shape_key_names:
+        key_block = shape_keys.key_blocks.get(shape_key_name)
+        if not key_block or key_block == shape_keys.reference_key:
+            continue
+
+        offsets = get_key_block_coordinates(key_block) - get_key_block_coordinates(key_block.relative_key)
+        if len(offsets) and float(numpy.abs(offsets).max()) > tolerance:
+            continue
+
+        shape_keys.driver_remove(f'key_blocks["{shape_key_name}"].value')
+        mesh_object.shape_key_remove(key_block)
+        removed_shape_key_names.append(shape_key_name)
+    return removed_shape_key_names
@@ -0,0 +1,69 @@
+'''
+    Finds the skirt/dress bones of a rig and sorts them into front, side and back bones.
+    Works on any bones with a name and a parent (edit bones, bones), so the bone hierarchy is walked once through
+    a parent -> children map instead of scanning every bone of the armature for the children of each bone.
+'''
+
+FRONT = 'FRONT'
+SIDE = 'SIDE'
+BACK = 'BACK'
+SKIRT_AREAS = [FRONT, SIDE, BACK]
+
+# Bone name prefixes of the bones considered skirt/dress bones, followed by F(ront), S(ide) or B(ack)
+SKIRT_BONE_NAME_PREFIXES = ['+Skirt', '+Hem', '+Overcoat', '+VisionPelvis']
+SKIRT_AREA_BY_LETTER = {
+    'F': FRONT,
+    'S': SIDE,
+    'B': BACK,
+}
+
+
+# Bone name -> children in the order of the bones, built in a single pass over the bones
+def get_children_by_parent_name(bones):
+    children_by_parent_name = {}
+    for bone in bones:
+        if bone.parent:
+            children_by_parent_name.setdefault(bone.parent.name, []).append(bone)
+    return children_by_parent_name
+
+
+'''
+    All descendants of the bone, depth first with each bone followed by its descendants.
+    Iterative so long hair/skirt chains don't hit the recursion limit.
+'''
+def get_descendants(children_by_parent_name, bone_name):
+    descendants = []
+    bones_to_visit = list(reversed(children_by_parent_name.get(bone_name, [])))
+    while bones_to_visit:
+        bone = bones_to_visit.pop()
+        descendants.append(bone)
+        bones_to_visit.extend(reversed(children_by_parent_name.get(bone.name, [])))
+    return descendants
+
+
+# FRONT, SIDE or BACK from the letter after the skirt bone name prefix, None if it's not a skirt bone
+def get_skirt_area(bone_name):
+    for prefix in SKIRT_BONE_NAME_PREFIXES:
+        if bone_name.startswith(prefix):
+            return SKIRT_AREA_BY_LETTER.get(bone_name[len(prefix):len(prefix) + 1])
+    return None
+
+
+'''
+    Sorts the skirt bones among the descendants of the skirt parent bone into front, side and back bones.
+    The descendants of the excluded bone (ex. bones with skirt names parented to the chest) are left out.
+
+    Returns: area -> list of bone names, in bone hierarchy order
+'''
+def get_skirt_bone_names(bones, skirt_parent_bone_name, excluded_bone_name=None):
+    children_by_parent_name = get_children_by_parent_name(bones)
+    excluded_bone_names = {
+        bone.name for bone in get_descendants(children_by_parent_name, excluded_bone_name)
+    } if excluded_bone_name else set()
+
+    skirt_bone_names = {area: [] for area in SKIRT_AREAS}
+    for bone in get_descendants(children_by_parent_name, skirt_parent_bone_name):
+        area = get_skirt_area(bone.name)
+        if area and bone.name not in excluded_bone_names:
+            skirt_bone_names[area].append(bone.name)
+    return skirt_bone_names
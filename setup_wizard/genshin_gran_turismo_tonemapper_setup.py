@@ -1,7 +1,6 @@
 # Author: michael-gh1
 
 import bpy
-import os
 
 from bpy_extras.io_utils import ImportHelper
 from bpy.props import StringProperty
@@ -9,6 +8,7 @@ from bpy.types import Operator
 from setup_wizard.import_order import cache_using_cache_key, get_cache, FESTIVITY_GRAN_TURISMO_FILE_PATH
 
 from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+from setup_wizard.utils.library_loader import load_datablocks
 
 NAME_OF_DEFAULT_SCENE = 'Scene'
 
@@ -119,15 +119,14 @@ class GI_OT_GenshinGranTurismoTonemapperSetup(Operator, ImportHelper, CustomOper
     '''
 
     def append_gran_turismo_tonemapper(self, gran_turismo_blend_file_path):
-        inner_path = 'NodeTree'
+        loaded_datablocks = load_datablocks(gran_turismo_blend_file_path, {
+            'node_groups': [NAME_OF_GRAN_TURISMO_NODE_TREE],
+        })
 
-        bpy.ops.wm.append(
-            filepath=os.path.join(gran_turismo_blend_file_path, inner_path, NAME_OF_GRAN_TURISMO_NODE_TREE),
-            directory=os.path.join(gran_turismo_blend_file_path, inner_path),
-            filename=NAME_OF_GRAN_TURISMO_NODE_TREE
-        )
-
-        self.logs += f'Appended {NAME_OF_GRAN_TURISMO_NODE_TREE}\n'
+        if loaded_datablocks.get_missing_datablock_names('node_groups'):
+            self.logs += f'Did not find {NAME_OF_GRAN_TURISMO_NODE_TREE} in {gran_turismo_blend_file_path}\n'
+        else:
+            self.logs += f'Appended {NAME_OF_GRAN_TURISMO_NODE_TREE}\n'
 
     def create_compositor_node_group(self, node_name):
         bpy.ops.node.add_node(
@@ -17,6 +17,7 @@ from setup_wizard.import_order import NextStepInvoker, cache_using_cache_key
 from setup_wizard.import_order import get_cache, CHARACTER_MODEL_FOLDER_FILE_PATH
 from setup_wizard.setup_wizard_operator_base_classes import BasicSetupUIOperator, CustomOperatorProperties
 from setup_wizard.utils import material_utils
+from setup_wizard.utils.armature_utils import set_target_armature
 
 
 SHADER_COLOR_ATTRIBUTE_NAME = 'Col'
@@ -67,6 +68,7 @@ class GI_OT_GenshinImportModel(Operator, ImportHelper, CustomOperatorProperties)
             return {'FINISHED'}
 
         existing_materials = bpy.data.materials.values()  # used to track materials before and after importing character model
+        existing_armatures = [object for object in bpy.data.objects if object.type == 'ARMATURE']
         original_language = bpy.context.preferences.view.language
         try:
             # Blender's FBX import has some silent issue when importing in different languages. Unsure why.
@@ -74,7 +76,7 @@ class GI_OT_GenshinImportModel(Operator, ImportHelper, CustomOperatorProperties)
             # TODO: rename_mesh_color_attribute_name() should address this issue and not require us to set language
             bpy.context.preferences.view.language = 'en_US'
             self.import_character_model(character_model_file_path_or_directory, is_character_model_file)
-            self.reset_pose_location_and_rotation()
+            self.reset_pose_location_and_rotation(existing_armatures)
             self.rename_mesh_color_attribute_name(SHADER_COLOR_ATTRIBUTE_NAME)  # Blender 3.4 changed default name to 'Attribute', revert it
         finally:
             bpy.context.preferences.view.language = original_language
@@ -126,9 +128,10 @@ class GI_OT_GenshinImportModel(Operator, ImportHelper, CustomOperatorProperties)
                 bpy.data.objects[object.name].hide_set(True)
                 bpy.data.objects[object.name].hide_render = True
 
-    def reset_pose_location_and_rotation(self):
+    def reset_pose_location_and_rotation(self, existing_armatures):
         try:
-            armature = [object for object in bpy.data.objects if object.type == 'ARMATURE'][0]  # expecting 1 armature
+            # The imported armature, other characters may already be in the scene
+            armature = [object for object in bpy.data.objects if object.type == 'ARMATURE' and object not in existing_armatures][0]
         except IndexError as err:
             self.report(
                 {'ERROR'}, 
@@ -137,6 +140,7 @@ class GI_OT_GenshinImportModel(Operator, ImportHelper, CustomOperatorProperties)
                 "- Try renaming and removing any special characters (like star symbols) from any folders in the filepath"
             )
             raise err
+        set_target_armature(armature)
         bpy.context.view_layer.objects.active = armature
 
         bpy.ops.object.mode_set(mode='POSE')
@@ -12,6 +12,8 @@ from setup_wizard.domain.outline_material_data import OutlineMaterialGroup
 from setup_wizard.import_order import NextStepInvoker
 from setup_wizard.material_data_import_setup.game_material_data_importers import GameMaterialDataImporterFactory
 from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+from setup_wizard.utils import material_utils
+from setup_wizard.utils.armature_utils import get_character_objects
 
 WEAPON_NAME_IDENTIFIER = 'Mat'
 
@@ -60,6 +62,12 @@ class GI_OT_GenshinImportMaterialData(Operator, ImportHelper, CustomOperatorProp
             status = game_material_data_importer.import_material_data()
 
             self.report({'INFO'}, 'Imported material data')
+            material_data_change_report = game_material_data_importer.material_data_change_report
+            if material_data_change_report:
+                self.report({'INFO'}, material_data_change_report.get_summary())
+            if status == {'FINISHED'} and not selected_material and \
+                    context.window_manager.setup_wizard_shared_outline_materials_enabled:
+                self.share_identical_outlines_materials(context)
             if status == {'FINISHED'}:
                 NextStepInvoker().invoke(
                     self.next_step_idx, 
@@ -71,5 +79,20 @@ class GI_OT_GenshinImportMaterialData(Operator, ImportHelper, CustomOperatorProp
             super().clear_custom_properties()
         return {'FINISHED'}
 
+    '''
+        Outline materials only differ once the outline textures and material data are applied,
+        so they are shared after the material data import instead of when they are cloned.
+    '''
+    def share_identical_outlines_materials(self, context):
+        shader_materials = [
+            material_slot.material for object in get_character_objects(context) if object.type == 'MESH'
+                for material_slot in object.material_slots if material_slot.material
+        ]
+        number_of_shader_materials, number_of_outlines_materials = \
+            material_utils.share_identical_outlines_materials(shader_materials)
+        self.report({'INFO'}, f'Outline materials: {number_of_outlines_materials} shared by '
+            f'{number_of_shader_materials} shader materials '
+            f'({number_of_shader_materials - number_of_outlines_materials} fewer materials)')
+
 
 register, unregister = bpy.utils.register_classes_factory(GI_OT_GenshinImportMaterialData)
@@ -1,6 +1,7 @@
 # Author: michael-gh1
 
 import bpy
+import time
 from bpy.types import Operator
 from setup_wizard.geometry_nodes_setup.game_geometry_nodes_setup_service import GameGeometryNodesSetupService
 from setup_wizard.geometry_nodes_setup.geometry_nodes_setups import GameGeometryNodesSetupFactory
@@ -22,7 +23,9 @@ class GI_OT_SetUpGeometryNodes(Operator, CustomOperatorProperties):
             game_geometry_nodes_setup = GameGeometryNodesSetupFactory.create(self.game_type, self, context)
 
             geometry_nodes_service = GameGeometryNodesSetupService(game_geometry_nodes_setup)
+            start_time = time.perf_counter()
             geometry_nodes_service.setup_geometry_nodes()
+            print(f'Set up geometry nodes in {time.perf_counter() - start_time:.3f}s')
 
             NextStepInvoker().invoke(
                 self.next_step_idx, 
@@ -100,10 +100,14 @@ def setup_dependencies():
     import setup_wizard.join_meshes_on_armature.join_meshes_operator
     import setup_wizard.character_rig_setup.character_rigger_operator
     import setup_wizard.character_rig_setup.rootshape_filepath_setter_operator
+    import setup_wizard.character_rig_setup.rig_playback_benchmark
     import setup_wizard.optimization.emissive_optimizer
+    import setup_wizard.optimization.outline_normals_baker
+    import setup_wizard.geometry_nodes_setup.outline_lod
     import setup_wizard.genshin_gran_turismo_tonemapper_setup
     import setup_wizard.change_bpy_context
     import setup_wizard.mesh_import_setup.chibi_face_setup
+    import setup_wizard.material_data_import_setup.material_data_bundle_operator
 
     importlib.reload(setup_wizard.import_order)
     importlib.reload(setup_wizard.genshin_import_character_model)
@@ -121,10 +125,14 @@ def setup_dependencies():
     importlib.reload(setup_wizard.join_meshes_on_armature.join_meshes_operator)
     importlib.reload(setup_wizard.character_rig_setup.character_rigger_operator)
     importlib.reload(setup_wizard.character_rig_setup.rootshape_filepath_setter_operator)
+    importlib.reload(setup_wizard.character_rig_setup.rig_playback_benchmark)
     importlib.reload(setup_wizard.optimization.emissive_optimizer)
+    importlib.reload(setup_wizard.optimization.outline_normals_baker)
+    importlib.reload(setup_wizard.geometry_nodes_setup.outline_lod)
     importlib.reload(setup_wizard.genshin_gran_turismo_tonemapper_setup)
     importlib.reload(setup_wizard.change_bpy_context)
     importlib.reload(setup_wizard.mesh_import_setup.chibi_face_setup)
+    importlib.reload(setup_wizard.material_data_import_setup.material_data_bundle_operator)
 
     for class_to_register in [
         setup_wizard.genshin_import_character_model.GI_OT_GenshinImportModel,
@@ -149,16 +157,21 @@ def setup_dependencies():
         setup_wizard.join_meshes_on_armature.join_meshes_operator.GI_OT_JoinMeshesOnArmature,
         setup_wizard.character_rig_setup.character_rigger_operator.GI_OT_CharacterRiggerOperator,
         setup_wizard.character_rig_setup.rootshape_filepath_setter_operator.GI_OT_RootShape_FilePath_Setter_Operator,
+        setup_wizard.character_rig_setup.rig_playback_benchmark.GI_OT_BenchmarkRigPlayback,
         setup_wizard.optimization.emissive_optimizer.GI_OT_Emissive_Optimizer,
+        setup_wizard.optimization.outline_normals_baker.GI_OT_Bake_Outline_Normals,
+        setup_wizard.geometry_nodes_setup.outline_lod.GI_OT_SetUpOutlineLOD,
         setup_wizard.genshin_gran_turismo_tonemapper_setup.GI_OT_GenshinGranTurismoTonemapperSetup,
         setup_wizard.change_bpy_context.GI_OT_Change_BPY_Context,
         setup_wizard.mesh_import_setup.chibi_face_setup.PGR_OT_SetUpChibiFace,
         setup_wizard.mesh_import_setup.chibi_face_setup.PGR_OT_ImportChibiFaceTexture,
+        setup_wizard.material_data_import_setup.material_data_bundle_operator.GI_OT_CompileMaterialDataBundle,
     ]:
         try:
             bpy.utils.register_class(class_to_register)
         except ValueError:
             pass  # expected if class is already registered
+    setup_wizard.geometry_nodes_setup.outline_lod.register_outline_lod_handler()
     return setup_wizard.import_order.invoke_next_step
 
 
@@ -180,10 +193,14 @@ def unregister():
     from setup_wizard.join_meshes_on_armature.join_meshes_operator import GI_OT_JoinMeshesOnArmature
     from setup_wizard.character_rig_setup.character_rigger_operator import GI_OT_CharacterRiggerOperator
     from setup_wizard.character_rig_setup.rootshape_filepath_setter_operator import GI_OT_RootShape_FilePath_Setter_Operator
+    from setup_wizard.character_rig_setup.rig_playback_benchmark import GI_OT_BenchmarkRigPlayback
     from setup_wizard.optimization.emissive_optimizer import GI_OT_Emissive_Optimizer
+    from setup_wizard.optimization.outline_normals_baker import GI_OT_Bake_Outline_Normals
+    from setup_wizard.geometry_nodes_setup.outline_lod import GI_OT_SetUpOutlineLOD, unregister_outline_lod_handler
     from setup_wizard.genshin_gran_turismo_tonemapper_setup import GI_OT_GenshinGranTurismoTonemapperSetup
     from setup_wizard.change_bpy_context import GI_OT_Change_BPY_Context
     from setup_wizard.mesh_import_setup.chibi_face_setup import PGR_OT_SetUpChibiFace, PGR_OT_ImportChibiFaceTexture
+    from setup_wizard.material_data_import_setup.material_data_bundle_operator import GI_OT_CompileMaterialDataBundle
 
     for class_to_unregister in [
         GI_OT_GenshinImportModel,
@@ -204,16 +221,21 @@ def unregister():
         GI_OT_JoinMeshesOnArmature,
         GI_OT_CharacterRiggerOperator,
         GI_OT_RootShape_FilePath_Setter_Operator,
+        GI_OT_BenchmarkRigPlayback,
         GI_OT_Emissive_Optimizer,
+        GI_OT_Bake_Outline_Normals,
+        GI_OT_SetUpOutlineLOD,
         GI_OT_GenshinGranTurismoTonemapperSetup,
         GI_OT_Change_BPY_Context,
         PGR_OT_SetUpChibiFace,
         PGR_OT_ImportChibiFaceTexture,
+        GI_OT_CompileMaterialDataBundle,
     ]:
         try:
             bpy.utils.unregister_class(class_to_unregister)
         except ValueError:
             pass  # expected if class is already registered
+    unregister_outline_lod_handler()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,250 @@
+import bpy
+
+from setup_wizard.optimization.outline_normals_baker import OUTLINE_NORMAL_GROUP_ATTRIBUTE_NAME
+
+# Inputs of the combined node group, the Outline LOD turns the outlines off without turning off the light vectors
+OUTLINES_IN_VIEWPORT_INPUT_NAME = 'Outlines in Viewport'
+OUTLINES_IN_RENDER_INPUT_NAME = 'Outlines in Render'
+
+# Suffix of the copies of nested node groups that read the smoothed outline normals
+SMOOTHED_OUTLINE_NORMALS_NODE_GROUP_SUFFIX = ' (Smoothed Normals)'
+# Custom property of the node groups that read the smoothed outline normals
+SMOOTHED_OUTLINE_NORMALS_PROPERTY_NAME = 'Smoothed Outline Normals'
+
+
+'''
+    Builds one geometry node group that runs the Light Vectors node group and then the Outlines node group, so a mesh
+    needs a single modifier (one node tree evaluation) instead of a Light Vectors modifier and an Outlines modifier.
+
+    The combined node group is a copy of the Outlines node group, which keeps the input identifiers (Input_N) of the
+    Outlines node group, so the Outlines modifier default values are set exactly the same way.
+    The Light Vectors node group is inserted between the Group Input geometry and the nodes that used it.
+    The output switches between the outlines and the light vectors only geometry with the Outlines in Viewport and
+    Outlines in Render inputs, so the outlines can be turned off in the viewport or in renders (Outline LOD) while the
+    modifier keeps evaluating the light vectors. The outline nodes are not evaluated when switched off.
+    The outline nodes read the smoothed normals of meshes baked with Bake Outline Normals (see add_smoothed_normals).
+'''
+def get_or_create_combined_node_group(outlines_node_group, light_vectors_node_group):
+    combined_node_group_name = get_combined_node_group_name(outlines_node_group, light_vectors_node_group)
+    combined_node_group = bpy.data.node_groups.get(combined_node_group_name)
+    if combined_node_group:
+        if get_group_input_identifier(combined_node_group, OUTLINES_IN_VIEWPORT_INPUT_NAME) is None:
+            add_outlines_switch_to_existing_node_group(combined_node_group, light_vectors_node_group)
+        if not combined_node_group.get(SMOOTHED_OUTLINE_NORMALS_PROPERTY_NAME):
+            add_smoothed_normals(combined_node_group, [light_vectors_node_group])
+        return combined_node_group
+
+    combined_node_group = outlines_node_group.copy()
+    combined_node_group.name = combined_node_group_name
+
+    group_input_nodes = [node for node in combined_node_group.nodes if node.type == 'GROUP_INPUT']
+    light_vectors_node = combined_node_group.nodes.new('GeometryNodeGroup')
+    light_vectors_node.node_tree = light_vectors_node_group
+    light_vectors_node.name = light_vectors_node_group.name
+    light_vectors_node.location = (group_input_nodes[0].location.x, group_input_nodes[0].location.y + 300) if \
+        group_input_nodes else (0, 0)
+
+    light_vectors_geometry_input = get_geometry_socket(light_vectors_node.inputs)
+    light_vectors_geometry_output = get_geometry_socket(light_vectors_node.outputs)
+    group_input_geometry_outputs = [get_geometry_socket(node.outputs) for node in group_input_nodes]
+
+    # Everything that used the geometry of the mesh now uses the geometry with the light vectors applied
+    geometry_links = [link for link in combined_node_group.links if link.from_socket in group_input_geometry_outputs]
+    to_sockets = [link.to_socket for link in geometry_links]
+    for link in geometry_links:
+        combined_node_group.links.remove(link)
+
+    if group_input_geometry_outputs and group_input_geometry_outputs[0]:
+        combined_node_group.links.new(group_input_geometry_outputs[0], light_vectors_geometry_input)
+    for to_socket in to_sockets:
+        combined_node_group.links.new(light_vectors_geometry_output, to_socket)
+    add_outlines_switch(combined_node_group, light_vectors_geometry_output)
+    add_smoothed_normals(combined_node_group, [light_vectors_node_group])
+
+    combined_node_group.use_fake_user = True
+    return combined_node_group
+
+
+def get_combined_node_group_name(outlines_node_group, light_vectors_node_group):
+    return f'{light_vectors_node_group.name} + {outlines_node_group.name}'
+
+
+def get_geometry_socket(sockets):
+    return next((socket for socket in sockets if socket.type == 'GEOMETRY'), None)
+
+
+'''
+    Outputs the outlines geometry where the outlines are on (Outlines in Viewport in the viewport, Outlines in Render
+    in renders) and the geometry without outlines everywhere else.
+'''
+def add_outlines_switch(node_group, geometry_without_outlines_output):
+    group_output_geometry_input = next((
+        get_geometry_socket(node.inputs) for node in node_group.nodes if node.type == 'GROUP_OUTPUT' and
+            node.is_active_output
+    ), None)
+    outlines_geometry_link = next((
+        link for link in node_group.links if link.to_socket == group_output_geometry_input
+    ), None)
+    if not outlines_geometry_link:
+        return
+
+    new_group_input(node_group, OUTLINES_IN_VIEWPORT_INPUT_NAME, 'NodeSocketBool', True)
+    new_group_input(node_group, OUTLINES_IN_RENDER_INPUT_NAME, 'NodeSocketBool', True)
+    group_input_node = node_group.nodes.new('NodeGroupInput')
+    group_input_node.location = (outlines_geometry_link.to_node.location.x - 800,
+                                 outlines_geometry_link.to_node.location.y - 300)
+
+    is_viewport_node = node_group.nodes.new('GeometryNodeIsViewport')
+    is_viewport_node.location = (group_input_node.location.x, group_input_node.location.y - 150)
+    outlines_in_viewport_node = new_boolean_math_node(node_group, 'AND', is_viewport_node.outputs[0],
+        group_input_node.outputs[OUTLINES_IN_VIEWPORT_INPUT_NAME], group_input_node.location, 200)
+    outlines_in_render_node = new_boolean_math_node(node_group, 'NIMPLY',
+        group_input_node.outputs[OUTLINES_IN_RENDER_INPUT_NAME], is_viewport_node.outputs[0],
+        group_input_node.location, 200, -150)
+    show_outlines_node = new_boolean_math_node(node_group, 'OR', outlines_in_viewport_node.outputs[0],
+        outlines_in_render_node.outputs[0], group_input_node.location, 400)
+
+    switch_node = node_group.nodes.new('GeometryNodeSwitch')
+    switch_node.input_type = 'GEOMETRY'
+    switch_node.location = (group_input_node.location.x + 600, group_input_node.location.y)
+    switch_input, false_input, true_input = get_switch_sockets(switch_node)
+
+    node_group.links.new(show_outlines_node.outputs[0], switch_input)
+    node_group.links.new(geometry_without_outlines_output, false_input)
+    node_group.links.new(outlines_geometry_link.from_socket, true_input)
+    node_group.links.new(get_geometry_socket(enabled_sockets(switch_node.outputs)), group_output_geometry_input)
+
+
+# Combined node groups created before the outlines switch
+def add_outlines_switch_to_existing_node_group(combined_node_group, light_vectors_node_group):
+    light_vectors_node = next((
+        node for node in combined_node_group.nodes if node.type == 'GROUP' and
+            node.node_tree == light_vectors_node_group
+    ), None)
+    if light_vectors_node:
+        add_outlines_switch(combined_node_group, get_geometry_socket(light_vectors_node.outputs))
+
+
+'''
+    Replaces the normals the node group reads with the smoothed outline normals where the mesh has the baked Outline
+    Normal Group attribute: the normals of the vertices in the same group are added up and normalized, after the mesh
+    is deformed. Meshes without the baked attribute keep their normals.
+    Nested node groups that read normals are replaced with copies that read the smoothed normals, except
+    excluded_node_groups (the Light Vectors node group).
+'''
+def add_smoothed_normals(node_group, excluded_node_groups):
+    node_group[SMOOTHED_OUTLINE_NORMALS_PROPERTY_NAME] = True
+    for normal_node in [node for node in node_group.nodes if node.bl_idname == 'GeometryNodeInputNormal']:
+        normal_output = normal_node.outputs[0]  # Not the True Normal output (Blender 4.5+)
+        normal_links = [link for link in node_group.links if link.from_socket == normal_output]
+        if not normal_links:
+            continue
+        to_sockets = [link.to_socket for link in normal_links]
+        for link in normal_links:
+            node_group.links.remove(link)
+
+        normal_group_node = node_group.nodes.new('GeometryNodeInputNamedAttribute')
+        normal_group_node.data_type = 'INT'
+        normal_group_node.inputs['Name'].default_value = OUTLINE_NORMAL_GROUP_ATTRIBUTE_NAME
+        normal_group_node.location = (normal_node.location.x, normal_node.location.y - 150)
+        normal_group_output, normal_group_exists_output = enabled_sockets(normal_group_node.outputs)
+
+        accumulate_field_node = node_group.nodes.new('GeometryNodeAccumulateField')
+        accumulate_field_node.data_type = 'FLOAT_VECTOR'
+        accumulate_field_node.domain = 'POINT'
+        accumulate_field_node.location = (normal_node.location.x + 200, normal_node.location.y)
+        value_input, group_input = enabled_sockets(accumulate_field_node.inputs)
+        node_group.links.new(normal_output, value_input)
+        node_group.links.new(normal_group_output, group_input)
+
+        normalize_node = node_group.nodes.new('ShaderNodeVectorMath')
+        normalize_node.operation = 'NORMALIZE'
+        normalize_node.location = (normal_node.location.x + 400, normal_node.location.y)
+        total_output = next(socket for socket in enabled_sockets(accumulate_field_node.outputs) if
+                            socket.name == 'Total')
+        node_group.links.new(total_output, normalize_node.inputs[0])
+
+        switch_node = node_group.nodes.new('GeometryNodeSwitch')
+        switch_node.input_type = 'VECTOR'
+        switch_node.location = (normal_node.location.x + 600, normal_node.location.y)
+        switch_input, false_input, true_input = get_switch_sockets(switch_node, 'VECTOR')
+        node_group.links.new(normal_group_exists_output, switch_input)
+        node_group.links.new(normal_output, false_input)
+        node_group.links.new(normalize_node.outputs[0], true_input)
+
+        switch_output = next(socket for socket in enabled_sockets(switch_node.outputs) if socket.type == 'VECTOR')
+        for to_socket in to_sockets:
+            node_group.links.new(switch_output, to_socket)
+
+    for group_node in [node for node in node_group.nodes if node.type == 'GROUP' and node.node_tree and
+                       node.node_tree not in excluded_node_groups and reads_normals(node.node_tree)]:
+        group_node.node_tree = get_or_create_smoothed_normals_node_group(group_node.node_tree, excluded_node_groups)
+
+
+def get_or_create_smoothed_normals_node_group(node_group, excluded_node_groups):
+    smoothed_normals_node_group_name = f'{node_group.name}{SMOOTHED_OUTLINE_NORMALS_NODE_GROUP_SUFFIX}'
+    smoothed_normals_node_group = bpy.data.node_groups.get(smoothed_normals_node_group_name)
+    if smoothed_normals_node_group:
+        return smoothed_normals_node_group
+
+    smoothed_normals_node_group = node_group.copy()
+    smoothed_normals_node_group.name = smoothed_normals_node_group_name
+    add_smoothed_normals(smoothed_normals_node_group, excluded_node_groups)
+    return smoothed_normals_node_group
+
+
+def reads_normals(node_group):
+    return any(
+        node.bl_idname == 'GeometryNodeInputNormal' or (node.type == 'GROUP' and node.node_tree and
+            reads_normals(node.node_tree))
+        for node in node_group.nodes
+    )
+
+
+# Node group with the Light Vectors node group combined into it
+def is_combined_node_group(node_group, light_vectors_node_group_names):
+    return any(
+        node.type == 'GROUP' and node.node_tree and node.node_tree.name in light_vectors_node_group_names
+        for node in node_group.nodes
+    )
+
+
+def new_boolean_math_node(node_group, operation, input_1, input_2, location, offset_x, offset_y=0):
+    boolean_math_node = node_group.nodes.new('FunctionNodeBooleanMath')
+    boolean_math_node.operation = operation
+    boolean_math_node.location = (location.x + offset_x, location.y + offset_y)
+    node_group.links.new(input_1, boolean_math_node.inputs[0])
+    node_group.links.new(input_2, boolean_math_node.inputs[1])
+    return boolean_math_node
+
+
+# Switch node sockets of the input type: Switch, False and True (before Blender 4.1 the node has sockets of every type)
+def get_switch_sockets(switch_node, socket_type='GEOMETRY'):
+    inputs = enabled_sockets(switch_node.inputs)
+    switch_input = next(socket for socket in inputs if socket.type == 'BOOLEAN')
+    false_input, true_input = [socket for socket in inputs if socket.type == socket_type]
+    return switch_input, false_input, true_input
+
+
+def enabled_sockets(sockets):
+    return [socket for socket in sockets if socket.enabled]
+
+
+# Node group inputs are in the node group interface from Blender 4.0
+def new_group_input(node_group, name, socket_type, default_value):
+    if hasattr(node_group, 'interface'):
+        group_input = node_group.interface.new_socket(name, in_out='INPUT', socket_type=socket_type)
+    else:
+        group_input = node_group.inputs.new(socket_type, name)
+    group_input.default_value = default_value
+    return group_input
+
+
+# Identifier of the node group input (modifier[identifier] is the input value of a modifier), None if missing
+def get_group_input_identifier(node_group, name):
+    if hasattr(node_group, 'interface'):
+        group_inputs = [item for item in node_group.interface.items_tree if
+                        item.item_type == 'SOCKET' and item.in_out == 'INPUT']
+    else:
+        group_inputs = node_group.inputs
+    return next((group_input.identifier for group_input in group_inputs if group_input.name == name), None)
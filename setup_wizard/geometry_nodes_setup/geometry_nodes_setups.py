@@ -9,7 +9,12 @@ from setup_wizard.domain.shader_identifier_service import GenshinImpactShaders,
 from setup_wizard.domain.shader_material_names import JaredNytsPunishingGrayRavenShaderMaterialNames, V3_BonnyFestivityGenshinImpactMaterialNames, V2_FestivityGenshinImpactMaterialNames, ShaderMaterialNames, Nya222HonkaiStarRailShaderMaterialNames
 
 from setup_wizard.domain.game_types import GameType
+from setup_wizard.geometry_nodes_setup.combined_node_groups import get_or_create_combined_node_group
 from setup_wizard.outline_import_setup.outline_node_groups import OutlineNodeGroupNames
+from setup_wizard.utils import material_utils
+from setup_wizard.utils.armature_utils import get_character_objects, get_target_armature, \
+    is_multi_character_scene_enabled
+from setup_wizard.utils.mesh_name_index import MeshNameIndex
 
 
 # Constants
@@ -97,6 +102,17 @@ class GameGeometryNodesSetup(ABC):
     def setup_geometry_nodes(self):
         raise NotImplementedError
 
+    '''
+        Multi-Character Scene: only the target character's objects/meshes, otherwise every object/mesh in the scene
+    '''
+    def get_character_mesh_items(self):
+        if not is_multi_character_scene_enabled(self.context):
+            return bpy.data.meshes.items()
+        return [(object.data.name, object.data) for object in get_character_objects(self.context) if object.type == 'MESH']
+
+    def get_character_mesh_name_index(self):
+        return MeshNameIndex(get_character_objects(self.context))
+
     def clone_outlines(self, game_material_names: ShaderMaterialNames):
         materials = [material for material in bpy.data.materials.values() if material.name not in self.GEOMETRY_NODES_MATERIAL_IGNORE_LIST]
 
@@ -120,20 +136,20 @@ class GameGeometryNodesSetup(ABC):
 
     def set_up_modifier_default_values(self, modifier, mesh):
         if modifier[f'{NAME_OF_VERTEX_COLORS_INPUT}_use_attribute'] == 0:
-            # Important! Override object key so we don't use the context (ex. selected object)
-            bpy.ops.object.geometry_nodes_input_attribute_toggle(
-                {"object": bpy.data.objects[mesh.name]},
-                prop_path=f"[\"{NAME_OF_VERTEX_COLORS_INPUT}_use_attribute\"]", 
-                modifier_name=modifier.name)
+            # Set through the data API instead of bpy.ops.object.geometry_nodes_input_attribute_toggle
+            # No operator context override or undo push per mesh and it works in background mode
+            modifier[f'{NAME_OF_VERTEX_COLORS_INPUT}_use_attribute'] = True
+            mesh.update_tag()
 
         modifier[f'{NAME_OF_VERTEX_COLORS_INPUT}_attribute_name'] = 'Col'
         modifier[OUTLINE_THICKNESS_INPUT] = self.DEFAULT_OUTLINE_THICKNESS
 
         for (mask_input, material_input), material in zip(outline_mask_to_material_mapping.items(), mesh.material_slots):
-            if bpy.data.materials.get(material.name) and bpy.data.materials.get(f'{material.name} Outlines'):
+            outlines_material = material_utils.get_outlines_material(bpy.data.materials.get(material.name))
+            if bpy.data.materials.get(material.name) and outlines_material:
                 if material.name not in self.GEOMETRY_NODES_MATERIAL_IGNORE_LIST:
                     modifier[mask_input] = bpy.data.materials.get(material.name)
-                    modifier[material_input] = bpy.data.materials.get(f'{material.name} Outlines')
+                    modifier[material_input] = outlines_material
 
     def disable_face_eye_outlines(self, modifier):
         # Specifically do not try to get modifiers from context because context does not have newly
@@ -151,22 +167,41 @@ class GameGeometryNodesSetup(ABC):
 
     '''
         A very specific fix for Face outlines not showing up correctly after setup when importing using BetterFBX
+        The modifier inputs are set through ID properties, which do not tag the object for an update, so the Face mesh
+        kept its outlines evaluated before the outline materials were set. Moving a material slot down and back up
+        (bpy.ops.object.material_slot_move) fixed it as a side effect of tagging the object, tag it directly instead.
     '''
-    def fix_face_outlines_by_reordering_material_slots(self, face_meshes):
+    def fix_face_outlines_by_updating_face_meshes(self, face_meshes):
         for face_mesh in face_meshes:
             face_mesh = bpy.data.meshes.get(face_mesh.name)
             face_mesh_object = bpy.data.objects.get(face_mesh.name)
 
             if not face_mesh or not face_mesh_object:
                 self.blender_operator.report_message_level = {'ERROR'}
-                self.blender_operator.report_message.append('Failed to reorder face material slots to fix face outlines. Not a catastrophic error. Continuing.')
+                self.blender_operator.report_message.append('Failed to update face meshes to fix face outlines. Not a catastrophic error. Continuing.')
                 return
-            bpy.context.view_layer.objects.active = face_mesh_object  # Select 'Face' mesh before swapping material slots
+            face_mesh.update_tag()
+            face_mesh_object.update_tag(refresh={'OBJECT', 'DATA'})
+        self.context.view_layer.update()
+
+    '''
+        Replaces the Light Vectors modifier(s) and the Outlines modifier of the mesh with a single modifier using a
+        combined Light Vectors + Outlines node group
+    '''
+    def combine_light_vectors_into_outlines_modifier(self, mesh, outlines_modifier, outlines_node_group):
+        light_vectors_node_group = next((bpy.data.node_groups.get(light_vectors_node_group_name) for
+            light_vectors_node_group_name in self.light_vectors_node_group_names if
+            bpy.data.node_groups.get(light_vectors_node_group_name)), None)
+        if not light_vectors_node_group:
+            return
+
+        combined_node_group = get_or_create_combined_node_group(outlines_node_group, light_vectors_node_group)
+        if outlines_modifier.node_group != combined_node_group:
+            outlines_modifier.node_group = combined_node_group
 
-            face_mesh.materials.append(None)  # Add a "dummy" empty material slot
-            bpy.ops.object.material_slot_move(direction='DOWN')  # Move the selected material down
-            bpy.ops.object.material_slot_move(direction='UP')  # Return selected material to original position
-            face_mesh.materials.pop()  # Remove "dummy" empty material slot
+        for modifier in [modifier for modifier in mesh.modifiers if modifier.type == 'NODES' and modifier.node_group and
+                         modifier.node_group.name in self.light_vectors_node_group_names]:
+            mesh.modifiers.remove(modifier)
 
     def create_light_vectors_modifier(self, mesh_name):
         mesh = bpy.context.scene.objects[mesh_name]
@@ -194,14 +229,14 @@ class GenshinImpactGeometryNodesSetup(GameGeometryNodesSetup):
 
     def setup_geometry_nodes(self):
         self.clone_outlines(self.material_names)
+        mesh_name_index = self.get_character_mesh_name_index()
         for mesh_name in meshes_to_create_geometry_nodes_on:
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name == object_name or f'_{mesh_name}' in object_name):
-                    self.create_geometry_nodes_modifier(f'{object_name}{BODY_PART_SUFFIX}')
-                    self.fix_meshes_by_setting_genshin_materials(object_name)
+            for mesh_object in mesh_name_index.find(mesh_name):
+                self.create_geometry_nodes_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
+                self.fix_meshes_by_setting_genshin_materials(mesh_object.name)
 
-        face_meshes = [mesh for mesh_name, mesh in bpy.data.meshes.items() if 'Face' in mesh_name and 'Face_Eye' not in mesh_name]
-        self.fix_face_outlines_by_reordering_material_slots(face_meshes)
+        face_meshes = [mesh for mesh_name, mesh in self.get_character_mesh_items() if 'Face' in mesh_name and 'Face_Eye' not in mesh_name]
+        self.fix_face_outlines_by_updating_face_meshes(face_meshes)
 
     def create_geometry_nodes_modifier(self, mesh_name):
         mesh = bpy.context.scene.objects[mesh_name]
@@ -234,22 +269,21 @@ class V3_GenshinImpactGeometryNodesSetup(GameGeometryNodesSetup):
 
     def setup_geometry_nodes(self):
         self.clone_outlines(self.material_names)
+        mesh_name_index = self.get_character_mesh_name_index()
         self.set_face_outlines_material_default_values(self.material_names)
-        character_armature = [obj for obj in bpy.data.objects if obj.type == 'ARMATURE'][0]  # Expecting 1 armature in scene
+        character_armature = get_target_armature(self.context)
         character_armature_mesh_names = [obj.name for obj in character_armature.children if obj.type == 'MESH']
 
         for mesh_name in character_armature_mesh_names:  # It is important that this is created and placed before Outlines!!
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name == object_name or f'_{mesh_name}' in object_name):
-                    self.create_light_vectors_modifier(f'{object_name}{BODY_PART_SUFFIX}')
+            for mesh_object in mesh_name_index.find(mesh_name):
+                self.create_light_vectors_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
         for mesh_name in meshes_to_create_geometry_nodes_on:
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name == object_name or f'_{mesh_name}' in object_name):
-                    self.create_geometry_nodes_modifier(f'{object_name}{BODY_PART_SUFFIX}')
-                    self.fix_meshes_by_setting_genshin_materials(object_name)
+            for mesh_object in mesh_name_index.find(mesh_name):
+                self.create_geometry_nodes_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
+                self.fix_meshes_by_setting_genshin_materials(mesh_object.name)
 
-        face_meshes = [mesh for mesh_name, mesh in bpy.data.meshes.items() if 'Face' in mesh_name and 'Face_Eye' not in mesh_name]
-        self.fix_face_outlines_by_reordering_material_slots(face_meshes)
+        face_meshes = [mesh for mesh_name, mesh in self.get_character_mesh_items() if 'Face' in mesh_name and 'Face_Eye' not in mesh_name]
+        self.fix_face_outlines_by_updating_face_meshes(face_meshes)
 
     def create_geometry_nodes_modifier(self, mesh_name):
         mesh = bpy.context.scene.objects[mesh_name]
@@ -264,6 +298,8 @@ class V3_GenshinImpactGeometryNodesSetup(GameGeometryNodesSetup):
             if not geometry_nodes_modifier:
                 geometry_nodes_modifier = mesh.modifiers.new(f'{NAME_OF_GEOMETRY_NODES_MODIFIER} {mesh_name}', 'NODES')
                 geometry_nodes_modifier.node_group = outlines_node_group
+            if self.context.window_manager.setup_wizard_combined_outlines_modifier_enabled:
+                self.combine_light_vectors_into_outlines_modifier(mesh, geometry_nodes_modifier, outlines_node_group)
             self.set_up_modifier_default_values(geometry_nodes_modifier, mesh)
         return geometry_nodes_modifier 
 
@@ -288,12 +324,12 @@ class V3_GenshinImpactGeometryNodesSetup(GameGeometryNodesSetup):
         }
 
         for input_name, (material_input_accessor, outline_material_input_accessor) in outline_to_material_mapping.items():
-            material_name = f'{self.material_names.MATERIAL_PREFIX}{input_name}'
-            outline_material_name = f'{self.material_names.MATERIAL_PREFIX}{input_name} Outlines'
+            material = bpy.data.materials.get(f'{self.material_names.MATERIAL_PREFIX}{input_name}')
+            outlines_material = material_utils.get_outlines_material(material)
 
-            if bpy.data.materials.get(material_name) and bpy.data.materials.get(outline_material_name):
-                modifier[material_input_accessor] = bpy.data.materials.get(material_name)
-                modifier[outline_material_input_accessor] = bpy.data.materials.get(outline_material_name)
+            if material and outlines_material:
+                modifier[material_input_accessor] = material
+                modifier[outline_material_input_accessor] = outlines_material
 
 
 class HonkaiStarRailGeometryNodesSetup(GameGeometryNodesSetup):
@@ -306,14 +342,14 @@ class HonkaiStarRailGeometryNodesSetup(GameGeometryNodesSetup):
 
     def setup_geometry_nodes(self):
         self.clone_outlines(self.material_names)
+        mesh_name_index = self.get_character_mesh_name_index()
         for mesh_name in meshes_to_create_geometry_nodes_on:
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name == object_name or f'_{mesh_name}' in object_name):
-                    self.create_geometry_nodes_modifier(f'{object_name}{BODY_PART_SUFFIX}')
-                    self.fix_meshes_by_setting_genshin_materials(object_name)
+            for mesh_object in mesh_name_index.find(mesh_name):
+                self.create_geometry_nodes_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
+                self.fix_meshes_by_setting_genshin_materials(mesh_object.name)
 
-        face_meshes = [mesh for mesh_name, mesh in bpy.data.meshes.items() if 'Face' in mesh_name and 'Face_Mask' not in mesh_name]
-        self.fix_face_outlines_by_reordering_material_slots(face_meshes)
+        face_meshes = [mesh for mesh_name, mesh in self.get_character_mesh_items() if 'Face' in mesh_name and 'Face_Mask' not in mesh_name]
+        self.fix_face_outlines_by_updating_face_meshes(face_meshes)
 
     def create_geometry_nodes_modifier(self, mesh_name):
         mesh = bpy.context.scene.objects[mesh_name]
@@ -345,13 +381,13 @@ class PunishingGrayRavenGeometryNodesSetup(V3_GenshinImpactGeometryNodesSetup):
 
     def setup_geometry_nodes(self):
         self.clone_outlines(self.material_names)
-        character_armature = [obj for obj in bpy.data.objects if obj.type == 'ARMATURE'][0]  # Expecting 1 armature in scene
+        mesh_name_index = self.get_character_mesh_name_index()
+        character_armature = get_target_armature(self.context)
         character_armature_mesh_names = [obj.name for obj in character_armature.children if obj.type == 'MESH']
 
         for mesh_name in character_armature_mesh_names:  # It is important that this is created and placed before Outlines!!
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name == object_name or f'_{mesh_name}' in object_name):
-                    self.create_light_vectors_modifier(f'{object_name}{BODY_PART_SUFFIX}')
+            for mesh_object in mesh_name_index.find(mesh_name):
+                self.create_light_vectors_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
 
         local_mesh_names_to_create_geometry_nodes_on = [
             mesh.name for mesh in bpy.data.meshes if [
@@ -364,13 +400,12 @@ class PunishingGrayRavenGeometryNodesSetup(V3_GenshinImpactGeometryNodesSetup):
                 'Alpha' not in mesh_name
         ]
         for mesh_name in [item for item in local_mesh_names_to_create_geometry_nodes_on]:
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name.lower() in object_name.lower()):
-                    self.create_geometry_nodes_modifier(f'{object_name}{BODY_PART_SUFFIX}')
-                    self.fix_meshes_by_setting_genshin_materials(object_name)
+            for mesh_object in mesh_name_index.find_containing(mesh_name):
+                self.create_geometry_nodes_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
+                self.fix_meshes_by_setting_genshin_materials(mesh_object.name)
 
-        face_meshes = [mesh for mesh_name, mesh in bpy.data.meshes.items() if 'face' in mesh_name.lower()]
-        self.fix_face_outlines_by_reordering_material_slots(face_meshes)
+        face_meshes = [mesh for mesh_name, mesh in self.get_character_mesh_items() if 'face' in mesh_name.lower()]
+        self.fix_face_outlines_by_updating_face_meshes(face_meshes)
 
     def create_geometry_nodes_modifier(self, mesh_name):
         mesh = bpy.context.scene.objects[mesh_name]
@@ -385,6 +420,8 @@ class PunishingGrayRavenGeometryNodesSetup(V3_GenshinImpactGeometryNodesSetup):
             if not geometry_nodes_modifier:
                 geometry_nodes_modifier = mesh.modifiers.new(f'{NAME_OF_GEOMETRY_NODES_MODIFIER} {mesh_name}', 'NODES')
                 geometry_nodes_modifier.node_group = outlines_node_group
+            if self.context.window_manager.setup_wizard_combined_outlines_modifier_enabled:
+                self.combine_light_vectors_into_outlines_modifier(mesh, geometry_nodes_modifier, outlines_node_group)
             self.set_up_modifier_default_values(geometry_nodes_modifier, mesh)
         return geometry_nodes_modifier
 
@@ -434,13 +471,13 @@ class V2_PunishingGrayRavenGeometryNodesSetup(GameGeometryNodesSetup):
 
     def setup_geometry_nodes(self):
         self.clone_outlines(self.material_names)
-        character_armature = [obj for obj in bpy.data.objects if obj.type == 'ARMATURE'][0]  # Expecting 1 armature in scene
+        mesh_name_index = self.get_character_mesh_name_index()
+        character_armature = get_target_armature(self.context)
         character_armature_mesh_names = [obj.name for obj in character_armature.children if obj.type == 'MESH']
 
         for mesh_name in character_armature_mesh_names:  # It is important that this is created and placed before Outlines!!
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name == object_name or f'_{mesh_name}' in object_name):
-                    self.create_light_vectors_modifier(f'{object_name}{BODY_PART_SUFFIX}')
+            for mesh_object in mesh_name_index.find(mesh_name):
+                self.create_light_vectors_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
 
         local_mesh_names_to_create_geometry_nodes_on = [
             mesh.name for mesh in bpy.data.meshes if [
@@ -453,13 +490,12 @@ class V2_PunishingGrayRavenGeometryNodesSetup(GameGeometryNodesSetup):
                 'Alpha' not in mesh_name
         ]
         for mesh_name in [item for item in local_mesh_names_to_create_geometry_nodes_on]:
-            for object_name, object_data in bpy.context.scene.objects.items():
-                if object_data.type == 'MESH' and (mesh_name.lower() in object_name.lower()):
-                    self.create_geometry_nodes_modifier(f'{object_name}{BODY_PART_SUFFIX}')
-                    self.fix_meshes_by_setting_genshin_materials(object_name)
+            for mesh_object in mesh_name_index.find_containing(mesh_name):
+                self.create_geometry_nodes_modifier(f'{mesh_object.name}{BODY_PART_SUFFIX}')
+                self.fix_meshes_by_setting_genshin_materials(mesh_object.name)
 
-        face_meshes = [mesh for mesh_name, mesh in bpy.data.meshes.items() if 'face' in mesh_name.lower()]
-        self.fix_face_outlines_by_reordering_material_slots(face_meshes)
+        face_meshes = [mesh for mesh_name, mesh in self.get_character_mesh_items() if 'face' in mesh_name.lower()]
+        self.fix_face_outlines_by_updating_face_meshes(face_meshes)
 
     def create_geometry_nodes_modifier(self, mesh_name):
         mesh = bpy.context.scene.objects[mesh_name]
@@ -474,5 +510,7 @@ class V2_PunishingGrayRavenGeometryNodesSetup(GameGeometryNodesSetup):
             if not geometry_nodes_modifier:
                 geometry_nodes_modifier = mesh.modifiers.new(f'{NAME_OF_GEOMETRY_NODES_MODIFIER} {mesh_name}', 'NODES')
                 geometry_nodes_modifier.node_group = outlines_node_group
+            if self.context.window_manager.setup_wizard_combined_outlines_modifier_enabled:
+                self.combine_light_vectors_into_outlines_modifier(mesh, geometry_nodes_modifier, outlines_node_group)
             self.set_up_modifier_default_values(geometry_nodes_modifier, mesh)
         return geometry_nodes_modifier
@@ -0,0 +1,175 @@
+import bpy
+
+from bpy.app.handlers import persistent
+from bpy.props import EnumProperty
+from bpy.types import Operator
+
+from setup_wizard.geometry_nodes_setup.combined_node_groups import OUTLINES_IN_RENDER_INPUT_NAME, \
+    OUTLINES_IN_VIEWPORT_INPUT_NAME, get_group_input_identifier, is_combined_node_group
+from setup_wizard.geometry_nodes_setup.geometry_nodes_setups import NAME_OF_GEOMETRY_NODES_MODIFIER
+from setup_wizard.outline_import_setup.outline_node_groups import OutlineNodeGroupNames
+from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+from setup_wizard.utils.armature_utils import get_objects_of_armature, get_target_armature
+
+# Custom properties on the armature, can be keyframed or driven
+OUTLINE_LOD_PROPERTY_NAME = 'Outline LOD'
+OUTLINE_LOD_DISTANCES_PROPERTY_NAME = 'Outline LOD Distances'
+DEFAULT_OUTLINE_LOD_DISTANCES = [15.0, 40.0]
+
+# Outline LOD levels
+AUTO = -1  # By distance to the scene camera
+FULL = 0  # Outlines and light vectors
+REDUCED = 1  # Outlines are only shown in renders
+OFF = 2  # No outlines, light vectors are only evaluated in renders
+
+OUTLINE_LOD_ITEMS = [
+    (str(AUTO), 'Auto (Camera Distance)', 'Full within the first distance, Reduced within the second distance, Off beyond'),
+    (str(FULL), 'Full', 'Outlines and light vectors in the viewport and in renders'),
+    (str(REDUCED), 'Reduced', 'Outlines are hidden in the viewport and only shown in renders'),
+    (str(OFF), 'Off', 'Outlines are disabled, light vectors are only evaluated in renders'),
+]
+
+# armature name -> last applied level, so modifiers are only written when the level changes
+applied_outline_lod_levels = {}
+
+
+class GI_OT_SetUpOutlineLOD(Operator, CustomOperatorProperties):
+    '''Sets the Outline LOD of the selected characters (or the target character)'''
+    bl_idname = 'hoyoverse.set_up_outline_lod'
+    bl_label = 'Set Up Outline LOD'
+
+    outline_lod_level: EnumProperty(
+        name='Outline LOD',
+        items=OUTLINE_LOD_ITEMS,
+        default=str(AUTO),
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        armatures = [object for object in context.selected_objects if object.type == 'ARMATURE'] or \
+            [get_target_armature(context)]
+        armatures = [armature for armature in armatures if armature]
+
+        if not armatures:
+            self.report({'ERROR'}, 'No armature found to set up Outline LOD for')
+            super().clear_custom_properties()
+            return {'CANCELLED'}
+
+        for armature in armatures:
+            armature[OUTLINE_LOD_PROPERTY_NAME] = int(self.outline_lod_level)
+            if OUTLINE_LOD_DISTANCES_PROPERTY_NAME not in armature:
+                armature[OUTLINE_LOD_DISTANCES_PROPERTY_NAME] = DEFAULT_OUTLINE_LOD_DISTANCES
+            applied_outline_lod_levels.pop(armature.name_full, None)
+
+        register_outline_lod_handler()
+        update_outline_lod(context.scene, context.evaluated_depsgraph_get())
+
+        self.report({'INFO'}, f'Set Outline LOD of {len(armatures)} character(s) to '
+            f'{dict((item[0], item[1]) for item in OUTLINE_LOD_ITEMS).get(self.outline_lod_level)}')
+        super().clear_custom_properties()
+        return {'FINISHED'}
+
+
+'''
+    Runs after every frame change (playback, scrubbing, rendering) and applies the Outline LOD of every character
+    that has one set up. Modifiers are only written when a character's level changes.
+    After the frame is evaluated, so the camera and character positions are the ones of the new frame. Blender
+    re-evaluates the frame when a frame_change_post handler changes something, so the level applies to this frame.
+'''
+@persistent
+def update_outline_lod(scene, depsgraph=None):
+    for armature in [object for object in scene.objects if object.type == 'ARMATURE' and OUTLINE_LOD_PROPERTY_NAME in object]:
+        outline_lod_level = get_outline_lod_level(armature, scene, depsgraph)
+
+        if applied_outline_lod_levels.get(armature.name_full) != outline_lod_level:
+            apply_outline_lod_level(armature, outline_lod_level, scene)
+            applied_outline_lod_levels[armature.name_full] = outline_lod_level
+
+
+# Levels of the previous file would keep the modifiers of the loaded file from being written
+@persistent
+def clear_applied_outline_lod_levels(*args):
+    applied_outline_lod_levels.clear()
+
+
+def get_outline_lod_level(armature, scene, depsgraph=None):
+    outline_lod_level = int(armature.get(OUTLINE_LOD_PROPERTY_NAME, FULL))
+    if outline_lod_level != AUTO:
+        return outline_lod_level
+    if not scene.camera:
+        return FULL
+
+    near_distance, far_distance = armature.get(OUTLINE_LOD_DISTANCES_PROPERTY_NAME, DEFAULT_OUTLINE_LOD_DISTANCES)
+    camera, armature = (scene.camera.evaluated_get(depsgraph), armature.evaluated_get(depsgraph)) if depsgraph else \
+        (scene.camera, armature)
+    distance = (camera.matrix_world.translation - armature.matrix_world.translation).length
+    return FULL if distance < near_distance else REDUCED if distance < far_distance else OFF
+
+
+def apply_outline_lod_level(armature, outline_lod_level, scene):
+    for object in get_objects_of_armature(armature, scene.objects):
+        for modifier in getattr(object, 'modifiers', []):
+            if modifier.type != 'NODES':
+                continue
+
+            if modifier.name.startswith(f'{NAME_OF_GEOMETRY_NODES_MODIFIER} '):
+                if is_combined_outlines_modifier(modifier):
+                    # Light vectors are part of the modifier, only the outline branch of the node group is toggled
+                    set_combined_outlines(object, modifier, outline_lod_level == FULL, outline_lod_level != OFF)
+                    set_modifier_visibility(modifier, outline_lod_level != OFF, True)
+                elif modifier.node_group and is_combined_node_group(
+                        modifier.node_group, OutlineNodeGroupNames.V3_LIGHT_VECTORS_GEOMETRY_NODES):
+                    # Combined before the outlines switch (re-run Set Up Geometry Nodes), hiding it hides light vectors
+                    continue
+                else:
+                    set_modifier_visibility(modifier, outline_lod_level == FULL, outline_lod_level != OFF)
+            elif modifier.node_group and modifier.node_group.name in OutlineNodeGroupNames.V3_LIGHT_VECTORS_GEOMETRY_NODES:
+                set_modifier_visibility(modifier, outline_lod_level != OFF, True)
+
+
+# Outlines modifier with the Light Vectors node group combined into it (combined_node_groups)
+def is_combined_outlines_modifier(modifier):
+    return modifier.node_group is not None and \
+        get_group_input_identifier(modifier.node_group, OUTLINES_IN_VIEWPORT_INPUT_NAME) is not None
+
+
+def set_combined_outlines(object, modifier, show_viewport, show_render):
+    is_changed = False
+    for input_name, value in [(OUTLINES_IN_VIEWPORT_INPUT_NAME, show_viewport),
+                              (OUTLINES_IN_RENDER_INPUT_NAME, show_render)]:
+        input_identifier = get_group_input_identifier(modifier.node_group, input_name)
+        if input_identifier and modifier.get(input_identifier) != value:
+            modifier[input_identifier] = value
+            is_changed = True
+    if is_changed:
+        object.update_tag()  # Writing modifier inputs as ID properties does not tag the object for re-evaluation
+
+
+def set_modifier_visibility(modifier, show_viewport, show_render):
+    # Only write on change, writing show_viewport always tags the object for re-evaluation
+    if modifier.show_viewport != show_viewport:
+        modifier.show_viewport = show_viewport
+    if modifier.show_render != show_render:
+        modifier.show_render = show_render
+
+
+def get_outline_lod_handlers():
+    return [
+        (bpy.app.handlers.frame_change_post, update_outline_lod),
+        (bpy.app.handlers.load_post, clear_applied_outline_lod_levels),
+    ]
+
+
+def register_outline_lod_handler():
+    unregister_outline_lod_handler()  # Also removes the handlers of a previously loaded (reloaded) module
+    for handlers, outline_lod_handler in get_outline_lod_handlers():
+        handlers.append(outline_lod_handler)
+
+
+def unregister_outline_lod_handler():
+    for handlers, outline_lod_handler in get_outline_lod_handlers():
+        for handler in [handler for handler in handlers if
+                        getattr(handler, '__name__', None) == outline_lod_handler.__name__]:
+            handlers.remove(handler)
@@ -1,5 +1,6 @@
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 import os
 from pathlib import PurePosixPath
@@ -18,11 +19,16 @@ from setup_wizard.domain.outline_material_data import OutlineMaterialGroup
 from setup_wizard.exceptions import UnsupportedMaterialDataJsonFormatException, UserInputException
 from setup_wizard.import_order import CHARACTER_MODEL_FOLDER_FILE_PATH, get_cache
 from setup_wizard.material_data_import_setup.material_data_applier import MaterialDataApplier, MaterialDataAppliersFactory
-from setup_wizard.parsers.material_data_json_parsers import MaterialDataJsonParser, HoyoStudioMaterialDataJsonParser, \
-    UABEMaterialDataJsonParser, UnknownHoyoStudioMaterialDataJsonParser
+from setup_wizard.material_data_import_setup.material_data_bundle import MATERIAL_DATA_BUNDLE_FILE_NAME, MaterialDataBundle
+from setup_wizard.material_data_import_setup.material_data_change_report import MaterialDataChangeReport
+from setup_wizard.parsers.material_data_json_parsers import BundledMaterialDataJsonParser, MaterialDataJsonParser, \
+    HoyoStudioMaterialDataJsonParser, UABEMaterialDataJsonParser, UnknownHoyoStudioMaterialDataJsonParser
 from setup_wizard.utils.genshin_body_part_deducer import get_monster_body_part_name, get_npc_mesh_body_part_name
+from setup_wizard.utils import material_utils
 
 class GameMaterialDataImporter(ABC):
+    MAX_JSON_LOADER_THREADS = 8
+
     @abstractmethod
     def import_material_data(self):
         raise NotImplementedError
@@ -54,12 +60,37 @@ class GameMaterialDataImporter(ABC):
                     raise UnsupportedMaterialDataJsonFormatException(self.parsers)
 
     def open_and_load_json_data(self, directory_file_path, file):
-        with open(f'{directory_file_path}/{file.name}') as fp:
+        return self.__load_json_data(directory_file_path, file.name)
+
+    '''
+        Loads and parses the material data jsons in a thread pool and yields (file, json_material_data) in the order
+        the files finish loading. Only file IO and json parsing happen off the main thread, bpy is not thread-safe
+        so the material data must still be applied by the caller on the main thread.
+    '''
+    def open_and_load_json_data_concurrently(self, directory_file_path, files):
+        files = list(files)
+        file_names = [file.name for file in files]  # Read the names on the main thread, files may be bpy properties
+        max_workers = max(1, min(self.MAX_JSON_LOADER_THREADS, len(files)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_file = {
+                executor.submit(self.__load_json_data, directory_file_path, file_name): file
+                for file, file_name in zip(files, file_names)
+            }
+            try:
+                for future in as_completed(future_to_file):
+                    yield future_to_file[future], future.result()
+            finally:
+                for future in future_to_file:
+                    future.cancel()  # Don't keep loading files if we stopped early (ex. a json failed to load)
+
+    def __load_json_data(self, directory_file_path, file_name):
+        with open(f'{directory_file_path}/{file_name}') as fp:
             try:
                 json_material_data = json.load(fp)
                 return json_material_data
             except UnicodeDecodeError:
-                raise Exception(f'Failed to load JSON. Did you select a different type of file? \nFile Selected: "{file.name}"')
+                raise Exception(f'Failed to load JSON. Did you select a different type of file? \nFile Selected: "{file_name}"')
 
     def find_material_and_outline_material_for_body_part(self, body_part) -> (Material, Material):
         # Order of Selection
@@ -72,11 +103,13 @@ class GameMaterialDataImporter(ABC):
 
         # Order of Selection
         # 1. Outline Material selected.
-        # 2. Shader Materials not renamed (regular setup).
-        # 3. Shader Materials renamed. Search for material.
+        # 2. Outline Material shared by the Shader Material (Shared Outline Materials).
+        # 3. Shader Materials not renamed (regular setup).
+        # 4. Shader Materials renamed. Search for material.
         searched_outlines_materials = [material for material in bpy.data.materials.values() if f' {body_part} Outlines' in material.name]
         searched_outlines_material = searched_outlines_materials[0] if searched_outlines_materials else None
-        outlines_material: Material = self.outlines_material or bpy.data.materials.get(f'{self.material_names.MATERIAL_PREFIX}{body_part} Outlines') or searched_outlines_material
+        outlines_material: Material = self.outlines_material or material_utils.get_outlines_material(material) or \
+            bpy.data.materials.get(f'{self.material_names.MATERIAL_PREFIX}{body_part} Outlines') or searched_outlines_material
 
         return (material, outlines_material)
 
@@ -112,10 +145,13 @@ class GenshinImpactMaterialDataImporter(GameMaterialDataImporter):
             HoyoStudioMaterialDataJsonParser,
             UnknownHoyoStudioMaterialDataJsonParser,
             UABEMaterialDataJsonParser,
+            BundledMaterialDataJsonParser,
         ]
         self.material = outline_material_group.material
         self.outlines_material = outline_material_group.outlines_material
         self.material_names = material_names
+        self.material_data_change_report = MaterialDataChangeReport() if \
+            self.context.window_manager.setup_wizard_incremental_material_data_import_enabled else None
 
     def import_material_data(self):
         self.__validate_UI_inputs_for_targeted_material_data_import()
@@ -143,6 +179,8 @@ class GenshinImpactMaterialDataImporter(GameMaterialDataImporter):
             class Object(object):
                 pass
             for filename in os.listdir(material_data_directory):
+                if filename == MATERIAL_DATA_BUNDLE_FILE_NAME:
+                    continue
                 temp_object = Object()
                 temp_object.name = filename
                 material_data_files.append(temp_object)
@@ -166,7 +204,13 @@ class GenshinImpactMaterialDataImporter(GameMaterialDataImporter):
 
         self.__validate_num_of_file_inputs_for_targeted_material_data_import(material_data_files)
 
-        for file in material_data_files:
+        # A Material Data Bundle can only be used when applying the whole Material folder
+        material_data_bundle = MaterialDataBundle.load(material_data_directory) if \
+            material_data_directory and not self.blender_operator.files and not is_targeted_material_data_import else None
+        material_data_loader = material_data_bundle.items() if material_data_bundle else \
+            self.open_and_load_json_data_concurrently(directory_file_path, material_data_files)
+
+        for file, json_material_data in material_data_loader:
             body_part = None
 
             if 'Monster' in file.name:
@@ -183,8 +227,6 @@ class GenshinImpactMaterialDataImporter(GameMaterialDataImporter):
                 body_part = PurePosixPath(file.name).stem.split('_')[-1]
                 character_type = CharacterType.UNKNOWN  # catch-all, tries default material applying behavior
 
-            json_material_data = self.open_and_load_json_data(directory_file_path, file)
-
             material, outlines_material = self.find_material_and_outline_material_for_body_part(body_part)
             outline_material_group: OutlineMaterialGroup = OutlineMaterialGroup(material, outlines_material)
 
@@ -201,7 +243,8 @@ class GenshinImpactMaterialDataImporter(GameMaterialDataImporter):
                 self.blender_operator.game_type,
                 material_data_parser,
                 outline_material_group,
-                character_type
+                character_type,
+                self.material_data_change_report
             )
             self.apply_material_data(body_part, material_data_appliers)
         return {'FINISHED'}
@@ -226,10 +269,13 @@ class HonkaiStarRailMaterialDataImporter(GameMaterialDataImporter):
             HoyoStudioMaterialDataJsonParser,
             UnknownHoyoStudioMaterialDataJsonParser,
             UABEMaterialDataJsonParser,
+            BundledMaterialDataJsonParser,
         ]
         self.material = outline_material_group.material
         self.outlines_material = outline_material_group.outlines_material
         self.material_names = material_names
+        self.material_data_change_report = MaterialDataChangeReport() if \
+            self.context.window_manager.setup_wizard_incremental_material_data_import_enabled else None
 
     def import_material_data(self):
         directory_file_path = os.path.dirname(self.blender_operator.filepath)
@@ -245,13 +291,11 @@ class HonkaiStarRailMaterialDataImporter(GameMaterialDataImporter):
             )
             return {'FINISHED'}
 
-        for file in self.blender_operator.files:
+        for file, json_material_data in self.open_and_load_json_data_concurrently(directory_file_path, self.blender_operator.files):
             body_part = 'Body_Trans' if PurePosixPath(file.name).stem.split('_')[-1] == 'Trans' \
                 else PurePosixPath(file.name).stem.split('_')[-1]
             character_type = CharacterType.HSR_AVATAR
 
-            json_material_data = self.open_and_load_json_data(directory_file_path, file)
-
             material, outlines_material = self.find_material_and_outline_material_for_body_part(body_part)
             outline_material_group: OutlineMaterialGroup = OutlineMaterialGroup(material, outlines_material)
 
@@ -268,7 +312,8 @@ class HonkaiStarRailMaterialDataImporter(GameMaterialDataImporter):
                 self.blender_operator.game_type,
                 material_data_parser,
                 outline_material_group,
-                character_type
+                character_type,
+                self.material_data_change_report
             )
             self.apply_material_data(body_part, material_data_appliers)
 
@@ -282,10 +327,13 @@ class PunishingGrayRavenMaterialDataImporter(GameMaterialDataImporter):
             HoyoStudioMaterialDataJsonParser,
             UnknownHoyoStudioMaterialDataJsonParser,
             UABEMaterialDataJsonParser,
+            BundledMaterialDataJsonParser,
         ]
         self.material = outline_material_group.material
         self.outlines_material = outline_material_group.outlines_material
         self.material_names = material_names
+        self.material_data_change_report = MaterialDataChangeReport() if \
+            self.context.window_manager.setup_wizard_incremental_material_data_import_enabled else None
 
     def import_material_data(self):
         return {'FINISHED'}
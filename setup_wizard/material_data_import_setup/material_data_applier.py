@@ -9,10 +9,23 @@ from setup_wizard.domain.character_types import CharacterType
 from setup_wizard.domain.game_types import GameType
 from setup_wizard.domain.outline_material_data import OutlineMaterialGroup
 from setup_wizard.domain.shader_material_names import V3_BonnyFestivityGenshinImpactMaterialNames
+from setup_wizard.material_data_import_setup.material_data_change_report import MaterialDataChangeReport
 
 
 class MaterialDataAppliersFactory:
-    def create(game_type, material_data_parser, outline_material_group: OutlineMaterialGroup, character_type: CharacterType):
+    def create(game_type, material_data_parser, outline_material_group: OutlineMaterialGroup, character_type: CharacterType,
+               material_data_change_report: MaterialDataChangeReport=None):
+        material_data_appliers = MaterialDataAppliersFactory.create_material_data_appliers(
+            game_type,
+            material_data_parser,
+            outline_material_group,
+            character_type
+        )
+        for material_data_applier in material_data_appliers:
+            material_data_applier.material_data_change_report = material_data_change_report
+        return material_data_appliers
+
+    def create_material_data_appliers(game_type, material_data_parser, outline_material_group: OutlineMaterialGroup, character_type: CharacterType):
         if game_type == GameType.GENSHIN_IMPACT.name:
             if character_type is CharacterType.GI_EQUIPMENT:
                 # V2_WeaponMaterialDataApplier is technically unnecessary for now, does same logic as V2_MaterialDataApplier
@@ -43,6 +56,9 @@ class MaterialDataApplier(ABC):
         '_OutlineColor5': 'Outline Color 5'
     }
 
+    # When set, Material Data is applied incrementally: only values that differ from the node input are written
+    material_data_change_report: MaterialDataChangeReport = None
+
     def __init__(self, material_data_parser, outline_material_group: OutlineMaterialGroup, outlines_node_tree_node_name):
         self.material_data_parser = material_data_parser
         self.material = outline_material_group.material
@@ -59,9 +75,15 @@ class MaterialDataApplier(ABC):
         self.apply_material_data(
             self.outline_mapping, 
             outlines_shader_node_inputs,
+            self.outline_material,
         )
 
-    def apply_material_data(self, material_mapping, node_inputs):
+    '''
+        material: material (or node group) the node inputs belong to, used in the change report, defaults to the
+        mesh material
+    '''
+    def apply_material_data(self, material_mapping, node_inputs, material=None):
+        material = material or self.material
         for material_json_name, material_node_name in material_mapping.items():
             material_json_value = self.get_value_in_json_parser(self.material_data_parser, material_json_name)
 
@@ -75,12 +97,35 @@ class MaterialDataApplier(ABC):
                 # Currently it doesn't do a conversion from gamma-corrected RGB to linear color space
                 if type(self) is V2_HSR_MaterialDataApplier and type(material_json_value) is tuple:
                     material_json_value = self.convert_color_srgb_to_hex_to_rgb(material_json_value)
-                node_input.default_value = material_json_value
+                self.set_node_input_value(node_input, material_json_value, material)
             except AttributeError as ex:
                 print(f'Did not find {material_node_name} in {self.material.name}/{self.outline_material.name} material using {self} \
                     Falling back to next MaterialDataApplier version')
                 raise ex
 
+    '''
+        Writing default_value triggers a material/depsgraph update even if the value is the same, so in incremental
+        mode we compare against the current value first and only write (and report) the differences.
+    '''
+    def set_node_input_value(self, node_input, value, material):
+        if self.material_data_change_report is None:
+            node_input.default_value = value
+            return
+
+        current_value = node_input.default_value
+        if MaterialDataChangeReport.is_same_value(current_value, value):
+            self.material_data_change_report.add_unchanged()
+            return
+
+        previous_value = MaterialDataChangeReport.to_tuple(current_value)  # copy, bpy arrays reference the socket
+        node_input.default_value = value
+        self.material_data_change_report.add_change(
+            material.name,
+            node_input.name,
+            previous_value if len(previous_value) > 1 else previous_value[0],
+            value
+        )
+
     def get_value_in_json_parser(self, parser, key):
         try:
             return getattr(parser.m_floats, key)
@@ -179,6 +224,7 @@ class V1_MaterialDataApplier(MaterialDataApplier):
             super().apply_material_data(
                 self.global_material_mapping,
                 global_material_properties_node_inputs,
+                bpy.data.node_groups["GLOBAL MATERIAL PROPERTIES"],
             )
 
 
@@ -264,7 +310,8 @@ class V2_MaterialDataApplier(MaterialDataApplier):
 
         super().apply_material_data(
             self.local_material_mapping,
-            outline_material_shader_node_tree_inputs
+            outline_material_shader_node_tree_inputs,
+            self.outline_material,
         )
 
     # We should consider abstracting this logic if we need to add additional logic for other material data values
@@ -285,6 +332,7 @@ class V2_MaterialDataApplier(MaterialDataApplier):
             },
             3: {},
         }
+        material = self.outline_material if outlines_alpha_only else self.material  # Owner of the node inputs
 
         _MainTexAlphaUse_value = int(self.get_value_in_json_parser(self.material_data_parser, _MainTexAlphaUse_name))
         _MainTexAlphaUse_material_node_dict = _MainTexAlphaUse_mapping.get(_MainTexAlphaUse_value)
@@ -300,7 +348,7 @@ class V2_MaterialDataApplier(MaterialDataApplier):
         for material_node_name, material_json_value in _MainTexAlphaUse_material_node_dict.items():
             node_input = node_inputs.get(material_node_name)
             try:
-                node_input.default_value = material_json_value
+                self.set_node_input_value(node_input, material_json_value, material)
             except AttributeError as ex:
                 print(f'Did not find {material_node_name} in {self.material.name} material using {self} \
                     Skipped.')
@@ -419,7 +467,8 @@ class V3_MaterialDataApplier(V2_MaterialDataApplier):
 
         super().apply_material_data(
             self.outline_mapping,
-            outline_material_shader_node_tree_inputs
+            outline_material_shader_node_tree_inputs,
+            self.outline_material,
         )
 
 
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+
+from setup_wizard.exceptions import UnsupportedMaterialDataJsonFormatException
+from setup_wizard.parsers.material_data_json_parsers import MaterialDataJsonParser, HoyoStudioMaterialDataJsonParser, \
+    UnknownHoyoStudioMaterialDataJsonParser, UABEMaterialDataJsonParser
+
+MATERIAL_DATA_BUNDLE_FILE_NAME = 'MaterialData.bundle.json'
+
+
+class MaterialDataFile:
+    # Matches the 'name' field of the Operator's files so bundled files can be used in place of selected files
+    def __init__(self, name):
+        self.name = name
+
+
+'''
+    A Material Data Bundle is a single compact json stored inside a character's Material folder.
+    It holds the normalized m_Floats and m_Colors of every material data json in the folder (regardless of which
+    dump format it was in) along with the size, mtime and hash of each source file.
+
+    {
+        "version": 1,
+        "sources": { "<file name>": { "size": ..., "mtime_ns": ..., "sha1": "..." } },
+        "material_data": { "<file name>": { "m_Floats": { ... }, "m_Colors": { "<key>": [r, g, b, a] } } }
+    }
+'''
+class MaterialDataBundle:
+    VERSION = 1
+    PARSERS = [
+        HoyoStudioMaterialDataJsonParser,
+        UnknownHoyoStudioMaterialDataJsonParser,
+        UABEMaterialDataJsonParser,
+    ]
+
+    def __init__(self, sources, material_data, skipped_files=None):
+        self.sources = sources
+        self.material_data = material_data
+        self.skipped_files = skipped_files or {}  # file name -> reason, files left out when compiling
+
+    def items(self):
+        for file_name, normalized_material_data in self.material_data.items():
+            yield MaterialDataFile(file_name), normalized_material_data
+
+    @staticmethod
+    def get_bundle_file_path(material_data_directory):
+        return os.path.join(material_data_directory, MATERIAL_DATA_BUNDLE_FILE_NAME)
+
+    @staticmethod
+    def get_source_file_names(material_data_directory):
+        return [
+            file_name for file_name in os.listdir(material_data_directory) if
+                file_name != MATERIAL_DATA_BUNDLE_FILE_NAME and
+                os.path.isfile(os.path.join(material_data_directory, file_name))
+        ]
+
+    @staticmethod
+    def compile(material_data_directory):
+        sources = {}
+        material_data = {}
+        skipped_files = {}
+
+        for file_name in sorted(MaterialDataBundle.get_source_file_names(material_data_directory)):
+            file_path = os.path.join(material_data_directory, file_name)
+            with open(file_path, 'rb') as fp:
+                raw_material_data = fp.read()
+            file_stat = os.stat(file_path)
+
+            sources[file_name] = {
+                'size': file_stat.st_size,
+                'mtime_ns': file_stat.st_mtime_ns,
+                'sha1': hashlib.sha1(raw_material_data).hexdigest(),
+            }
+
+            try:
+                json_material_data = json.loads(raw_material_data)
+                material_data_parser = MaterialDataBundle.__get_material_data_json_parser(json_material_data)
+            except (UnicodeDecodeError, ValueError, UnsupportedMaterialDataJsonFormatException) as ex:
+                print(f'WARNING: Skipping "{file_name}" in Material Data Bundle: {ex}')
+                skipped_files[file_name] = str(ex)
+                continue
+
+            material_data[file_name] = {
+                'm_Floats': vars(material_data_parser.m_floats),
+                'm_Colors': {key: list(value) for key, value in vars(material_data_parser.m_colors).items() if
+                             type(value) is tuple},
+            }
+        return MaterialDataBundle(sources, material_data, skipped_files)
+
+    def write(self, material_data_directory):
+        bundle_file_path = MaterialDataBundle.get_bundle_file_path(material_data_directory)
+        with open(bundle_file_path, 'w', encoding='utf-8') as fp:
+            json.dump({
+                'version': self.VERSION,
+                'sources': self.sources,
+                'material_data': self.material_data,
+            }, fp, ensure_ascii=False, separators=(',', ':'))
+        return bundle_file_path
+
+    '''
+        Returns the bundle in the folder or None if there is no bundle or it is out of date.
+        Staleness is checked against the size and mtime of the source files so the source jsons do not need to be read.
+        A source file with the same size but another mtime (ex. the Material folder was copied) is compared by sha1.
+    '''
+    @staticmethod
+    def load(material_data_directory):
+        bundle_file_path = MaterialDataBundle.get_bundle_file_path(material_data_directory)
+        if not os.path.isfile(bundle_file_path):
+            return None
+
+        try:
+            with open(bundle_file_path, encoding='utf-8') as fp:
+                json_bundle = json.load(fp)
+        except (UnicodeDecodeError, ValueError) as ex:
+            print(f'WARNING: Ignoring unreadable Material Data Bundle "{bundle_file_path}": {ex}')
+            return None
+
+        if json_bundle.get('version') != MaterialDataBundle.VERSION:
+            print(f'WARNING: Ignoring Material Data Bundle with unsupported version: {json_bundle.get("version")}')
+            return None
+
+        material_data_bundle = MaterialDataBundle(json_bundle.get('sources', {}), json_bundle.get('material_data', {}))
+        if not material_data_bundle.is_up_to_date(material_data_directory):
+            print(f'WARNING: Material Data Bundle "{bundle_file_path}" is out of date, loading material data jsons instead')
+            return None
+        return material_data_bundle
+
+    def is_up_to_date(self, material_data_directory):
+        source_file_names = MaterialDataBundle.get_source_file_names(material_data_directory)
+        if set(source_file_names) != set(self.sources.keys()):
+            return False
+
+        for file_name in source_file_names:
+            file_path = os.path.join(material_data_directory, file_name)
+            file_stat = os.stat(file_path)
+            source = self.sources.get(file_name)
+            if file_stat.st_size != source.get('size'):
+                return False
+            if file_stat.st_mtime_ns != source.get('mtime_ns') and \
+                    MaterialDataBundle.__hash_file(file_path) != source.get('sha1'):
+                return False
+        return True
+
+    @staticmethod
+    def __hash_file(file_path):
+        with open(file_path, 'rb') as fp:
+            return hashlib.sha1(fp.read()).hexdigest()
+
+    @staticmethod
+    def __get_material_data_json_parser(json_material_data):
+        for parser_class in MaterialDataBundle.PARSERS:
+            try:
+                parser: MaterialDataJsonParser = parser_class(json_material_data)
+                parser.parse()
+                return parser
+            except AttributeError:
+                continue
+        raise UnsupportedMaterialDataJsonFormatException(MaterialDataBundle.PARSERS)
@@ -0,0 +1,52 @@
+import bpy
+import os
+
+# ImportHelper is a helper class, defines filename and
+# invoke() function which calls the file selector.
+from bpy_extras.io_utils import ImportHelper
+from bpy.props import StringProperty
+from bpy.types import Operator
+
+from setup_wizard.material_data_import_setup.material_data_bundle import MaterialDataBundle
+from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+
+
+class GI_OT_CompileMaterialDataBundle(Operator, ImportHelper, CustomOperatorProperties):
+    """Select a Material Data Json in the character's Material folder to compile the folder into a Material Data Bundle"""
+    bl_idname = "hoyoverse.compile_material_data_bundle"
+    bl_label = "Select Material Folder"
+
+    # ImportHelper mixin class uses this
+    filename_ext = "*.*"
+
+    import_path: StringProperty(
+        name="Path",
+        description="Path to the character's Material folder",
+        default="",
+        subtype='DIR_PATH'
+    )
+
+    filter_glob: StringProperty(
+        default="*.*",
+        options={'HIDDEN'},
+        maxlen=255,  # Max internal buffer length, longer would be clamped.
+    )
+
+    def execute(self, context):
+        try:
+            material_data_directory = self.filepath if os.path.isdir(self.filepath) else os.path.dirname(self.filepath)
+
+            material_data_bundle = MaterialDataBundle.compile(material_data_directory)
+            bundle_file_path = material_data_bundle.write(material_data_directory)
+
+            self.report({'INFO'}, f'Compiled {len(material_data_bundle.material_data)} of '
+                f'{len(material_data_bundle.sources)} material data files into {bundle_file_path}')
+            if material_data_bundle.skipped_files:
+                self.report({'WARNING'}, f'Skipped {len(material_data_bundle.skipped_files)} files that could not be parsed as '
+                    f'material data: {", ".join(material_data_bundle.skipped_files.keys())}')
+        finally:
+            super().clear_custom_properties()
+        return {'FINISHED'}
+
+
+register, unregister = bpy.utils.register_classes_factory(GI_OT_CompileMaterialDataBundle)
@@ -0,0 +1,48 @@
+'''
+    Collects which node inputs were written (and which were skipped because the value was already set)
+    when Material Data is imported incrementally.
+'''
+class MaterialDataChangeReport:
+    FLOAT_TOLERANCE = 1e-6
+
+    def __init__(self):
+        self.changes = {}  # material name -> list of (node input name, previous value, new value)
+        self.num_of_unchanged_values = 0
+
+    def add_change(self, material_name, node_input_name, previous_value, new_value):
+        self.changes.setdefault(material_name, []).append((node_input_name, previous_value, new_value))
+
+    def add_unchanged(self):
+        self.num_of_unchanged_values += 1
+
+    def get_num_of_changed_values(self):
+        return sum(len(material_changes) for material_changes in self.changes.values())
+
+    @staticmethod
+    def is_same_value(current_value, new_value):
+        current_values = MaterialDataChangeReport.to_tuple(current_value)
+        new_values = MaterialDataChangeReport.to_tuple(new_value)
+
+        # Comparing with a tolerance because sockets store single-precision floats
+        return len(current_values) == len(new_values) and all(
+            abs(current - new) <= MaterialDataChangeReport.FLOAT_TOLERANCE for current, new in zip(current_values, new_values)
+        )
+
+    @staticmethod
+    def to_tuple(value):
+        try:
+            return tuple(value)  # Colors/Vectors (tuple or bpy_prop_array)
+        except TypeError:
+            return (value,)  # float, int, bool
+
+    def get_summary(self):
+        return f'Material Data Changes: {self.get_num_of_changed_values()} changed, ' \
+            f'{self.num_of_unchanged_values} unchanged'
+
+    def __str__(self):
+        report = f'{self.get_summary()}\n'
+        for material_name, material_changes in self.changes.items():
+            report += f'* {material_name}\n'
+            for node_input_name, previous_value, new_value in material_changes:
+                report += f'    {node_input_name}: {previous_value} -> {new_value}\n'
+        return report
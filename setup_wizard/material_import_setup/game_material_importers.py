@@ -5,6 +5,8 @@ import os
 from bpy.types import Operator, Context
 
 from setup_wizard.domain.game_types import GameType
+from setup_wizard.domain.shader_identifier_service import ShaderIdentifierServiceFactory
+from setup_wizard.exceptions import UserInputException
 from setup_wizard.domain.shader_material_names import V3_BonnyFestivityGenshinImpactMaterialNames, \
     V2_FestivityGenshinImpactMaterialNames, Nya222HonkaiStarRailShaderMaterialNames, \
     JaredNytsPunishingGrayRavenShaderMaterialNames
@@ -12,6 +14,13 @@ from setup_wizard.import_order import NextStepInvoker, cache_using_cache_key, ge
     FESTIVITY_ROOT_FOLDER_FILE_PATH, FESTIVITY_SHADER_FILE_PATH, NYA222_HONKAI_STAR_RAIL_ROOT_FOLDER_FILE_PATH, \
     NYA222_HONKAI_STAR_RAIL_SHADER_FILE_PATH, JAREDNYTS_PGR_ROOT_FOLDER_FILE_PATH, JAREDNYTS_PGR_SHADER_FILE_PATH
 from setup_wizard.outline_import_setup.outline_node_groups import OutlineNodeGroupNames
+from setup_wizard.services.blend_file_catalog_service import BlendFileCatalogService
+from setup_wizard.texture_import_setup.texture_node_names import Nya222HonkaiStarRailTextureNodeNames, \
+    JaredNytsPunishingGrayRavenTextureNodeNames
+from setup_wizard.utils import material_utils
+from setup_wizard.utils.armature_utils import is_multi_character_scene_enabled
+from setup_wizard.utils.library_loader import load_datablocks, make_linked_materials_local, \
+    share_duplicate_node_groups
 
 
 class GameMaterialImporterFactory:
@@ -27,22 +36,21 @@ class GameMaterialImporterFactory:
 
 
 class GameMaterialImporter:
-    MATERIAL_PATH_INSIDE_BLEND_FILE = 'Material'
-    NODE_TREE_PATH_INSIDE_BLEND_FILE = 'NodeTree'
-
     def __init__(self, 
                  blender_operator: Operator, 
                  context: Context,
                  game_shader_cache_file_path: str,
                  game_shader_cache_folder_path: str,
                  game_default_blend_file_with_materials: str,
-                 names_of_game_materials: list):
+                 names_of_game_materials: list,
+                 names_of_character_specific_node_groups: list = None):
         self.blender_operator = blender_operator
         self.context = context
         self.game_shader_file_path = game_shader_cache_file_path
         self.game_shader_folder_path = game_shader_cache_folder_path
         self.game_default_blend_file_with_materials = game_default_blend_file_with_materials
         self.names_of_game_materials = names_of_game_materials
+        self.names_of_character_specific_node_groups = names_of_character_specific_node_groups or []
 
     def import_materials(self):
         cache_enabled = self.context.window_manager.cache_enabled
@@ -66,61 +74,120 @@ class GameMaterialImporter:
             )
             return {'FINISHED'}
 
-        blend_file_with_genshin_materials = os.path.join(
-            user_selected_shader_blend_file_path,
-            self.MATERIAL_PATH_INSIDE_BLEND_FILE
-        ) if user_selected_shader_blend_file_path else None
-
-        default_blend_file_path = os.path.join(
-            project_root_directory_file_path,
-            self.game_default_blend_file_with_materials,
-            self.MATERIAL_PATH_INSIDE_BLEND_FILE
-        )
+        link_shader_enabled = self.context.window_manager.setup_wizard_link_shader_enabled
 
-        blend_file_with_genshin_node_tree = os.path.join(
-            user_selected_shader_blend_file_path,
-            self.NODE_TREE_PATH_INSIDE_BLEND_FILE
-        ) if user_selected_shader_blend_file_path else None
+        names_of_materials = [material_name.get('name') for material_name in self.names_of_game_materials]
 
-        default_blend_file_path_node_tree = os.path.join(
-            project_root_directory_file_path,
-            self.game_default_blend_file_with_materials,
-            self.NODE_TREE_PATH_INSIDE_BLEND_FILE
-        )
+        existing_node_group_names = set(bpy.data.node_groups.keys())
+        blend_file_catalog_service = BlendFileCatalogService(cache_enabled)
 
         try:
             # Use the exact file the user selected, otherwise fallback to the non-Goo blender file in the directory
-            shader_blend_file_path = blend_file_with_genshin_materials or default_blend_file_path
-            bpy.ops.wm.append(
-                directory=shader_blend_file_path,
-                files=self.names_of_game_materials,
-                set_fake=True
+            shader_blend_file_path = user_selected_shader_blend_file_path or self.__get_shader_blend_file_in_directory(
+                blend_file_catalog_service, project_root_directory_file_path, names_of_materials
+            )
+
+            def catalog_and_get_datablock_names_to_load(data_from):
+                blend_file_catalog_service.add_datablock_names(shader_blend_file_path, data_from)
+                return self.__get_datablock_names_to_load(
+                    blend_file_catalog_service, shader_blend_file_path, names_of_materials
+                )
+
+            # Materials and the Light Vectors geometry node are loaded in a single read of the shader .blend file
+            # Without a catalog entry, the names are picked during that same read, which also catalogs the file
+            loaded_datablocks = load_datablocks(
+                shader_blend_file_path,
+                self.__get_datablock_names_to_load(blend_file_catalog_service, shader_blend_file_path, names_of_materials)
+                    if blend_file_catalog_service.get_cached_datablock_names(shader_blend_file_path) is not None else
+                    catalog_and_get_datablock_names_to_load,
+                link=link_shader_enabled
             )
-            shader_blend_node_tree_file_path = blend_file_with_genshin_node_tree or default_blend_file_path_node_tree
-            self.import_light_vectors_geometry_node(shader_blend_node_tree_file_path)
-        except RuntimeError as ex:
+            materials = loaded_datablocks.get('materials')
+
+            if link_shader_enabled:
+                materials = make_linked_materials_local(materials, self.names_of_character_specific_node_groups)
+            elif is_multi_character_scene_enabled(self.context):
+                # Characters share the shader node groups, only the materials are per character
+                loaded_node_groups = [node_group for node_group in bpy.data.node_groups if
+                                      node_group.name not in existing_node_group_names]
+                number_of_shared_node_groups = share_duplicate_node_groups(loaded_node_groups, existing_node_group_names)
+                print(f'Shared {number_of_shared_node_groups} node groups with the characters already in the scene')
+            material_utils.add_fake_user_to_materials(materials)
+        except (OSError, RuntimeError) as ex:
             self.blender_operator.report({'ERROR'}, \
                 f"ERROR: Error when trying to append materials and Light Vector geometry node. \n\
                 Did not find `{self.game_default_blend_file_with_materials}` in the directory you selected. \n\
                 Try selecting the exact blend file you want to use.")
             raise ex
 
-        self.blender_operator.report({'INFO'}, 'Imported Shader/Genshin Materials...')
+        shader = blend_file_catalog_service.identify_shader(
+            shader_blend_file_path, ShaderIdentifierServiceFactory.create(self.blender_operator.game_type)
+        )
+        shader_name = f' ({shader.name})' if shader else ''
+        self.blender_operator.report({'INFO'}, f'Imported Shader/Genshin Materials{shader_name}...' if \
+            not link_shader_enabled else \
+            f'Linked Shader/Genshin Materials{shader_name} from {os.path.basename(shader_blend_file_path)}...')
         if cache_enabled and (user_selected_shader_blend_file_path or project_root_directory_file_path):
             if user_selected_shader_blend_file_path:
                 cache_using_cache_key(get_cache(cache_enabled), self.game_shader_file_path, user_selected_shader_blend_file_path)
             else:
                 cache_using_cache_key(get_cache(cache_enabled), self.game_shader_folder_path, project_root_directory_file_path)
 
-
-    def import_light_vectors_geometry_node(self, filepath):
-        for outline_node_group_name in OutlineNodeGroupNames.V3_LIGHT_VECTORS_GEOMETRY_NODES:
-            if not bpy.data.node_groups.get(outline_node_group_name):
-                bpy.ops.wm.append(
-                    filepath=os.path.join(filepath, outline_node_group_name),
-                    directory=os.path.join(filepath),
-                    filename=outline_node_group_name
-                )
+    '''
+        The default shader .blend file in the directory, otherwise the .blend file in the directory that has the
+        shader materials (found through the catalog, without appending anything)
+    '''
+    def __get_shader_blend_file_in_directory(self, blend_file_catalog_service, directory_file_path, names_of_materials):
+        default_shader_blend_file_path = os.path.join(directory_file_path, self.game_default_blend_file_with_materials)
+        if os.path.isfile(default_shader_blend_file_path) or not os.path.isdir(directory_file_path):
+            return default_shader_blend_file_path
+
+        blend_file_paths = [
+            os.path.join(directory_file_path, file_name) for file_name in sorted(os.listdir(directory_file_path)) if
+                file_name.lower().endswith('.blend')
+        ]
+        for material_name in names_of_materials:
+            shader_blend_file_paths = blend_file_catalog_service.find_blend_files_containing(
+                'materials', material_name, blend_file_paths
+            )
+            if shader_blend_file_paths:
+                print(f'Did not find {self.game_default_blend_file_with_materials}, using '
+                      f'{os.path.basename(shader_blend_file_paths[0])} which has the shader materials')
+                return shader_blend_file_paths[0]
+        return default_shader_blend_file_path
+
+    '''
+        Picks the datablocks to load from the catalog (datablock names) of the shader .blend file:
+        - the materials of the shader version in the file (identified from the catalog) instead of every version's
+        - only the Light Vectors node groups the file has
+        The wrong file (none of the shader materials) is rejected before anything is appended/linked.
+    '''
+    def __get_datablock_names_to_load(self, blend_file_catalog_service, shader_blend_file_path, names_of_materials):
+        datablock_names = blend_file_catalog_service.get_datablock_names(shader_blend_file_path)
+        material_names_in_blend_file = set(datablock_names.get('materials', []))
+        node_group_names_in_blend_file = set(datablock_names.get('node_groups', []))
+
+        if not [material_name for material_name in names_of_materials if material_name in material_names_in_blend_file]:
+            self.blender_operator.report({'ERROR'}, f'{os.path.basename(shader_blend_file_path)} does not contain '
+                                         f'any of the shader materials: {names_of_materials}')
+            raise UserInputException(f'\n\n>>> Selected shader .blend file has none of the shader materials: '
+                                     f'{shader_blend_file_path}')
+
+        shader_identifier_service = ShaderIdentifierServiceFactory.create(self.blender_operator.game_type)
+        shader = blend_file_catalog_service.identify_shader(shader_blend_file_path, shader_identifier_service)
+        names_of_shader_materials = shader_identifier_service.material_lists_to_search_through.get(shader)
+
+        return {
+            'materials': [
+                material_name for material_name in names_of_materials if
+                    material_name in material_names_in_blend_file and
+                    (not names_of_shader_materials or material_name in names_of_shader_materials)
+            ],
+            'node_groups': [
+                node_group_name for node_group_name in OutlineNodeGroupNames.V3_LIGHT_VECTORS_GEOMETRY_NODES if
+                    node_group_name in node_group_names_in_blend_file
+            ],
+        }
 
 class GenshinImpactMaterialImporterFacade(GameMaterialImporter):
     DEFAULT_BLEND_FILE_WITH_GENSHIN_MATERIALS = 'HoYoverse - Genshin Impact - Goo Engine v3.blend'
@@ -134,6 +201,15 @@ class GenshinImpactMaterialImporterFacade(GameMaterialImporter):
         {'name': V3_BonnyFestivityGenshinImpactMaterialNames.HAIR},
         {'name': V3_BonnyFestivityGenshinImpactMaterialNames.OUTLINES}
     ]
+    NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS = [
+        'Body Shadow Ramp',
+        'Hair Shadow Ramp',
+        'Body Specular Ramp',
+        'Hair Specular Ramp',
+        'Face Lightmap',
+        'Metallic Matcap',
+        'GLOBAL MATERIAL PROPERTIES',
+    ]
 
     def __init__(self, blender_operator, context):
         super().__init__(
@@ -142,7 +218,8 @@ class GenshinImpactMaterialImporterFacade(GameMaterialImporter):
             FESTIVITY_SHADER_FILE_PATH,
             FESTIVITY_ROOT_FOLDER_FILE_PATH,
             self.DEFAULT_BLEND_FILE_WITH_GENSHIN_MATERIALS,
-            self.NAMES_OF_GENSHIN_MATERIALS
+            self.NAMES_OF_GENSHIN_MATERIALS,
+            self.NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS
         )
 
     def import_materials(self):
@@ -178,6 +255,17 @@ class HonkaiStarRailMaterialImporterFacade(GameMaterialImporter):
         {'name': Nya222HonkaiStarRailShaderMaterialNames.OUTLINES},
         {'name': Nya222HonkaiStarRailShaderMaterialNames.WEAPON},
     ]
+    NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS = [
+        'Body_Ramp',
+        'Hair_Ramp',
+        'Body Shadow Ramp',
+        'Hair Shadow Ramp',
+        Nya222HonkaiStarRailTextureNodeNames.WEAPON_RAMP_NODE_GROUP,
+        Nya222HonkaiStarRailTextureNodeNames.FACE_MAP_NODE_GROUP,
+        Nya222HonkaiStarRailTextureNodeNames.FACE_EXPRESSION_NODE_GROUP,
+        Nya222HonkaiStarRailTextureNodeNames.STOCKINGS_BODY1_NODE_GROUP,
+        Nya222HonkaiStarRailTextureNodeNames.STOCKINGS_BODY2_NODE_GROUP,
+    ]
 
     def __init__(self, blender_operator, context):
         super().__init__(
@@ -186,7 +274,8 @@ class HonkaiStarRailMaterialImporterFacade(GameMaterialImporter):
             NYA222_HONKAI_STAR_RAIL_SHADER_FILE_PATH,
             NYA222_HONKAI_STAR_RAIL_ROOT_FOLDER_FILE_PATH,
             self.DEFAULT_BLEND_FILE_WITH_HSR_MATERIALS,
-            self.NAMES_OF_HONKAI_STAR_RAIL_MATERIALS
+            self.NAMES_OF_HONKAI_STAR_RAIL_MATERIALS,
+            self.NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS
         )
 
     def import_materials(self):
@@ -230,6 +319,10 @@ class PunishingGrayRavenMaterialImporterFacade(GameMaterialImporter):
         {'name': JaredNytsPunishingGrayRavenShaderMaterialNames.MAIN},
         {'name': JaredNytsPunishingGrayRavenShaderMaterialNames.OUTLINES},
     ]
+    NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS = [
+        JaredNytsPunishingGrayRavenTextureNodeNames.FACE_HEAO_NODE_GROUP,
+        JaredNytsPunishingGrayRavenTextureNodeNames.METALLIC_MATCAP_NODE_GROUP,
+    ]
 
     def __init__(self, blender_operator, context):
         super().__init__(
@@ -238,7 +331,8 @@ class PunishingGrayRavenMaterialImporterFacade(GameMaterialImporter):
             JAREDNYTS_PGR_SHADER_FILE_PATH,
             JAREDNYTS_PGR_ROOT_FOLDER_FILE_PATH,
             self.DEFAULT_BLEND_FILE_WITH_PGR_MATERIALS,
-            self.NAMES_OF_PUNISHING_GRAY_RAVEN_MATERIALS
+            self.NAMES_OF_PUNISHING_GRAY_RAVEN_MATERIALS,
+            self.NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS
         )
 
     def import_materials(self):
@@ -14,6 +14,7 @@ from setup_wizard.geometry_nodes_setup.geometry_nodes_setups import PunishingGra
 from setup_wizard.import_order import CHARACTER_MODEL_FOLDER_FILE_PATH, JAREDNYTS_PGR_CHIBI_MESH_FILE_PATH, NextStepInvoker
 from setup_wizard.import_order import NextStepInvoker, cache_using_cache_key, get_cache
 from setup_wizard.texture_import_setup.texture_node_names import JaredNytsPunishingGrayRavenTextureNodeNames
+from setup_wizard.utils.armature_utils import get_target_armature
 
 
 class PGR_OT_SetUpChibiFace(Operator, ImportHelper, CustomOperatorProperties):
@@ -36,7 +37,7 @@ class PGR_OT_SetUpChibiFace(Operator, ImportHelper, CustomOperatorProperties):
                     return status
 
                 chibi_face_mesh = [obj for obj in bpy.data.objects if obj.name == self.material_names.CHIBIFACE][0]
-                character_armature = [obj for obj in bpy.context.scene.objects if obj.type == 'ARMATURE'][0]
+                character_armature = get_target_armature(context)
 
                 self.__parent_mesh_to_armature(chibi_face_mesh, character_armature)
                 self.__set_up_armature_modifier(chibi_face_mesh, character_armature)
@@ -5,6 +5,7 @@ from bpy.types import Armature, Operator
 
 from setup_wizard.import_order import NextStepInvoker
 from setup_wizard.setup_wizard_operator_base_classes import BasicSetupUIOperator, CustomOperatorProperties
+from setup_wizard.utils.armature_utils import get_target_armature
 
 
 class GI_OT_FinishSetup(Operator, BasicSetupUIOperator):
@@ -20,7 +21,7 @@ class GI_OT_FixTransformations(Operator, CustomOperatorProperties):
 
     def execute(self, context):
         bpy.ops.object.select_all(action='DESELECT')
-        armature: Armature = [object for object in bpy.data.objects if object.type == 'ARMATURE'][0]  # expecting 1 armature
+        armature: Armature = get_target_armature(context)
         armature.select_set(True)
 
         # I don't want to modify any characters unless absolutely necessary
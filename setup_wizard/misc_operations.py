@@ -10,6 +10,16 @@ from setup_wizard.domain.shader_material_names import JaredNytsPunishingGrayRave
 from setup_wizard.import_order import NextStepInvoker
 from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
 from setup_wizard.texture_import_setup.texture_node_names import TextureNodeNames
+from setup_wizard.material_import_setup.game_material_importers import GenshinImpactMaterialImporterFacade, \
+    HonkaiStarRailMaterialImporterFacade, PunishingGrayRavenMaterialImporterFacade
+from setup_wizard.utils.armature_utils import get_target_armature, is_multi_character_scene_enabled
+from setup_wizard.utils.library_loader import contains_node_groups
+
+CHARACTER_SPECIFIC_NODE_GROUP_NAMES = {
+    GameType.GENSHIN_IMPACT.name: GenshinImpactMaterialImporterFacade.NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS,
+    GameType.HONKAI_STAR_RAIL.name: HonkaiStarRailMaterialImporterFacade.NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS,
+    GameType.PUNISHING_GRAY_RAVEN.name: PunishingGrayRavenMaterialImporterFacade.NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS,
+}
 
 
 class GI_OT_SetColorManagementToStandard(Operator, CustomOperatorProperties):
@@ -91,6 +101,13 @@ class GI_OT_RenameShaderMaterials(Operator, CustomOperatorProperties):
                 for material in materials_to_check:
                     self.__set_material_names(self.game_type, material, shader_material_names, body_diffuse_texture.name)
 
+                # Multi-Character Scene: Frees up the shader's node group names for the next character
+                if is_multi_character_scene_enabled(context):
+                    self.__set_character_specific_node_group_names(
+                        materials_to_check,
+                        self.__get_character_name(self.game_type, body_diffuse_texture.name)
+                    )
+
         if self.next_step_idx:
             NextStepInvoker().invoke(
                 self.next_step_idx, 
@@ -101,17 +118,46 @@ class GI_OT_RenameShaderMaterials(Operator, CustomOperatorProperties):
         return {'FINISHED'}
 
     def __set_material_names(self, game_type: GameType, material: Material, shader_material_names: ShaderMaterialNames, body_diffuse_filename):
+        character_name = self.__get_character_name(game_type, body_diffuse_filename)
+        if not character_name:
+            return
+        second_half_of_material_prefix = shader_material_names.MATERIAL_PREFIX.split('-')[1]
+        material.name = material.name.replace(f'-{second_half_of_material_prefix}', f'- {character_name} ')
+
+
+    def __get_character_name(self, game_type: GameType, body_diffuse_filename):
         if game_type == GameType.HONKAI_STAR_RAIL.name:
-            character_name = body_diffuse_filename.split('_')[1]
+            return body_diffuse_filename.split('_')[1]
         elif game_type == GameType.GENSHIN_IMPACT.name:
-            character_name = body_diffuse_filename.split('_')[3]
+            return body_diffuse_filename.split('_')[3]
         elif game_type == GameType.PUNISHING_GRAY_RAVEN.name:
-            armature =  [object for object in bpy.data.objects if object.type == 'ARMATURE'][0]
-            character_name = armature.name
+            armature = get_target_armature()
+            return armature.name
         else:
+            return None
+
+    '''
+        Renames the node groups holding the character's textures (ex. 'Body Shadow Ramp') and the node groups that
+        nest them, so the next character in the scene gets its own copies while all other node groups stay shared
+    '''
+    def __set_character_specific_node_group_names(self, materials, character_name):
+        if not character_name:
             return
-        second_half_of_material_prefix = shader_material_names.MATERIAL_PREFIX.split('-')[1]
-        material.name = material.name.replace(f'-{second_half_of_material_prefix}', f'- {character_name} ')
+        character_specific_node_group_names = CHARACTER_SPECIFIC_NODE_GROUP_NAMES.get(self.game_type, [])
+        contains_cache = {}
+        renamed_node_groups = set()
+
+        node_trees = [material.node_tree for material in materials if material.node_tree]
+        while node_trees:
+            node_tree = node_trees.pop()
+            for node in node_tree.nodes:
+                node_group = node.node_tree if node.type == 'GROUP' else None
+                if not node_group or node_group.library or node_group.name in renamed_node_groups or \
+                        not contains_node_groups(node_group, character_specific_node_group_names, contains_cache):
+                    continue
+                node_group.name = f'{node_group.name} - {character_name}'
+                renamed_node_groups.add(node_group.name)
+                node_trees.append(node_group)
 
 
 class GI_OT_SetUpArmTwistBoneConstraints(Operator, CustomOperatorProperties):
@@ -141,7 +187,7 @@ class GI_OT_SetUpArmTwistBoneConstraints(Operator, CustomOperatorProperties):
     RIGHT_FOREARM = 'Bip001RForearm'
 
     def execute(self, context):
-        armature =  [object for object in bpy.data.objects if object.type == 'ARMATURE'][0]
+        armature = get_target_armature(context)
         left_armtwist_bone_names, right_armtwist_bone_names = self.get_armtwist_bones()
 
         self.reorient_armtwist_bones(armature, left_armtwist_bone_names, self.LEFT_FOREARM)
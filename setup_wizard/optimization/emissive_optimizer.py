@@ -7,6 +7,8 @@ from bpy.types import Operator
 
 from setup_wizard.domain.shader_material_names import ShaderMaterialNames
 from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+from setup_wizard.utils import material_utils
+from setup_wizard.utils.library_loader import load_datablocks
 
 EMISSIVE_MATERIAL_SUFFIX = ' HELPER'
 
@@ -61,17 +63,18 @@ class GI_OT_Emissive_Optimizer(Operator, CustomOperatorProperties):
 
     def __append_optimizer_material(self):
         OPTIMIZER_BLEND_FILENAME = 'emissive_optimizer_helper_template.blend'
-        MATERIAL_PATH_INSIDE_BLEND_FILE = 'Material'
         NAMES_OF_OPTIMIZER_MATERIALS = [
-            {'name': ShaderMaterialNames.EMISSIVE_TEMPLATE_MATERIAL_NAME},
+            ShaderMaterialNames.EMISSIVE_TEMPLATE_MATERIAL_NAME,
         ]
-        optimizer_blend_filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), OPTIMIZER_BLEND_FILENAME, MATERIAL_PATH_INSIDE_BLEND_FILE)
-
-        bpy.ops.wm.append(
-            directory=optimizer_blend_filepath,
-            files=NAMES_OF_OPTIMIZER_MATERIALS,
-            set_fake=True
-        )
+        optimizer_blend_filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), OPTIMIZER_BLEND_FILENAME)
+
+        loaded_datablocks = load_datablocks(optimizer_blend_filepath, {
+            'materials': NAMES_OF_OPTIMIZER_MATERIALS,
+        })
+        if loaded_datablocks.get_missing_datablock_names('materials'):
+            self.report({'ERROR'}, f'Did not find {loaded_datablocks.get_missing_datablock_names("materials")} in '
+                        f'{OPTIMIZER_BLEND_FILENAME}')
+        material_utils.add_fake_user_to_materials(loaded_datablocks.get('materials'))
 
     def __get_original_material(self, material_name):
         return bpy.data.materials.get(f"{material_name.replace(EMISSIVE_MATERIAL_SUFFIX, '')}") if EMISSIVE_MATERIAL_SUFFIX in material_name else bpy.data.materials.get(material_name)
@@ -0,0 +1,79 @@
+import hashlib
+import numpy
+import time
+
+from bpy.types import Operator
+
+from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+from setup_wizard.utils.armature_utils import get_objects_of_armature, get_target_armature
+
+# Read by the combined Light Vectors + Outlines node group to smooth the outline normals (combined_node_groups.py)
+OUTLINE_NORMAL_GROUP_ATTRIBUTE_NAME = 'Outline Normal Group'
+OUTLINE_BAKE_SIGNATURE_PROPERTY_NAME = 'Outline Bake Signature'
+POSITION_TOLERANCE = 1e-5
+
+class GI_OT_Bake_Outline_Normals(Operator, CustomOperatorProperties):
+    """Bakes the vertices that share a smoothed outline normal into a mesh attribute"""
+    bl_idname = "hoyoverse.bake_outline_normals"
+    bl_label = "Bake Outline Normals"
+
+    def execute(self, context):
+        armature = get_target_armature(context)
+        if not armature:
+            self.report({'ERROR'}, 'No armature found to bake outline normals for')
+            super().clear_custom_properties()
+            return {'CANCELLED'}
+
+        start_time = time.perf_counter()
+        meshes = list(dict.fromkeys(
+            object.data for object in get_objects_of_armature(armature, context.scene.objects) if object.type == 'MESH'
+        ))
+        baked_meshes = [mesh for mesh in meshes if bake_outline_normal_groups(mesh)]
+
+        self.report({'INFO'}, f'Baked outline normals for {len(baked_meshes)} meshes '
+            f'({len(meshes) - len(baked_meshes)} unchanged, skipped) in {time.perf_counter() - start_time:.3f}s')
+        super().clear_custom_properties()
+        return {'FINISHED'}
+
+
+'''
+    Bakes the Outline Normal Group point attribute on the mesh: vertices at the same position (within the tolerance)
+    get the same group. The combined Outlines node group adds up the (deformed) normals of each group, so vertices split
+    by UV seams or sharp edges push the outline out in the same direction (no gaps in the outline), without finding the
+    vertices at the same position on every evaluation.
+
+    The bake is skipped while the vertex positions are the same as the last bake.
+    Returns: True if the mesh was baked, False if the cached bake is still valid
+'''
+def bake_outline_normal_groups(mesh):
+    positions = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+    mesh.vertices.foreach_get('co', positions)
+
+    signature = hashlib.sha1(positions.tobytes()).hexdigest()
+    if mesh.get(OUTLINE_BAKE_SIGNATURE_PROPERTY_NAME) == signature and \
+            mesh.attributes.get(OUTLINE_NORMAL_GROUP_ATTRIBUTE_NAME):
+        return False
+
+    get_or_create_attribute(mesh, OUTLINE_NORMAL_GROUP_ATTRIBUTE_NAME, 'INT').data.foreach_set(
+        'value', get_position_groups(positions.reshape(-1, 3)))
+    mesh[OUTLINE_BAKE_SIGNATURE_PROPERTY_NAME] = signature
+    mesh.update()
+    return True
+
+
+def get_position_groups(positions):
+    if not len(positions):
+        return numpy.empty(0, dtype=numpy.int32)
+
+    _, position_groups = numpy.unique(
+        numpy.round(positions / POSITION_TOLERANCE).astype(numpy.int64), axis=0, return_inverse=True
+    )
+    return position_groups.ravel().astype(numpy.int32)
+
+
+def get_or_create_attribute(mesh, attribute_name, attribute_type):
+    attribute = mesh.attributes.get(attribute_name)
+    if attribute and (attribute.data_type != attribute_type or attribute.domain != 'POINT'):
+        mesh.attributes.remove(attribute)
+        attribute = None
+    return attribute or mesh.attributes.new(attribute_name, attribute_type, 'POINT')
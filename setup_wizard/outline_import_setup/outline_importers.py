@@ -1,6 +1,5 @@
 # Author: michael-gh1
 
-import os
 import bpy
 
 from abc import ABC, abstractmethod
@@ -11,6 +10,7 @@ from setup_wizard.outline_import_setup.outline_node_groups import OutlineNodeGro
 from setup_wizard.import_order import FESTIVITY_OUTLINES_FILE_PATH, JAREDNYTS_PGR_OUTLINES_FILE_PATH, NYA222_HONKAI_STAR_RAIL_OUTLINES_FILE_PATH, \
     NextStepInvoker, cache_using_cache_key, get_cache
 from setup_wizard.domain.game_types import GameType
+from setup_wizard.utils.library_loader import load_datablocks
 
 
 class GameOutlineImporterFactory:
@@ -59,16 +59,11 @@ class GenshinImpactOutlineNodeGroupImporter(GameOutlineNodeGroupImporter):
             )
             return {'FINISHED'}
 
-        for outline_node_group_name in self.outlines_node_group_names:
-            if not bpy.data.node_groups.get(outline_node_group_name):
-                inner_path = 'NodeTree'
-                bpy.ops.wm.append(
-                    filepath=os.path.join(filepath, inner_path, outline_node_group_name),
-                    directory=os.path.join(filepath, inner_path),
-                    filename=outline_node_group_name
-                )
-                if cache_enabled and filepath:
-                    cache_using_cache_key(get_cache(cache_enabled), self.outlines_file_path, filepath)
+        loaded_datablocks = load_datablocks(filepath, {
+            'node_groups': self.outlines_node_group_names,
+        })
+        if cache_enabled and filepath and loaded_datablocks.get('node_groups'):
+            cache_using_cache_key(get_cache(cache_enabled), self.outlines_file_path, filepath)
 
         NextStepInvoker().invoke(
             self.blender_operator.next_step_idx, 
@@ -99,17 +94,11 @@ class HonkaiStarRailOutlineNodeGroupImporter(GameOutlineNodeGroupImporter):
             )
             return {'FINISHED'}
 
-        for outline_node_group_name in self.outlines_node_group_names:
-            if not bpy.data.node_groups.get(outline_node_group_name):
-                inner_path = 'NodeTree'
-
-                bpy.ops.wm.append(
-                    filepath=os.path.join(filepath, inner_path, outline_node_group_name),
-                    directory=os.path.join(filepath, inner_path),
-                    filename=outline_node_group_name
-                )
-                if cache_enabled and filepath:
-                    cache_using_cache_key(get_cache(cache_enabled), self.outlines_file_path, filepath)
+        loaded_datablocks = load_datablocks(filepath, {
+            'node_groups': self.outlines_node_group_names,
+        })
+        if cache_enabled and filepath and loaded_datablocks.get('node_groups'):
+            cache_using_cache_key(get_cache(cache_enabled), self.outlines_file_path, filepath)
 
         NextStepInvoker().invoke(
             self.blender_operator.next_step_idx, 
@@ -142,17 +131,11 @@ class PunishingGrayRavenOutlineNodeGroupImporter(GameOutlineNodeGroupImporter):
             )
             return {'FINISHED'}
 
-        for outline_node_group_name in self.outlines_node_group_names:
-            if not bpy.data.node_groups.get(outline_node_group_name):
-                inner_path = 'NodeTree'
-
-                bpy.ops.wm.append(
-                    filepath=os.path.join(filepath, inner_path, outline_node_group_name),
-                    directory=os.path.join(filepath, inner_path),
-                    filename=outline_node_group_name
-                )
-                if cache_enabled and filepath:
-                    cache_using_cache_key(get_cache(cache_enabled), self.outlines_file_path, filepath)
+        loaded_datablocks = load_datablocks(filepath, {
+            'node_groups': self.outlines_node_group_names,
+        })
+        if cache_enabled and filepath and loaded_datablocks.get('node_groups'):
+            cache_using_cache_key(get_cache(cache_enabled), self.outlines_file_path, filepath)
 
         NextStepInvoker().invoke(
             self.blender_operator.next_step_idx, 
@@ -111,3 +111,18 @@ class UABEMaterialDataJsonParser(MaterialDataJsonParser):
         b = material_json_value.get(f'{prefix} b')
         a = material_json_value.get(f'{prefix} a')
         return (r, g, b, a)
+
+
+'''
+    Parses the normalized material data stored in a Material Data Bundle (see MaterialDataBundle).
+'''
+class BundledMaterialDataJsonParser(MaterialDataJsonParser):
+    def __init__(self, json_material_data):
+        super().__init__(json_material_data)
+
+    def parse(self):
+        m_floats = self.json_material_data.get('m_Floats')
+        m_colors = self.json_material_data.get('m_Colors')
+
+        self.m_floats = MaterialData(dict(m_floats.items()))
+        self.m_colors = MaterialData({key: tuple(value) for key, value in m_colors.items()})  # appliers expect tuples
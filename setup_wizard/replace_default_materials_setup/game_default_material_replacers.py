@@ -1,6 +1,7 @@
 # Author: michael-gh1
 
 import bpy
+import time
 
 from abc import ABC, abstractmethod
 from bpy.types import Context, Operator
@@ -13,6 +14,7 @@ from setup_wizard.domain.shader_identifier_service import GenshinImpactShaders,
 from setup_wizard.domain.shader_material_names import V3_BonnyFestivityGenshinImpactMaterialNames, V2_FestivityGenshinImpactMaterialNames, \
     ShaderMaterialNames, Nya222HonkaiStarRailShaderMaterialNames, JaredNytsPunishingGrayRavenShaderMaterialNames
 from setup_wizard.texture_import_setup.texture_importer_types import TextureImporterType
+from setup_wizard.utils.armature_utils import get_character_objects, get_target_armature
 
 
 class GameDefaultMaterialReplacer(ABC):
@@ -50,64 +52,78 @@ class GenshinImpactDefaultMaterialReplacer(GameDefaultMaterialReplacer):
         mesh_ignore_list = [
             'Dress',  # Scaramouche
         ]
-        meshes = [mesh for mesh in bpy.context.scene.objects if mesh.type == 'MESH' and mesh.name not in mesh_ignore_list]
+        meshes = [mesh for mesh in get_character_objects(self.context) if mesh.type == 'MESH' and mesh.name not in mesh_ignore_list]
+        material_slots = [material_slot for mesh in meshes for material_slot in mesh.material_slots]
 
-        for mesh in meshes:
-            for material_slot in mesh.material_slots:
-                material_name = material_slot.name
-                mesh_body_part_name = None
-                character_type = None
-
-                if material_name.startswith('NPC'):
-                    mesh_body_part_name = self.__get_npc_mesh_body_part_name(material_name)
-                    character_type = TextureImporterType.NPC
-                elif material_name.startswith('Monster'):
-                    mesh_body_part_name = self.__get_monster_mesh_body_part_name(material_name)
-                    character_type = TextureImporterType.MONSTER
-                else:
-                    mesh_body_part_name = material_name.split('_')[-1]
-                    character_type = TextureImporterType.AVATAR
-
-                # If material_name is ever 'Dress', 'Arm' or 'Cloak', there could be issues with get_actual_material_name_for_dress()
-                material_name = self.create_shader_material_if_unique_mesh(mesh, mesh_body_part_name, material_name)
-                genshin_material = bpy.data.materials.get(f'{self.material_names.MATERIAL_PREFIX}{mesh_body_part_name}')
-
-                if genshin_material:
-                    material_slot.material = genshin_material
-                elif mesh_body_part_name and ('Dress' in mesh_body_part_name or 'Arm' in mesh_body_part_name or 'Cloak' in mesh_body_part_name):
-                    # Xiao is the only character with an Arm material
-                    # Dainsleif and Paimon are the only characters with Cloak materials
-                    self.blender_operator.report({'INFO'}, 'Dress detected on character model!')
-
-                    actual_material_for_dress = get_actual_material_name_for_dress(material_name, character_type.name)
-                    if actual_material_for_dress == 'Cloak':
-                        # short-circuit, no shader available for 'Cloak' so do nothing (Paimon)
-                        continue
-                    elif actual_material_for_dress == 'Effect':  # Dress2 material w/ Effect texture filename (Skirk support)
-                        # (dangerous) assumption that all Dress w/ Effect texture filename are Hair-type
-                        actual_material_for_dress = 'Hair'
-
-                    genshin_material = self.__clone_material_and_rename(
-                        material_slot, 
-                        f'{self.material_names.MATERIAL_PREFIX}{actual_material_for_dress}', 
-                        mesh_body_part_name
-                    )
-                    self.blender_operator.report({'INFO'}, f'Replaced material: "{material_name}" with "{actual_material_for_dress}"')
-                elif material_name == 'miHoYoDiffuse':
-                    material_slot.material = bpy.data.materials.get(self.material_names.BODY)
-                    continue
-                else:
-                    self.blender_operator.report({'WARNING'}, f'Ignoring unknown mesh body part in character model: {mesh_body_part_name} / Material: {material_name}')
-                    continue
+        start_time = time.perf_counter()
+        shader_materials = self.__build_shader_material_mapping(material_slots)
 
-                # Deprecated: I don't think cloning and renaming groups is necessary? (original commit: 6a4772e)
-                # Don't need to duplicate multiple Face shader nodes
-                # if genshin_material.name != f'miHoYo - Genshin Face':
-                #     genshin_main_shader_node = genshin_material.node_tree.nodes.get('Group.001')
-                #     genshin_main_shader_node.node_tree = self.__clone_shader_node_and_rename(genshin_material, mesh_body_part_name)
-        self.blender_operator.report({'INFO'}, 'Replaced default materials with Genshin shader materials...')
+        # Single pass over every slot using the mapping, no lookups or cloning per slot
+        for material_slot in material_slots:
+            shader_material = shader_materials.get(material_slot.name)
+            if shader_material:
+                material_slot.material = shader_material
 
-    def create_shader_material_if_unique_mesh(self, mesh, mesh_body_part_name, material_name):
+        self.blender_operator.report({'INFO'}, f'Replaced default materials with Genshin shader materials... '
+            f'({len(material_slots)} material slots, {len(shader_materials)} unique materials, '
+            f'{time.perf_counter() - start_time:.3f}s)')
+
+    '''
+    Resolves each unique original material once (including Dress/Arm/Cloak resolution and cloning).
+    Returns: original material name -> shader material, None if the material slot should be left as-is
+    '''
+    def __build_shader_material_mapping(self, material_slots):
+        return {
+            material_name: self.__resolve_shader_material(material_name) for
+                material_name in dict.fromkeys(material_slot.name for material_slot in material_slots)
+        }
+
+    def __resolve_shader_material(self, material_name):
+        mesh_body_part_name = None
+        character_type = None
+
+        if material_name.startswith('NPC'):
+            mesh_body_part_name = self.__get_npc_mesh_body_part_name(material_name)
+            character_type = TextureImporterType.NPC
+        elif material_name.startswith('Monster'):
+            mesh_body_part_name = self.__get_monster_mesh_body_part_name(material_name)
+            character_type = TextureImporterType.MONSTER
+        else:
+            mesh_body_part_name = material_name.split('_')[-1]
+            character_type = TextureImporterType.AVATAR
+
+        # If material_name is ever 'Dress', 'Arm' or 'Cloak', there could be issues with get_actual_material_name_for_dress()
+        material_name = self.create_shader_material_if_unique_mesh(mesh_body_part_name, material_name)
+        genshin_material = bpy.data.materials.get(f'{self.material_names.MATERIAL_PREFIX}{mesh_body_part_name}')
+
+        if genshin_material:
+            return genshin_material
+        elif mesh_body_part_name and ('Dress' in mesh_body_part_name or 'Arm' in mesh_body_part_name or 'Cloak' in mesh_body_part_name):
+            # Xiao is the only character with an Arm material
+            # Dainsleif and Paimon are the only characters with Cloak materials
+            self.blender_operator.report({'INFO'}, 'Dress detected on character model!')
+
+            actual_material_for_dress = get_actual_material_name_for_dress(material_name, character_type.name)
+            if actual_material_for_dress == 'Cloak':
+                # short-circuit, no shader available for 'Cloak' so do nothing (Paimon)
+                return None
+            elif actual_material_for_dress == 'Effect':  # Dress2 material w/ Effect texture filename (Skirk support)
+                # (dangerous) assumption that all Dress w/ Effect texture filename are Hair-type
+                actual_material_for_dress = 'Hair'
+
+            genshin_material = self.__clone_material_and_rename(
+                f'{self.material_names.MATERIAL_PREFIX}{actual_material_for_dress}', 
+                mesh_body_part_name
+            )
+            self.blender_operator.report({'INFO'}, f'Replaced material: "{material_name}" with "{actual_material_for_dress}"')
+            return genshin_material
+        elif material_name == 'miHoYoDiffuse':
+            return bpy.data.materials.get(self.material_names.BODY)
+        else:
+            self.blender_operator.report({'WARNING'}, f'Ignoring unknown mesh body part in character model: {mesh_body_part_name} / Material: {material_name}')
+            return None
+
+    def create_shader_material_if_unique_mesh(self, mesh_body_part_name, material_name):
         if mesh_body_part_name == 'EffectHair':  # Furina
             hair_material = self.create_hair_material(self.material_names, self.material_names.EFFECT_HAIR)
             material_name = hair_material.name
@@ -154,12 +170,10 @@ class GenshinImpactDefaultMaterialReplacer(GameDefaultMaterialReplacer):
         else:
             return 'Body'  # Assumption that everything else should be a Body material
 
-    def __clone_material_and_rename(self, material_slot, mesh_body_part_name_template, mesh_body_part_name):
+    def __clone_material_and_rename(self, mesh_body_part_name_template, mesh_body_part_name):
         new_material = bpy.data.materials.get(mesh_body_part_name_template).copy()
         new_material.name = f'{self.material_names.MATERIAL_PREFIX}{mesh_body_part_name}'
         new_material.use_fake_user = True
-
-        material_slot.material = new_material
         return new_material
 
     def create_body_material(self, shader_material_names: ShaderMaterialNames, material_name):
@@ -199,7 +213,7 @@ class HonkaiStarRailDefaultMaterialReplacer(GameDefaultMaterialReplacer):
         self.context: Context = context
 
     def replace_default_materials(self):
-        meshes = [mesh for mesh in bpy.context.scene.objects if mesh.type == 'MESH' and mesh.name not in self.MESH_IGNORE_LIST]
+        meshes = [mesh for mesh in get_character_objects(self.context) if mesh.type == 'MESH' and mesh.name not in self.MESH_IGNORE_LIST]
 
         for mesh in meshes:
             for material_slot in mesh.material_slots:
@@ -319,7 +333,7 @@ class PunishingGrayRavenDefaultMaterialReplacer(GameDefaultMaterialReplacer):
         self.context: Context = context
 
     def replace_default_materials(self):
-        meshes = [mesh for mesh in bpy.context.scene.objects if mesh.type == 'MESH' and mesh.name not in self.MESH_IGNORE_LIST]
+        meshes = [mesh for mesh in get_character_objects(self.context) if mesh.type == 'MESH' and mesh.name not in self.MESH_IGNORE_LIST]
 
         for mesh in meshes:
             for material_slot in mesh.material_slots:
@@ -378,7 +392,7 @@ class PunishingGrayRavenDefaultMaterialReplacer(GameDefaultMaterialReplacer):
     Expected Format Search: Search for body part name at expected location, at the end of the material name (ex. 'Body')
     '''
     def __expected_format_body_part_name_search(self, material_name):
-        armature =  [object for object in bpy.data.objects if object.type == 'ARMATURE'][0]
+        armature = get_target_armature(self.context)
         return material_name.split(armature.name)[-1]
 
     '''
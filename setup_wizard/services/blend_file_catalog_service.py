@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+
+from setup_wizard.utils.library_loader import list_datablock_names
+
+BLEND_FILE_CATALOG_FILE_NAME = 'blend_file_catalog.json.tmp'
+
+
+'''
+    A catalog of the datablock names inside shader .blend files, persisted next to the cache.
+    Lets us answer "what does this .blend file provide?" (shader version, which file contains X, is this the right file)
+    without appending anything into the current file.
+
+    Entries are keyed by the absolute file path and are reused while the size and mtime of the file are unchanged.
+    If only the mtime changed, the sha1 of the file is compared before re-listing so that touched files stay cached.
+    The sha1 is only computed then, a new or resized file is listed without hashing it.
+    With the cache disabled, the catalog is neither read from nor written to disk.
+
+    {
+        "version": 1,
+        "blend_files": {
+            "<absolute file path>": {
+                "size": ..., "mtime_ns": ..., "sha1": "..." or null,
+                "datablocks": { "materials": [...], "node_groups": [...], ... }
+            }
+        }
+    }
+'''
+class BlendFileCatalogService:
+    VERSION = 1
+    DATA_ATTRIBUTES = ['materials', 'node_groups', 'objects', 'collections', 'images']
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_enabled=True, catalog_file_path=None):
+        self.cache_enabled = cache_enabled
+        self.catalog_file_path = catalog_file_path or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            BLEND_FILE_CATALOG_FILE_NAME
+        )
+        self.blend_files = self.__load_catalog() if cache_enabled else {}
+
+    def get_datablock_names(self, blend_file_path):
+        datablock_names = self.get_cached_datablock_names(blend_file_path)
+        if datablock_names is None:
+            datablock_names = self.add_datablock_names(
+                blend_file_path, list_datablock_names(blend_file_path, self.DATA_ATTRIBUTES)
+            )
+        return datablock_names
+
+    '''
+        Returns: the cataloged datablock names while the catalog entry of the file is valid, otherwise None
+    '''
+    def get_cached_datablock_names(self, blend_file_path):
+        blend_file_path = os.path.abspath(blend_file_path)
+        file_stat = os.stat(blend_file_path)
+        entry = self.blend_files.get(blend_file_path)
+
+        if not entry or entry.get('size') != file_stat.st_size:
+            return None
+        if entry.get('mtime_ns') == file_stat.st_mtime_ns:
+            return entry.get('datablocks')
+
+        sha1 = self.__hash_file(blend_file_path)
+        if entry.get('sha1') != sha1:
+            entry['sha1'] = sha1  # Kept when the file is re-listed (add_datablock_names)
+            return None
+        entry['mtime_ns'] = file_stat.st_mtime_ns
+        self.__save_catalog()
+        return entry.get('datablocks')
+
+    '''
+        Catalogs the datablock names of the file, ex. listed while the file is read to load datablocks from it.
+        names_in_blend_file: bpy.data attribute -> names, or the data_from of bpy.data.libraries.load
+        Returns: bpy.data attribute -> names of the cataloged attributes
+    '''
+    def add_datablock_names(self, blend_file_path, names_in_blend_file):
+        blend_file_path = os.path.abspath(blend_file_path)
+        file_stat = os.stat(blend_file_path)
+        entry = self.blend_files.get(blend_file_path)
+        datablock_names = {
+            data_attribute: list(names_in_blend_file[data_attribute] if isinstance(names_in_blend_file, dict) else
+                                 getattr(names_in_blend_file, data_attribute))
+                for data_attribute in self.DATA_ATTRIBUTES
+        }
+
+        self.blend_files[blend_file_path] = {
+            'size': file_stat.st_size,
+            'mtime_ns': file_stat.st_mtime_ns,
+            'sha1': entry.get('sha1') if entry and entry.get('size') == file_stat.st_size else None,
+            'datablocks': datablock_names,
+        }
+        self.__save_catalog()
+        return datablock_names
+
+    def contains(self, blend_file_path, data_attribute, name):
+        return name in self.get_datablock_names(blend_file_path).get(data_attribute, [])
+
+    def get_missing_datablock_names(self, blend_file_path, data_attribute, names):
+        datablock_names = set(self.get_datablock_names(blend_file_path).get(data_attribute, []))
+        return [name for name in names if name not in datablock_names]
+
+    '''
+        Returns the .blend files (from the given files, or every cataloged file) that contain the datablock
+    '''
+    def find_blend_files_containing(self, data_attribute, name, blend_file_paths=None):
+        blend_file_paths = blend_file_paths if blend_file_paths is not None else list(self.blend_files.keys())
+        return [
+            blend_file_path for blend_file_path in blend_file_paths if
+                os.path.isfile(blend_file_path) and self.contains(blend_file_path, data_attribute, name)
+        ]
+
+    def identify_shader(self, blend_file_path, shader_identifier_service):
+        datablock_names = self.get_datablock_names(blend_file_path)
+        return shader_identifier_service.identify_shader(
+            datablock_names.get('materials', []),
+            datablock_names.get('node_groups', [])
+        )
+
+    def __load_catalog(self):
+        if not os.path.exists(self.catalog_file_path):
+            return {}
+        try:
+            with open(self.catalog_file_path, encoding='utf-8') as fp:
+                catalog = json.load(fp)
+        except (UnicodeDecodeError, ValueError) as ex:
+            print(f'WARNING: Ignoring unreadable Blend File Catalog "{self.catalog_file_path}": {ex}')
+            return {}
+        return catalog.get('blend_files', {}) if catalog.get('version') == self.VERSION else {}
+
+    def __save_catalog(self):
+        if not self.cache_enabled:
+            return
+        with open(self.catalog_file_path, 'w', encoding='utf-8') as fp:
+            json.dump({
+                'version': self.VERSION,
+                'blend_files': self.blend_files,
+            }, fp, ensure_ascii=False, indent=4)
+
+    def __hash_file(self, file_path):
+        sha1 = hashlib.sha1()
+        with open(file_path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(self.HASH_CHUNK_SIZE), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
@@ -5,6 +5,8 @@ from bpy.types import Operator
 
 from setup_wizard.import_order import NextStepInvoker
 from setup_wizard.setup_wizard_operator_base_classes import CustomOperatorProperties
+from setup_wizard.utils.armature_utils import get_character_objects, get_target_armature, \
+    is_multi_character_scene_enabled
 
 HEAD_DRIVER_OBJECT_NAME = 'Head Driver'
 HEAD_ORIGIN_OBJECT_NAME = 'Head Origin'
@@ -16,10 +18,10 @@ class GI_OT_SetUpHeadDriver(Operator, CustomOperatorProperties):
     bl_label = 'Genshin: Setup Head Driver'
 
     def execute(self, context):
-        head_driver_object = bpy.data.objects.get(HEAD_DRIVER_OBJECT_NAME) or bpy.data.objects.get(HEAD_ORIGIN_OBJECT_NAME)
+        armature = get_target_armature(context)
+        head_driver_object = self.get_head_driver_object(context)
         child_of_constraint = head_driver_object.constraints[0]  # expecting 1 constraint head driver
 
-        armature = [object for object in bpy.data.objects if object.type == 'ARMATURE'][0]  # expecting 1 armature
         armature_bones = armature.data.bones
         head_bone_name = [bone_name for bone_name in armature_bones.keys() if 'Head' in bone_name][0]  # expecting 1 bone with Head in the name
 
@@ -35,6 +37,25 @@ class GI_OT_SetUpHeadDriver(Operator, CustomOperatorProperties):
             )
         return {'FINISHED'}
 
+    '''
+        Multi-Character Scene: each character has its own 'Head Driver' ('Head Driver.001', ...), so only look at
+        the target character's objects
+    '''
+    def get_head_driver_object(self, context):
+        if not is_multi_character_scene_enabled(context):
+            return bpy.data.objects.get(HEAD_DRIVER_OBJECT_NAME) or bpy.data.objects.get(HEAD_ORIGIN_OBJECT_NAME)
+
+        head_driver_object_names = [HEAD_DRIVER_OBJECT_NAME, HEAD_ORIGIN_OBJECT_NAME]
+        head_driver_objects = [object for object in get_character_objects(context) if
+                               object.name.split('.')[0] in head_driver_object_names]
+
+        # Fallback to a Head Driver that has not been set up for another character yet
+        head_driver_objects = head_driver_objects or [
+            object for object in bpy.data.objects if object.name.split('.')[0] in head_driver_object_names and
+                object.constraints and not object.constraints[0].target
+        ]
+        return head_driver_objects[0] if head_driver_objects else None
+
     def set_contraint_target_and_bone(self, constraint, armature, bone_name):
         constraint.target = armature
         constraint.subtarget = bone_name
@@ -0,0 +1,58 @@
+import bpy
+
+from setup_wizard.geometry_nodes_setup.combined_node_groups import get_or_create_combined_node_group
+from setup_wizard.geometry_nodes_setup.geometry_nodes_setups import NAME_OF_GEOMETRY_NODES_MODIFIER
+from setup_wizard.outline_import_setup.outline_node_groups import OutlineNodeGroupNames
+from setup_wizard.tests.benchmark_utils import get_script_args, play_animation, print_table
+
+'''
+    Compares depsgraph evaluation time during animation playback of a set up (V3 shader) character:
+    separate Light Vectors + Outlines modifiers against a single modifier with the combined node group.
+
+    Usage:
+    "blender.exe" -b "<set up character .blend file>" --python setup_wizard/tests/benchmark_combined_outlines_modifier.py -- [number of frames]
+'''
+
+argv = get_script_args()
+
+arg_number_of_frames = int(argv[0]) if argv else 100
+
+
+def count_geometry_nodes_modifiers():
+    return len([modifier for object in bpy.context.scene.objects for modifier in getattr(object, 'modifiers', []) if
+                modifier.type == 'NODES'])
+
+
+def combine_modifiers():
+    for object in [object for object in bpy.context.scene.objects if object.type == 'MESH']:
+        outlines_modifier = object.modifiers.get(f'{NAME_OF_GEOMETRY_NODES_MODIFIER} {object.name}')
+        light_vectors_modifiers = [modifier for modifier in object.modifiers if modifier.type == 'NODES' and
+                                   modifier.node_group and
+                                   modifier.node_group.name in OutlineNodeGroupNames.V3_LIGHT_VECTORS_GEOMETRY_NODES]
+        if not outlines_modifier or not outlines_modifier.node_group or not light_vectors_modifiers:
+            continue
+
+        outlines_modifier.node_group = get_or_create_combined_node_group(
+            outlines_modifier.node_group,
+            light_vectors_modifiers[0].node_group
+        )
+        for light_vectors_modifier in light_vectors_modifiers:
+            object.modifiers.remove(light_vectors_modifier)
+
+
+separate_modifiers_count = count_geometry_nodes_modifiers()
+separate_total_time, separate_max_time = play_animation(arg_number_of_frames)
+
+combine_modifiers()
+combined_modifiers_count = count_geometry_nodes_modifiers()
+combined_total_time, combined_max_time = play_animation(arg_number_of_frames)
+
+print(f'Frames: {arg_number_of_frames}')
+print_table([('Modifiers', 12, ''), ('Count', 7, ''), ('Total (s)', 11, '.3f'), ('Avg (ms)', 10, '.2f'),
+             ('Max (ms)', 10, '.2f')], [
+    (name, count, total_time, total_time / arg_number_of_frames * 1000, max_time * 1000) for
+        name, count, total_time, max_time in [
+            ('Separate', separate_modifiers_count, separate_total_time, separate_max_time),
+            ('Combined', combined_modifiers_count, combined_total_time, combined_max_time),
+        ]
+])
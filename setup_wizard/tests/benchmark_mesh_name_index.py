@@ -0,0 +1,61 @@
+import bpy
+
+from setup_wizard.geometry_nodes_setup.geometry_nodes_setups import meshes_to_create_geometry_nodes_on
+from setup_wizard.tests.benchmark_utils import get_script_args, print_table, time_function
+from setup_wizard.utils.mesh_name_index import MeshNameIndex
+
+'''
+    Compares finding the meshes to set up geometry nodes on by scanning every scene object per body part name
+    against the MeshNameIndex, on scenes with hundreds of objects. Only the matching is timed, not the modifiers.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/benchmark_mesh_name_index.py -- [number of characters]
+'''
+
+argv = get_script_args()
+
+arg_number_of_characters = int(argv[0]) if argv else 20
+
+NUMBER_OF_RUNS = 5
+CHARACTER_MESH_NAMES = ['Body', 'Face', 'Face_Eye', 'Hair', 'Dress', 'EffectHair', 'Weapon01', 'Cap']
+
+
+def create_scene(number_of_characters):
+    bpy.ops.wm.read_homefile(use_empty=True)
+    mesh = bpy.data.meshes.new('Benchmark Mesh')
+    for character_index in range(number_of_characters):
+        for mesh_name in CHARACTER_MESH_NAMES:
+            bpy.context.scene.collection.objects.link(
+                bpy.data.objects.new(f'Avatar_Character{character_index:03}_{mesh_name}', mesh)
+            )
+        bpy.context.scene.collection.objects.link(bpy.data.objects.new(f'Armature{character_index:03}', None))
+
+
+def find_by_scanning():
+    matches = []
+    for mesh_name in meshes_to_create_geometry_nodes_on:
+        for object_name, object_data in bpy.context.scene.objects.items():
+            if object_data.type == 'MESH' and (mesh_name == object_name or f'_{mesh_name}' in object_name):
+                matches.append(object_data)
+    return matches
+
+
+def find_by_index():
+    mesh_name_index = MeshNameIndex(bpy.context.scene.objects)
+    return [mesh_object for mesh_name in meshes_to_create_geometry_nodes_on for
+            mesh_object in mesh_name_index.find(mesh_name)]
+
+
+create_scene(arg_number_of_characters)
+scan_matches, scan_time = time_function(find_by_scanning, NUMBER_OF_RUNS)
+index_matches, index_time = time_function(find_by_index, NUMBER_OF_RUNS)
+
+assert sorted(object.name for object in scan_matches) == sorted(object.name for object in index_matches), \
+    'MeshNameIndex matched different objects than scanning the scene'
+
+print(f'Objects: {len(bpy.context.scene.objects)}, Body part names: {len(meshes_to_create_geometry_nodes_on)}, '
+      f'Matches: {len(index_matches)}')
+print_table([('Method', 8, ''), ('Time (s)', 10, '.4f'), ('Speedup', 9, '.1f')], [
+    ('Scan', scan_time, 1.0),
+    ('Index', index_time, scan_time / index_time),
+])
@@ -0,0 +1,167 @@
+import bpy
+
+from setup_wizard.tests.benchmark_utils import get_script_args, print_table, time_function
+
+'''
+    Compares configuring outline modifiers with operators (bpy.ops) against the data API used by the geometry nodes
+    setup:
+    - toggling the vertex colors input of the Outlines modifier to use an attribute
+    - the face outline fix: re-evaluating Face meshes after their outline material input is set (material slot moves
+      against tagging the object for an update). Fails if the Face meshes keep their outdated outlines.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/benchmark_modifier_configuration.py -- [number of meshes]
+'''
+
+argv = get_script_args()
+
+arg_number_of_meshes = int(argv[0]) if argv else 100
+
+
+def get_use_attribute_property_name(modifier):
+    # Input identifiers differ between Blender versions (Input_2, Socket_1)
+    return next((key for key in modifier.keys() if key.endswith('_use_attribute')), None)
+
+
+# Newer Blender versions take the input identifier instead of the property path
+def get_attribute_toggle_input(use_attribute_property_name):
+    if 'input_name' in bpy.ops.object.geometry_nodes_input_attribute_toggle.get_rna_type().properties:
+        return {'input_name': use_attribute_property_name.removesuffix('_use_attribute')}
+    return {'prop_path': f'["{use_attribute_property_name}"]'}
+
+
+def new_input_socket(node_group, name, socket_type):
+    if hasattr(node_group, 'interface'):
+        return node_group.interface.new_socket(name, in_out='INPUT', socket_type=socket_type).identifier
+    return node_group.inputs.new(socket_type, name).identifier
+
+
+def create_scene(number_of_meshes):
+    bpy.ops.wm.read_homefile(use_empty=True)
+    node_group = bpy.data.node_groups.new('Benchmark Outlines', 'GeometryNodeTree')
+    new_input_socket(node_group, 'Geometry', 'NodeSocketGeometry')
+    new_input_socket(node_group, 'Vertex Colors', 'NodeSocketColor')
+    new_input_socket(node_group, 'Outline Material', 'NodeSocketMaterial')
+    if hasattr(node_group, 'interface'):
+        node_group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        node_group.outputs.new('NodeSocketGeometry', 'Geometry')
+
+    # Outlines: the mesh joined with a copy using the outline material
+    group_input_node = node_group.nodes.new('NodeGroupInput')
+    group_output_node = node_group.nodes.new('NodeGroupOutput')
+    set_material_node = node_group.nodes.new('GeometryNodeSetMaterial')
+    join_geometry_node = node_group.nodes.new('GeometryNodeJoinGeometry')
+    node_group.links.new(group_input_node.outputs['Geometry'], set_material_node.inputs['Geometry'])
+    node_group.links.new(group_input_node.outputs['Outline Material'], set_material_node.inputs['Material'])
+    node_group.links.new(group_input_node.outputs['Geometry'], join_geometry_node.inputs['Geometry'])
+    node_group.links.new(set_material_node.outputs['Geometry'], join_geometry_node.inputs['Geometry'])
+    node_group.links.new(join_geometry_node.outputs['Geometry'], group_output_node.inputs['Geometry'])
+
+    objects = []
+    for index in range(number_of_meshes):
+        bpy.ops.mesh.primitive_uv_sphere_add()
+        object = bpy.context.active_object
+        object.name = f'Benchmark_Face{index:03}'
+        object.data.materials.append(bpy.data.materials.new(f'{object.name} Face'))
+        modifier = object.modifiers.new('Outlines', 'NODES')
+        modifier.node_group = node_group
+        objects.append(object)
+    bpy.context.view_layer.update()
+    return objects
+
+
+def get_outline_material_input(modifier):
+    return next(item.identifier for item in modifier.node_group.interface.items_tree if
+                item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name == 'Outline Material') if \
+        hasattr(modifier.node_group, 'interface') else modifier.node_group.inputs['Outline Material'].identifier
+
+
+# Sets the outline material input like the geometry nodes setup, through an ID property without an update tag
+def set_outline_materials(objects):
+    for object in objects:
+        modifier = object.modifiers.get('Outlines')
+        modifier[get_outline_material_input(modifier)] = bpy.data.materials.new(f'{object.name} Outlines')
+
+
+def configure_with_operators(objects):
+    for object in objects:
+        modifier = object.modifiers.get('Outlines')
+        use_attribute_property_name = get_use_attribute_property_name(modifier)
+        with bpy.context.temp_override(object=object, active_object=object):
+            if use_attribute_property_name and not modifier[use_attribute_property_name]:
+                bpy.ops.object.geometry_nodes_input_attribute_toggle(
+                    modifier_name=modifier.name, **get_attribute_toggle_input(use_attribute_property_name))
+
+
+def configure_with_data_api(objects):
+    for object in objects:
+        modifier = object.modifiers.get('Outlines')
+        use_attribute_property_name = get_use_attribute_property_name(modifier)
+        if use_attribute_property_name and not modifier[use_attribute_property_name]:
+            modifier[use_attribute_property_name] = True
+            object.update_tag()
+
+
+def fix_face_outlines_with_operators(objects):
+    for object in objects:
+        bpy.context.view_layer.objects.active = object
+        object.data.materials.append(None)
+        bpy.ops.object.material_slot_move(direction='DOWN')
+        bpy.ops.object.material_slot_move(direction='UP')
+        object.data.materials.pop()
+
+
+def fix_face_outlines_with_data_api(objects):
+    for object in objects:
+        object.data.update_tag()
+        object.update_tag(refresh={'OBJECT', 'DATA'})
+    bpy.context.view_layer.update()
+
+
+def get_number_of_outdated_face_outlines(objects):
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    return sum(
+        object.modifiers.get('Outlines')[get_outline_material_input(object.modifiers.get('Outlines'))].name not in
+            [material.name for material in object.evaluated_get(depsgraph).data.materials if material]
+        for object in objects
+    )
+
+
+def benchmark(configure):
+    objects = create_scene(arg_number_of_meshes)
+    _, elapsed_time = time_function(lambda: (configure(objects), bpy.context.view_layer.update()))
+
+    modifiers = [object.modifiers.get('Outlines') for object in objects]
+    assert all(modifier[get_use_attribute_property_name(modifier)] for modifier in modifiers), \
+        f'{configure.__name__} did not set the vertex colors input to use an attribute'
+    return elapsed_time
+
+
+def benchmark_face_outline_fix(fix_face_outlines):
+    objects = create_scene(arg_number_of_meshes)
+    set_outline_materials(objects)
+    assert get_number_of_outdated_face_outlines(objects) == len(objects), \
+        'Setting the outline material input is expected to leave the evaluated outlines outdated'
+
+    _, elapsed_time = time_function(lambda: (fix_face_outlines(objects), bpy.context.view_layer.update()))
+
+    number_of_outdated_face_outlines = get_number_of_outdated_face_outlines(objects)
+    assert number_of_outdated_face_outlines == 0, \
+        f'{fix_face_outlines.__name__} left {number_of_outdated_face_outlines} Face meshes with outdated outlines'
+    return elapsed_time
+
+
+operators_time = benchmark(configure_with_operators)
+data_api_time = benchmark(configure_with_data_api)
+face_outline_fix_operators_time = benchmark_face_outline_fix(fix_face_outlines_with_operators)
+face_outline_fix_data_api_time = benchmark_face_outline_fix(fix_face_outlines_with_data_api)
+
+print(f'Meshes: {arg_number_of_meshes}')
+print_table([('Method', 34, ''), ('Time (s)', 10, '.4f'), ('Speedup', 9, '.1f')], [
+    ('Attribute toggle: Operators', operators_time, 1.0),
+    ('Attribute toggle: Data API', data_api_time, operators_time / data_api_time),
+    ('Face outline fix: Operators', face_outline_fix_operators_time, 1.0),
+    ('Face outline fix: Data API', face_outline_fix_data_api_time,
+        face_outline_fix_operators_time / face_outline_fix_data_api_time),
+])
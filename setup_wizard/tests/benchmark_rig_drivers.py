@@ -0,0 +1,77 @@
+import bpy
+
+from setup_wizard.character_rig_setup.driver_utils import get_scripted_drivers
+from setup_wizard.tests.benchmark_utils import get_script_args, play_animation, print_table
+
+'''
+    Compares playback frames per second of a rigged character with its scripted drivers (shape key drivers, skirt
+    constraint influence drivers, etc.) evaluated as simple expressions against the same drivers evaluated by Python.
+    The bones the drivers read are keyframed so every frame re-evaluates the drivers. Python evaluation is forced by
+    enabling 'Use Self' on the drivers, which simple expressions don't support.
+    Python drivers only run with Auto Run Python Scripts, hence --enable-autoexec.
+
+    Usage:
+    "blender.exe" -b --enable-autoexec "<rigged character .blend file>" --python setup_wizard/tests/benchmark_rig_drivers.py -- [number of frames]
+'''
+
+argv = get_script_args()
+
+arg_number_of_frames = int(argv[0]) if argv else 100
+
+DRIVER_BONE_OFFSET = 0.01
+
+
+# Keyframes the bones read by the drivers: rest, offset halfway and back to rest
+def animate_driver_bones(scripted_drivers, number_of_frames):
+    frame_start = bpy.context.scene.frame_start
+    driver_bones = {
+        (target.id, target.bone_target) for _, driver in scripted_drivers for variable in driver.variables if
+            variable.type == 'TRANSFORMS' for target in variable.targets if
+                target.id and target.id.type == 'ARMATURE' and target.bone_target
+    }
+
+    for armature, bone_name in driver_bones:
+        pose_bone = armature.pose.bones.get(bone_name)
+        if not pose_bone:
+            continue
+        for frame, offset in [
+            (frame_start, 0.0),
+            (frame_start + number_of_frames // 2, DRIVER_BONE_OFFSET),
+            (frame_start + number_of_frames, 0.0),
+        ]:
+            pose_bone.location = (offset, offset, offset)
+            pose_bone.keyframe_insert('location', frame=frame)
+            if pose_bone.rotation_mode == 'QUATERNION':
+                pose_bone.rotation_quaternion = (1.0, offset, offset, offset)
+                pose_bone.keyframe_insert('rotation_quaternion', frame=frame)
+            elif pose_bone.rotation_mode != 'AXIS_ANGLE':
+                pose_bone.rotation_euler = (offset, offset, offset)
+                pose_bone.keyframe_insert('rotation_euler', frame=frame)
+    return len(driver_bones)
+
+
+def set_use_self(scripted_drivers, use_self):
+    for _, driver in scripted_drivers:
+        driver.use_self = use_self
+
+
+scripted_drivers = get_scripted_drivers(bpy.data.objects)
+simple_expression_drivers_count = len([driver for _, driver in scripted_drivers if driver.is_simple_expression])
+driver_bones_count = animate_driver_bones(scripted_drivers, arg_number_of_frames)
+
+simple_total_time, simple_max_time = play_animation(arg_number_of_frames)
+
+set_use_self(scripted_drivers, True)
+python_total_time, python_max_time = play_animation(arg_number_of_frames)
+set_use_self(scripted_drivers, False)
+
+print(f'Frames: {arg_number_of_frames}, scripted drivers: {len(scripted_drivers)} '
+      f'({simple_expression_drivers_count} simple expressions), animated driver bones: {driver_bones_count}')
+print_table([('Drivers', 20, ''), ('Total (s)', 11, '.3f'), ('Avg (ms)', 10, '.2f'), ('Max (ms)', 10, '.2f'),
+             ('FPS', 8, '.1f')], [
+    (name, total_time, total_time / arg_number_of_frames * 1000, max_time * 1000,
+        arg_number_of_frames / total_time if total_time else 0.0) for name, total_time, max_time in [
+            ('Simple expressions', simple_total_time, simple_max_time),
+            ('Python', python_total_time, python_max_time),
+        ]
+])
@@ -0,0 +1,71 @@
+import bpy
+import os
+import tempfile
+
+from setup_wizard.material_import_setup.game_material_importers import GenshinImpactMaterialImporterFacade
+from setup_wizard.outline_import_setup.outline_node_groups import OutlineNodeGroupNames
+from setup_wizard.tests.benchmark_utils import get_script_args, print_table, time_function
+from setup_wizard.utils.library_loader import load_datablocks, make_linked_materials_local
+
+'''
+    Compares the Append (default) and Link shader modes of the material importer.
+    Measures the size of the saved .blend file, the time to save it and the time to open it again.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/benchmark_shader_link_mode.py -- <shader .blend file> [output folder]
+'''
+
+argv = get_script_args()
+
+arg_shader_blend_file_path = argv[0]
+arg_output_directory_path = argv[1] if len(argv) > 1 else tempfile.mkdtemp()
+
+NUMBER_OF_OPEN_RUNS = 5
+
+os.makedirs(arg_output_directory_path, exist_ok=True)
+
+
+def import_materials(link):
+    loaded_datablocks = load_datablocks(arg_shader_blend_file_path, {
+        'materials': [material_name.get('name') for material_name in
+                      GenshinImpactMaterialImporterFacade.NAMES_OF_GENSHIN_MATERIALS],
+        'node_groups': OutlineNodeGroupNames.V3_LIGHT_VECTORS_GEOMETRY_NODES,
+    }, link=link)
+
+    materials = loaded_datablocks.get('materials')
+    if link:
+        materials = make_linked_materials_local(
+            materials,
+            GenshinImpactMaterialImporterFacade.NAMES_OF_CHARACTER_SPECIFIC_NODE_GROUPS
+        )
+    for material in materials:
+        material.use_fake_user = True
+
+
+def benchmark(mode):
+    bpy.ops.wm.read_homefile(use_empty=True)
+    import_materials(link=mode == 'Link')
+
+    blend_file_path = os.path.join(arg_output_directory_path, f'benchmark_shader_{mode.lower()}_mode.blend')
+    _, save_time = time_function(lambda: bpy.ops.wm.save_as_mainfile(filepath=blend_file_path, compress=False))
+    _, open_time = time_function(
+        lambda: bpy.ops.wm.open_mainfile(filepath=blend_file_path, load_ui=False), NUMBER_OF_OPEN_RUNS)
+
+    return {
+        'mode': mode,
+        'file_size': os.path.getsize(blend_file_path),
+        'save_time': save_time,
+        'open_time': open_time,
+        'local_node_groups': len([node_group for node_group in bpy.data.node_groups if not node_group.library]),
+        'linked_node_groups': len([node_group for node_group in bpy.data.node_groups if node_group.library]),
+    }
+
+
+results = [benchmark('Append'), benchmark('Link')]
+
+print(f'Shader: {arg_shader_blend_file_path}')
+print_table([('Mode', 8, ''), ('Size (KB)', 12, '.1f'), ('Save (s)', 10, '.3f'), ('Open (s)', 10, '.3f'),
+             ('Local NGs', 11, ''), ('Linked NGs', 12, '')], [
+    (result['mode'], result['file_size'] / 1024, result['save_time'], result['open_time'],
+        result['local_node_groups'], result['linked_node_groups']) for result in results
+])
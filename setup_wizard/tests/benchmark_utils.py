@@ -0,0 +1,58 @@
+import bpy
+import sys
+import time
+
+'''
+    Shared helpers of the benchmark scripts: script arguments, timing and the results table.
+'''
+
+
+# Arguments after '--' on the Blender command line
+def get_script_args():
+    return sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+
+'''
+    Runs the function number_of_runs times.
+    Returns: (result of the last run, fastest run time in seconds)
+'''
+def time_function(function, number_of_runs=1):
+    result = None
+    run_times = []
+    for _ in range(number_of_runs):
+        start = time.perf_counter()
+        result = function()
+        run_times.append(time.perf_counter() - start)
+    return result, min(run_times)
+
+
+'''
+    Plays the scene animation with frame_set from the start frame, after one untimed warm up frame.
+    Returns: (total time, slowest frame time) in seconds
+'''
+def play_animation(number_of_frames):
+    scene = bpy.context.scene
+    scene.frame_set(scene.frame_start)  # Warm up
+
+    frame_times = []
+    for frame in range(scene.frame_start, scene.frame_start + number_of_frames):
+        start = time.perf_counter()
+        scene.frame_set(frame)
+        frame_times.append(time.perf_counter() - start)
+    return sum(frame_times), max(frame_times)
+
+
+'''
+    columns: (header, width, value format) per column, the first column is left aligned and the others right aligned
+    rows: values per column
+'''
+def print_table(columns, rows):
+    print(''.join(
+        f'{header:{"<" if column_index == 0 else ">"}{width}}' for
+            column_index, (header, width, _) in enumerate(columns)
+    ))
+    for row in rows:
+        print(''.join(
+            f'{value:{"<" if column_index == 0 else ">"}{width}{value_format}}' for
+                column_index, (value, (_, width, value_format)) in enumerate(zip(row, columns))
+        ))
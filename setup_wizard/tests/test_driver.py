@@ -4,8 +4,11 @@ import json
 import subprocess
 import os
 from pathlib import Path, PurePath
+from setup_wizard.character_rig_setup.rig_operator_counter import COUNT_RIG_OPERATORS_ENVIRONMENT_VARIABLE
+from setup_wizard.character_rig_setup.rig_timing_report import RIG_TIMING_REPORTS_FILE_PATH_ENVIRONMENT_VARIABLE, \
+    format_aggregate_rig_timing_report, read_rig_timing_reports
 from setup_wizard.services.config_service import ConfigService
-from setup_wizard.tests.constants import BLENDER_EXECUTION_FILE_PATH, CHARACTERS_FOLDER_FILE_PATH, RIG_CHARACTER, \
+from setup_wizard.tests.constants import BLENDER_EXECUTION_FILE_PATH, CHARACTERS_FOLDER_FILE_PATH, \
     USER_INPUTTED_MATERIAL_JSONS
 
 IGNORE_LIST = [
@@ -23,6 +26,14 @@ class TestDriver:
         self.logs_directory_path = f'setup_wizard/tests/logs/{timestamp}'
         Path(self.logs_directory_path).mkdir(parents=True, exist_ok=True)
 
+        # Each character is set up in its own Blender process, which appends its rig timing report to this file
+        self.rig_timing_reports_file_path = f'{self.logs_directory_path}/rig_timing_reports.jsonl'
+        self.environment_variables = {
+            **os.environ,
+            RIG_TIMING_REPORTS_FILE_PATH_ENVIRONMENT_VARIABLE: self.rig_timing_reports_file_path,
+            COUNT_RIG_OPERATORS_ENVIRONMENT_VARIABLE: '1',
+        }
+
     def execute(self):
         environment_configs = self.config_service.get('environments')
 
@@ -81,9 +92,7 @@ class TestDriver:
                             f'{absolute_character_folder_file_path}',
                             material_data_folder_file_path
                         ]
-                        if environment_config.get(RIG_CHARACTER):
-                            blender_execution_commands.remove('-b')
-                        subprocess.run(blender_execution_commands)
+                        subprocess.run(blender_execution_commands, env=self.environment_variables)
                         is_not_nested = False
                 if is_not_nested:
                     absolute_character_folder_file_path = str(PurePath(characters_folder_file_path, character_folder_file_path))
@@ -99,9 +108,18 @@ class TestDriver:
                         f'{absolute_character_folder_file_path}',
                         material_data_folder_file_path
                     ]
-                    if environment_config.get(RIG_CHARACTER):
-                        blender_execution_commands.remove('-b')
-                    subprocess.run(blender_execution_commands)
+                    subprocess.run(blender_execution_commands, env=self.environment_variables)
+
+        self.write_aggregate_rig_timing_report()
+
+    def write_aggregate_rig_timing_report(self):
+        rig_timing_reports = read_rig_timing_reports(self.rig_timing_reports_file_path)
+        if not rig_timing_reports:
+            return
+        aggregate_rig_timing_report = format_aggregate_rig_timing_report(rig_timing_reports)
+        print(aggregate_rig_timing_report)
+        with open(f'{self.logs_directory_path}/rig_timing_report.txt', 'w', encoding='utf-8') as f:
+            f.write(aggregate_rig_timing_report)
 
 
 TestDriver().execute()
@@ -0,0 +1,98 @@
+import bpy
+
+from setup_wizard.geometry_nodes_setup.combined_node_groups import get_or_create_combined_node_group
+from setup_wizard.geometry_nodes_setup.geometry_nodes_setups import NAME_OF_GEOMETRY_NODES_MODIFIER
+from setup_wizard.geometry_nodes_setup.outline_lod import FULL, OFF, REDUCED, apply_outline_lod_level
+
+'''
+    Builds synthetic Outlines (adds a scaled copy of the mesh, the outline shell) and Light Vectors (stores a
+    'Light Vector' attribute) node groups, combines them into a single Outlines modifier on a character mesh and
+    checks the evaluated (viewport) mesh at every Outline LOD level: the light vectors must stay on at Full and
+    Reduced, only the outlines are turned off. Off hides the modifier in the viewport.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/test_outline_lod.py
+'''
+
+LIGHT_VECTOR_ATTRIBUTE_NAME = 'Light Vector'
+
+
+def new_node_group(name):
+    node_group = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    if hasattr(node_group, 'interface'):
+        node_group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+        node_group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        node_group.inputs.new('NodeSocketGeometry', 'Geometry')
+        node_group.outputs.new('NodeSocketGeometry', 'Geometry')
+    group_input_node = node_group.nodes.new('NodeGroupInput')
+    group_output_node = node_group.nodes.new('NodeGroupOutput')
+    return node_group, group_input_node, group_output_node
+
+
+def create_outlines_node_group():
+    node_group, group_input_node, group_output_node = new_node_group('Outlines')
+    transform_node = node_group.nodes.new('GeometryNodeTransform')
+    transform_node.inputs['Scale'].default_value = (1.1, 1.1, 1.1)
+    join_geometry_node = node_group.nodes.new('GeometryNodeJoinGeometry')
+    node_group.links.new(group_input_node.outputs[0], transform_node.inputs['Geometry'])
+    node_group.links.new(group_input_node.outputs[0], join_geometry_node.inputs[0])
+    node_group.links.new(transform_node.outputs[0], join_geometry_node.inputs[0])
+    node_group.links.new(join_geometry_node.outputs[0], group_output_node.inputs[0])
+    return node_group
+
+
+def create_light_vectors_node_group():
+    node_group, group_input_node, group_output_node = new_node_group('Light Vectors')
+    store_named_attribute_node = node_group.nodes.new('GeometryNodeStoreNamedAttribute')
+    store_named_attribute_node.data_type = 'FLOAT_VECTOR'
+    store_named_attribute_node.inputs['Name'].default_value = LIGHT_VECTOR_ATTRIBUTE_NAME
+    node_group.links.new(group_input_node.outputs[0], store_named_attribute_node.inputs['Geometry'])
+    node_group.links.new(store_named_attribute_node.outputs[0], group_output_node.inputs[0])
+    return node_group
+
+
+def create_character():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.object.armature_add()
+    armature = bpy.context.object
+    bpy.ops.mesh.primitive_cube_add()
+    body = bpy.context.object
+    body.name = 'Body'
+    body.parent = armature
+
+    combined_node_group = get_or_create_combined_node_group(
+        create_outlines_node_group(), create_light_vectors_node_group()
+    )
+    modifier = body.modifiers.new(f'{NAME_OF_GEOMETRY_NODES_MODIFIER} {body.name}', 'NODES')
+    modifier.node_group = combined_node_group
+    return armature, body
+
+
+def get_evaluated_mesh(mesh_object):
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated_mesh = mesh_object.evaluated_get(depsgraph).data
+    return len(evaluated_mesh.vertices), LIGHT_VECTOR_ATTRIBUTE_NAME in evaluated_mesh.attributes
+
+
+armature, body = create_character()
+vertex_count = len(body.data.vertices)
+expected_meshes = {
+    FULL: (2 * vertex_count, True),  # Outline shell and light vectors
+    REDUCED: (vertex_count, True),  # Light vectors only
+    OFF: (vertex_count, False),  # Modifier hidden in the viewport
+}
+
+failures = []
+for outline_lod_level in [FULL, REDUCED, OFF, REDUCED, FULL]:
+    apply_outline_lod_level(armature, outline_lod_level, bpy.context.scene)
+    evaluated_mesh = get_evaluated_mesh(body)
+    print(f'Outline LOD {outline_lod_level}: {evaluated_mesh[0]} vertices, light vectors: {evaluated_mesh[1]}')
+    if evaluated_mesh != expected_meshes[outline_lod_level]:
+        failures.append(f'Outline LOD {outline_lod_level}: (vertices, light vectors) {evaluated_mesh}, '
+                        f'expected {expected_meshes[outline_lod_level]}')
+    if not body.modifiers[0].show_render:
+        failures.append(f'Outline LOD {outline_lod_level}: modifier hidden in renders')
+
+assert not failures, '\n'.join(failures)
+print('PASSED: Outline LOD toggles only the outlines of the combined Outlines modifier')
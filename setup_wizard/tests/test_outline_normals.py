@@ -0,0 +1,117 @@
+import bpy
+
+from setup_wizard.geometry_nodes_setup.combined_node_groups import get_or_create_combined_node_group
+from setup_wizard.optimization.outline_normals_baker import OUTLINE_NORMAL_GROUP_ATTRIBUTE_NAME, \
+    bake_outline_normal_groups
+
+'''
+    Builds a synthetic Outlines node group (moves the mesh out along its normals, the normals read in a nested node
+    group) and combines it with a Light Vectors node group into a single Outlines modifier on a cube with split edges
+    (every corner is 3 vertices with different normals), deformed by a Twist modifier before the Outlines modifier.
+    Checks that the outline shell has gaps (split corners move apart) before baking the outline normal groups and is
+    closed (every corner moves as one) after baking, with the normals smoothed after the deformation.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/test_outline_normals.py
+'''
+
+OUTLINE_WIDTH = 0.1
+NUMBER_OF_CUBE_CORNERS = 8
+
+
+def new_node_group(name, output_socket_type='NodeSocketGeometry'):
+    node_group = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    if hasattr(node_group, 'interface'):
+        node_group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+        node_group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type=output_socket_type)
+    else:
+        node_group.inputs.new('NodeSocketGeometry', 'Geometry')
+        node_group.outputs.new(output_socket_type, 'Geometry')
+    group_input_node = node_group.nodes.new('NodeGroupInput')
+    group_output_node = node_group.nodes.new('NodeGroupOutput')
+    return node_group, group_input_node, group_output_node
+
+
+def create_outline_offset_node_group():
+    node_group, _, group_output_node = new_node_group('Outline Offset', 'NodeSocketVector')
+    normal_node = node_group.nodes.new('GeometryNodeInputNormal')
+    scale_node = node_group.nodes.new('ShaderNodeVectorMath')
+    scale_node.operation = 'SCALE'
+    scale_node.inputs['Scale'].default_value = OUTLINE_WIDTH
+    node_group.links.new(normal_node.outputs[0], scale_node.inputs[0])
+    node_group.links.new(scale_node.outputs[0], group_output_node.inputs[0])
+    return node_group
+
+
+def create_outlines_node_group():
+    node_group, group_input_node, group_output_node = new_node_group('Outlines')
+    outline_offset_node = node_group.nodes.new('GeometryNodeGroup')
+    outline_offset_node.node_tree = create_outline_offset_node_group()
+    set_position_node = node_group.nodes.new('GeometryNodeSetPosition')
+    node_group.links.new(group_input_node.outputs[0], set_position_node.inputs['Geometry'])
+    node_group.links.new(outline_offset_node.outputs[0], set_position_node.inputs['Offset'])
+    node_group.links.new(set_position_node.outputs[0], group_output_node.inputs[0])
+    return node_group
+
+
+def create_light_vectors_node_group():
+    node_group, group_input_node, group_output_node = new_node_group('Light Vectors')
+    node_group.links.new(group_input_node.outputs[0], group_output_node.inputs[0])
+    return node_group
+
+
+# Cube where every face has its own 4 vertices, like a mesh split at UV seams or sharp edges
+def create_cube():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    corners = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    mesh = bpy.data.meshes.new('Cube')
+    mesh.from_pydata(
+        [corners[corner_index] for face in faces for corner_index in face], [],
+        [tuple(range(face_index * 4, face_index * 4 + 4)) for face_index in range(len(faces))]
+    )
+    cube = bpy.data.objects.new('Cube', mesh)
+    bpy.context.scene.collection.objects.link(cube)
+
+    twist_modifier = cube.modifiers.new('Twist', 'SIMPLE_DEFORM')
+    twist_modifier.deform_method = 'TWIST'
+    twist_modifier.angle = 0.5
+    outlines_modifier = cube.modifiers.new('Outlines', 'NODES')
+    outlines_modifier.node_group = get_or_create_combined_node_group(
+        create_outlines_node_group(), create_light_vectors_node_group()
+    )
+    return cube
+
+
+def get_number_of_outline_positions(mesh_object):
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated_mesh = mesh_object.evaluated_get(depsgraph).data
+    return len({tuple(round(coordinate, 4) for coordinate in vertex.co) for vertex in evaluated_mesh.vertices})
+
+
+cube = create_cube()
+failures = []
+
+number_of_outline_positions = get_number_of_outline_positions(cube)
+print(f'Before baking: {len(cube.data.vertices)} vertices at {number_of_outline_positions} outline positions')
+if number_of_outline_positions == NUMBER_OF_CUBE_CORNERS:
+    failures.append('Before baking: the split corners are expected to move apart along their own normals')
+
+if not bake_outline_normal_groups(cube.data):
+    failures.append('First bake was skipped')
+if bake_outline_normal_groups(cube.data):
+    failures.append('Second bake of the unchanged mesh was not skipped')
+number_of_normal_groups = len(set(
+    attribute_value.value for attribute_value in cube.data.attributes[OUTLINE_NORMAL_GROUP_ATTRIBUTE_NAME].data
+))
+if number_of_normal_groups != NUMBER_OF_CUBE_CORNERS:
+    failures.append(f'{number_of_normal_groups} outline normal groups, expected {NUMBER_OF_CUBE_CORNERS}')
+
+number_of_outline_positions = get_number_of_outline_positions(cube)
+print(f'After baking: {len(cube.data.vertices)} vertices at {number_of_outline_positions} outline positions')
+if number_of_outline_positions != NUMBER_OF_CUBE_CORNERS:
+    failures.append(f'After baking: {number_of_outline_positions} outline positions, expected '
+                    f'{NUMBER_OF_CUBE_CORNERS} (a closed outline shell)')
+
+assert not failures, '\n'.join(failures)
+print('PASSED: the combined Outlines node group reads the baked outline normal groups')
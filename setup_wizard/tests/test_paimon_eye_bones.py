@@ -0,0 +1,149 @@
+import bpy
+
+from math import pi
+
+from setup_wizard.character_rig_setup.paimon_rig_script import add_eye_track_bones
+from setup_wizard.character_rig_setup.rig_engine import DUPLICATED_EDIT_BONE_ATTRIBUTES
+
+'''
+    Builds a synthetic Rigify-like armature (head and eye bones with non-default B-Bone, envelope, inheritance and
+    custom property settings) and creates the Paimon eye rig bones twice: with the extrude_move/translate/duplicate_move
+    operators the Paimon rig script used before and with add_eye_track_bones (edit bone data), then compares every
+    setting and custom property of eyeTrack.R, eyeTrack.L, eyeRoot and the eye bones.
+    Runs with identity and with imported character (rotated, scaled) armature transforms.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/test_paimon_eye_bones.py
+'''
+
+TOLERANCE = 1e-5
+EYE_BONE_NAMES = ['eyeTrack.R', 'eyeTrack.L', 'eyeRoot', 'eye.R', 'eye.L']
+
+# Armature transforms: identity, and an imported character (rotated to Z up, scaled down)
+ARMATURE_TRANSFORMS = [
+    ((0.0, 0.0, 0.0), (1.0, 1.0, 1.0), 1.0),
+    ((pi / 2, 0.0, 0.0), (0.01, 0.01, 0.01), 100.0),
+]
+
+EYE_BONE_SETTINGS = {
+    'roll': 0.3,
+    'use_deform': False,
+    'inherit_scale': 'NONE',
+    'use_local_location': False,
+    'display_type': 'WIRE',
+    'envelope_weight': 0.7,
+    'bbone_segments': 3,
+    'bbone_x': 0.02,
+    'bbone_curveinx': 0.2,
+    'bbone_easein': 0.4,
+    'bbone_scaleout': (1.1, 1.2, 1.3),
+}
+
+
+def create_armature(armature_transform):
+    rotation, scale, unit_scale = armature_transform
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.object.armature_add(enter_editmode=True)
+    rig = bpy.context.object
+    rig.name = 'rigify'
+    rig.rotation_euler = rotation
+    rig.scale = scale
+
+    edit_bones = rig.data.edit_bones
+    head_bone = edit_bones[0]
+    head_bone.name = 'head'
+    head_bone.head, head_bone.tail = (0.0, 0.0, 1.4 * unit_scale), (0.0, 0.0, 1.6 * unit_scale)
+    for side, x in [('R', -0.03), ('L', 0.03)]:
+        eye_bone = edit_bones.new(f'eye.{side}')
+        eye_bone.head = (x * unit_scale, 0.0, 1.5 * unit_scale)
+        eye_bone.tail = (x * unit_scale, 0.02 * unit_scale, 1.5 * unit_scale)
+        eye_bone.parent = head_bone
+        for attribute_name, value in EYE_BONE_SETTINGS.items():
+            setattr(eye_bone, attribute_name, value)
+        eye_bone['eye_property'] = 1.0
+    bpy.ops.armature.select_all(action='DESELECT')
+
+    # Like a rig loaded from a file: edit mode stores the length of the bones (envelopes follow length changes)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.ops.object.mode_set(mode='EDIT')
+    return rig
+
+
+def select_bone(bone):
+    bone.select = True
+    bone.select_head = True
+    bone.select_tail = True
+
+
+# Part 4 of the Paimon rig script before add_eye_track_bones
+def add_eye_track_bones_with_operators(rigifyr):
+    select_bone(rigifyr.data.edit_bones["eye.R"])
+    bpy.ops.armature.extrude_move(ARMATURE_OT_extrude={"forked":False}, TRANSFORM_OT_translate={"value":(-0, -0.0473746, -0), "orient_type":'GLOBAL', "orient_matrix":((1, 0, 0), (0, 1, 0), (0, 0, 1)), "orient_matrix_type":'GLOBAL', "constraint_axis":(False, True, False), "mirror":False, "use_proportional_edit":False, "proportional_edit_falloff":'SMOOTH', "proportional_size":1, "use_proportional_connected":False, "use_proportional_projected":False})
+    rigifyr.data.edit_bones["eye.R.001"].name = "eyeTrack.R"
+    select_bone(rigifyr.data.edit_bones["eyeTrack.R"])
+    bpy.ops.armature.parent_clear(type='DISCONNECT')
+    bpy.ops.transform.translate(value=(-0, -0.110905, -0), orient_type='GLOBAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='GLOBAL', constraint_axis=(False, True, False), mirror=False, use_proportional_edit=False, proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False)
+    bpy.ops.armature.duplicate_move(ARMATURE_OT_duplicate={"do_flip_names":False}, TRANSFORM_OT_translate={"value":(-0, -0, -0), "orient_type":'GLOBAL', "orient_matrix":((1, 0, 0), (0, 1, 0), (0, 0, 1)), "orient_matrix_type":'GLOBAL', "constraint_axis":(True, False, False), "mirror":False, "use_proportional_edit":False, "proportional_edit_falloff":'SMOOTH', "proportional_size":1, "use_proportional_connected":False, "use_proportional_projected":False})
+    rigifyr.data.edit_bones["eyeTrack.R.001"].name = "eyeRoot"
+
+    rigifyr.data.edit_bones["eyeRoot"].tail.x = rigifyr.data.edit_bones["eyeRoot"].head.x = 0
+    bpy.ops.armature.select_all(action='DESELECT')
+    rigifyr.data.edit_bones['eyeTrack.R'].parent = rigifyr.data.edit_bones['eyeRoot']
+    rigifyr.data.edit_bones['eyeRoot'].parent = rigifyr.data.edit_bones['head']
+    select_bone(rigifyr.data.edit_bones["eyeTrack.R"])
+    bpy.ops.armature.symmetrize()
+    rigifyr.data.edit_bones['eyeRoot'].parent = None
+    rigifyr.data.edit_bones["eyeTrack.R"].roll = 0
+    rigifyr.data.edit_bones["eyeTrack.L"].roll = 0
+    rigifyr.data.edit_bones["eyeRoot"].roll = 0
+
+
+def get_bone_settings(edit_bone):
+    bone_settings = {}
+    for attribute_name in DUPLICATED_EDIT_BONE_ATTRIBUTES:
+        if not hasattr(edit_bone, attribute_name):
+            continue
+        value = getattr(edit_bone, attribute_name)
+        if hasattr(value, 'name'):
+            value = value.name
+        elif hasattr(value, '__len__') and not isinstance(value, str):
+            value = tuple(value)
+        bone_settings[attribute_name] = value
+    bone_settings['collections'] = sorted(
+        bone_collection.name for bone_collection in getattr(edit_bone, 'collections', [])
+    )
+    bone_settings['custom_properties'] = {key: edit_bone[key] for key in edit_bone.keys()}
+    return bone_settings
+
+
+def is_close(value, other_value, tolerance):
+    if isinstance(value, tuple):
+        return len(value) == len(other_value) and all(is_close(v, o, tolerance) for v, o in zip(value, other_value))
+    if isinstance(value, float):
+        return abs(value - other_value) <= tolerance
+    return value == other_value
+
+
+def create_eye_track_bones(armature_transform, add_eye_track_bones_function):
+    rig = create_armature(armature_transform)
+    bpy.context.view_layer.update()
+    add_eye_track_bones_function(rig)
+    return {bone_name: get_bone_settings(rig.data.edit_bones[bone_name]) for bone_name in EYE_BONE_NAMES}
+
+
+failures = []
+for armature_transform in ARMATURE_TRANSFORMS:
+    operator_bones = create_eye_track_bones(armature_transform, add_eye_track_bones_with_operators)
+    data_bones = create_eye_track_bones(armature_transform, add_eye_track_bones)
+
+    for bone_name in EYE_BONE_NAMES:
+        for attribute_name, value in operator_bones[bone_name].items():
+            data_value = data_bones[bone_name][attribute_name]
+            if not is_close(value, data_value, TOLERANCE * armature_transform[2]):
+                failures.append(f'{armature_transform[0]} {bone_name}.{attribute_name}: operators {value}, '
+                                f'data {data_value}')
+    print(f'{armature_transform[0]}: compared {len(EYE_BONE_NAMES)} bones, '
+          f'{len(operator_bones[EYE_BONE_NAMES[0]])} settings each')
+
+assert not failures, '\n'.join(failures)
+print('PASSED: eye rig bones match the extrude/translate/duplicate operators')
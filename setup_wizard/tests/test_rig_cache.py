@@ -0,0 +1,78 @@
+import bpy
+import os
+import sys
+import tempfile
+import time
+
+from setup_wizard.character_rig_setup.rig_script import rig_character
+
+'''
+    Rigs the same character twice with an empty rig cache directory: the first rig generates the Rigify rig and
+    caches it, the second rig reuses the cached rig. Compares the bones, bone rest positions and pose bone constraints
+    of both rigs.
+    Run it on a .blend file with a set up character.
+
+    Usage:
+    "blender.exe" -b "<set up character .blend file>" --python setup_wizard/tests/test_rig_cache.py -- [RootShape .blend file]
+'''
+
+argv = sys.argv
+argv = argv[argv.index('--') + 1:] if '--' in argv else []
+
+arg_root_shape_file_path = argv[0] if argv else os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'character_rig_setup', 'RootShape.blend'
+)
+
+TOLERANCE = 1e-4
+
+
+def rig(rig_cache_directory):
+    bpy.ops.wm.revert_mainfile()
+    armature = [object for object in bpy.context.scene.objects if object.type == 'ARMATURE'][0]
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.context.view_layer.objects.active = armature
+    armature.select_set(True)
+
+    start = time.perf_counter()
+    rig_character(
+        arg_root_shape_file_path,
+        disallow_arm_ik_stretch=True,
+        disallow_leg_ik_stretch=True,
+        use_arm_ik_poles=False,
+        use_leg_ik_poles=False,
+        add_child_of_constraints=False,
+        use_head_tracker=False,
+        meshes_joined=not (bpy.data.objects.get('Body') and bpy.data.objects.get('Face')),
+        rig_cache_directory=rig_cache_directory,
+    )
+    rig_time = time.perf_counter() - start
+
+    rig_object = [object for object in bpy.context.scene.objects if object.type == 'ARMATURE' and
+                  object.name.endswith('Rig')][0]
+    return {
+        bone.name: (
+            bone.head_local.copy(),
+            bone.tail_local.copy(),
+            sorted(constraint.type for constraint in rig_object.pose.bones[bone.name].constraints)
+        ) for bone in rig_object.data.bones
+    }, rig_time
+
+
+with tempfile.TemporaryDirectory() as rig_cache_directory:
+    generated_bones, generated_rig_time = rig(rig_cache_directory)
+    assert os.listdir(rig_cache_directory), 'Rigify rig was not cached'
+    cached_bones, cached_rig_time = rig(rig_cache_directory)
+
+failures = [f'{bone_name}: missing in the cached rig' for bone_name in generated_bones.keys() - cached_bones.keys()]
+failures += [f'{bone_name}: only in the cached rig' for bone_name in cached_bones.keys() - generated_bones.keys()]
+for bone_name in generated_bones.keys() & cached_bones.keys():
+    generated_head, generated_tail, generated_constraints = generated_bones[bone_name]
+    cached_head, cached_tail, cached_constraints = cached_bones[bone_name]
+    if (generated_head - cached_head).length > TOLERANCE or (generated_tail - cached_tail).length > TOLERANCE:
+        failures.append(f'{bone_name}: rest position differs')
+    if generated_constraints != cached_constraints:
+        failures.append(f'{bone_name}: constraints differ {generated_constraints} != {cached_constraints}')
+
+print(f'Rig time with generated Rigify rig: {generated_rig_time:.3f}s, with cached Rigify rig: {cached_rig_time:.3f}s')
+assert not failures, '\n'.join(failures)
+print(f'PASSED: cached rig matches the generated rig ({len(generated_bones)} bones)')
@@ -0,0 +1,78 @@
+import bpy
+import numpy
+import os
+import sys
+import time
+
+from setup_wizard.character_rig_setup.rig_script import rig_character
+from setup_wizard.character_rig_setup.shape_key_utils import get_shape_key_coordinates
+
+'''
+    Rigs the same character twice, with the edit mode operator shape keys and with the data-level (NumPy) shape keys,
+    and compares the vertex positions of every eye/EyeStar shape key.
+    The operator path needs a VIEW_3D area, so run it in the foreground on a .blend file with a set up character.
+
+    Usage:
+    "blender.exe" "<set up character .blend file>" --python setup_wizard/tests/test_rig_shape_keys.py -- [RootShape .blend file]
+'''
+
+argv = sys.argv
+argv = argv[argv.index('--') + 1:] if '--' in argv else []
+
+arg_root_shape_file_path = argv[0] if argv else os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'character_rig_setup', 'RootShape.blend'
+)
+
+SHAPE_KEY_NAMES = ['pupils', 'pupil-pushback-R', 'pupil-pushback-L', 'EyeStar']
+MESH_NAMES = ['Body', 'EyeStar']
+TOLERANCE = 1e-5
+
+
+def rig(use_shape_key_operators):
+    bpy.ops.wm.revert_mainfile()
+    armature = [object for object in bpy.context.scene.objects if object.type == 'ARMATURE'][0]
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.context.view_layer.objects.active = armature
+    armature.select_set(True)
+
+    start = time.perf_counter()
+    rig_character(
+        arg_root_shape_file_path,
+        disallow_arm_ik_stretch=True,
+        disallow_leg_ik_stretch=True,
+        use_arm_ik_poles=False,
+        use_leg_ik_poles=False,
+        add_child_of_constraints=False,
+        use_head_tracker=False,
+        meshes_joined=not (bpy.data.objects.get('Body') and bpy.data.objects.get('Face')),
+        use_shape_key_operators=use_shape_key_operators,
+    )
+    rig_time = time.perf_counter() - start
+
+    return {
+        mesh_name: get_shape_key_coordinates(bpy.data.objects.get(mesh_name)) for
+            mesh_name in MESH_NAMES if bpy.data.objects.get(mesh_name)
+    }, rig_time
+
+
+operator_shape_keys, operator_rig_time = rig(use_shape_key_operators=True)
+data_shape_keys, data_rig_time = rig(use_shape_key_operators=False)
+
+failures = []
+for mesh_name, operator_coordinates in operator_shape_keys.items():
+    for shape_key_name in SHAPE_KEY_NAMES:
+        if shape_key_name not in operator_coordinates:
+            continue
+        data_coordinates = data_shape_keys.get(mesh_name, {}).get(shape_key_name)
+        if data_coordinates is None:
+            failures.append(f'{mesh_name} "{shape_key_name}": missing with the data-level shape keys')
+            continue
+
+        max_difference = float(numpy.abs(operator_coordinates[shape_key_name] - data_coordinates).max())
+        print(f'{mesh_name} "{shape_key_name}": max vertex position difference {max_difference:.2e}')
+        if max_difference > TOLERANCE:
+            failures.append(f'{mesh_name} "{shape_key_name}": {max_difference:.2e} > {TOLERANCE:.0e}')
+
+print(f'Rig time with operator shape keys: {operator_rig_time:.3f}s, with data-level shape keys: {data_rig_time:.3f}s')
+assert not failures, '\n'.join(failures)
+print('PASSED: data-level shape keys match the operator shape keys')
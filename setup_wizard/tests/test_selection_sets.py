@@ -0,0 +1,102 @@
+import bpy
+
+from setup_wizard.character_rig_setup.rig_engine import create_selection_sets
+from setup_wizard.character_rig_setup.rig_specs import SELECTION_SET_SPECS
+
+'''
+    Builds a synthetic Rigify-like rig (FK arm, hair and clothes controls, with ORG-/DEF-/MCH- bones in hidden bone
+    collections/layers and a hidden control bone) and creates the rig scripts' selection sets twice: by selecting the
+    bones and running the selection set operators like the rig scripts did before, and with create_selection_sets
+    (rig data), then compares the bones of every selection set.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/test_selection_sets.py
+'''
+
+CONTROL_BONE_NAMES = [
+    f'{bone_name}{side}' for side in ['.L', '.R'] for bone_name in
+        ['upper_arm_fk', 'forearm_fk', 'hand_fk', 'shoulder', 'upper_arm_tweak', 'Hair 1', 'Hair 2', 'Skirt 1']
+] + ['Amice', 'spine_fk.001']
+HIDDEN_BONE_NAME = 'Hair 2.R'
+HIDDEN_BONE_PREFIXES = ['ORG-', 'DEF-', 'MCH-']
+HIDDEN_LAYER_INDEX = 31
+
+
+def create_rig():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.object.armature_add(enter_editmode=True)
+    rig = bpy.context.object
+    armature = rig.data
+    hidden_bone_collection = armature.collections.new('ORG') if hasattr(armature, 'collections') else None
+
+    for bone_index, bone_name in enumerate(CONTROL_BONE_NAMES):
+        for prefix in [''] + HIDDEN_BONE_PREFIXES:
+            edit_bone = armature.edit_bones.new(f'{prefix}{bone_name}')
+            edit_bone.head, edit_bone.tail = (bone_index, 0.0, 0.0), (bone_index, 0.0, 1.0)
+            if not prefix:
+                continue
+            if hidden_bone_collection:
+                hidden_bone_collection.assign(edit_bone)
+            else:
+                edit_bone.layers = [layer_index == HIDDEN_LAYER_INDEX for layer_index in range(32)]
+
+    bpy.ops.object.mode_set(mode='POSE')
+    if hidden_bone_collection:
+        hidden_bone_collection.is_visible = False
+    hidden_pose_bone = rig.pose.bones[HIDDEN_BONE_NAME]
+    if hasattr(hidden_pose_bone, 'hide'):
+        hidden_pose_bone.hide = True
+    else:
+        hidden_pose_bone.bone.hide = True
+    return rig
+
+
+def set_pose_bone_selected(pose_bone, select):
+    if hasattr(pose_bone, 'select'):
+        pose_bone.select = select  # Selection is on the pose bone from Blender 5.0
+    else:
+        pose_bone.bone.select = select
+
+
+# Selection sets of the rig scripts before create_selection_sets
+def create_selection_sets_with_operators(rig):
+    with bpy.context.temp_override(object=rig, active_object=rig):
+        for selection_set_spec in SELECTION_SET_SPECS:
+            for bone_name in selection_set_spec.get_bone_names(rig.pose.bones):
+                set_pose_bone_selected(rig.pose.bones[bone_name], True)
+            bpy.ops.pose.selection_set_add()
+            bpy.ops.pose.selection_set_assign()
+            bpy.ops.pose.select_all(action='DESELECT')
+    for selection_set, selection_set_spec in zip(rig.selection_sets, SELECTION_SET_SPECS):
+        selection_set.name = selection_set_spec.name
+
+
+def create_selection_sets_with_data(rig):
+    create_selection_sets(rig, SELECTION_SET_SPECS)
+
+
+def get_selection_sets(create_selection_sets_function):
+    rig = create_rig()
+    create_selection_sets_function(rig)
+    return {
+        selection_set.name: sorted(bone_id.name for bone_id in selection_set.bone_ids) for
+            selection_set in rig.selection_sets
+    }
+
+
+operator_selection_sets = get_selection_sets(create_selection_sets_with_operators)
+data_selection_sets = get_selection_sets(create_selection_sets_with_data)
+
+failures = []
+for selection_set_name, bone_names in operator_selection_sets.items():
+    data_bone_names = data_selection_sets.get(selection_set_name)
+    print(f'"{selection_set_name}": operators {len(bone_names)} bones, data {len(data_bone_names or [])} bones')
+    if not bone_names:
+        failures.append(f'"{selection_set_name}": the operators assigned no bones')
+    if data_bone_names != bone_names:
+        failures.append(f'"{selection_set_name}": operators {bone_names}, data {data_bone_names}')
+if set(operator_selection_sets) != set(data_selection_sets):
+    failures.append(f'Selection sets: operators {list(operator_selection_sets)}, data {list(data_selection_sets)}')
+
+assert not failures, '\n'.join(failures)
+print('PASSED: selection sets match the selection set operators')
@@ -0,0 +1,83 @@
+import bpy
+import os
+import tempfile
+
+from setup_wizard.utils.library_loader import load_datablocks, make_linked_materials_local
+
+'''
+    Builds a synthetic shader .blend file (materials sharing a shader node group that nests a character specific
+    node group and a utility node group), links the materials like the Link shader mode of the material importer and
+    makes them local. Checks that every character specific node group and the node groups nesting it are made local
+    once (no '.001' copies), that every material uses the same local node groups and that the rest stay linked.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/test_shader_link_mode.py
+'''
+
+MATERIAL_NAMES = ['Body', 'Hair', 'Face']
+SHADER_NODE_GROUP_NAME = 'Shader'
+CHARACTER_SPECIFIC_NODE_GROUP_NAME = 'Body Shadow Ramp'
+UTILITY_NODE_GROUP_NAME = 'Utility'
+
+
+def new_node_group(name, nested_node_groups):
+    node_group = bpy.data.node_groups.new(name, 'ShaderNodeTree')
+    for nested_node_group in nested_node_groups:
+        node_group.nodes.new('ShaderNodeGroup').node_tree = nested_node_group
+    return node_group
+
+
+def create_shader_blend_file(blend_file_path):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    character_specific_node_group = new_node_group(CHARACTER_SPECIFIC_NODE_GROUP_NAME, [])
+    utility_node_group = new_node_group(UTILITY_NODE_GROUP_NAME, [])
+    shader_node_group = new_node_group(SHADER_NODE_GROUP_NAME, [character_specific_node_group, utility_node_group])
+
+    for material_name in MATERIAL_NAMES:
+        material = bpy.data.materials.new(material_name)
+        material.use_nodes = True
+        material.node_tree.nodes.new('ShaderNodeGroup').node_tree = shader_node_group
+        material.node_tree.nodes.new('ShaderNodeGroup').node_tree = character_specific_node_group
+        material.use_fake_user = True
+    bpy.ops.wm.save_as_mainfile(filepath=blend_file_path)
+
+
+def get_group_node_trees(node_tree):
+    return [node.node_tree for node in node_tree.nodes if node.type == 'GROUP' and node.node_tree]
+
+
+shader_blend_file_path = os.path.join(tempfile.mkdtemp(), 'test_shader_link_mode.blend')
+create_shader_blend_file(shader_blend_file_path)
+
+bpy.ops.wm.read_factory_settings(use_empty=True)
+linked_materials = load_datablocks(shader_blend_file_path, {'materials': MATERIAL_NAMES}, link=True)['materials']
+local_materials = make_linked_materials_local(linked_materials, [CHARACTER_SPECIFIC_NODE_GROUP_NAME])
+
+local_node_group_names = sorted(node_group.name for node_group in bpy.data.node_groups if not node_group.library)
+linked_node_group_names = sorted(node_group.name for node_group in bpy.data.node_groups if node_group.library)
+print(f'Local node groups: {local_node_group_names}, linked node groups: {linked_node_group_names}')
+
+failures = []
+if local_node_group_names != sorted([SHADER_NODE_GROUP_NAME, CHARACTER_SPECIFIC_NODE_GROUP_NAME]):
+    failures.append(f'Local node groups {local_node_group_names}, expected one local copy of '
+                    f'{SHADER_NODE_GROUP_NAME} and {CHARACTER_SPECIFIC_NODE_GROUP_NAME}')
+if len(set(local_node_group_names)) != len(local_node_group_names) or \
+        any(node_group_name[-4:-3] == '.' for node_group_name in local_node_group_names):
+    failures.append(f'Local node group names are not unique: {local_node_group_names}')
+
+for material in local_materials:
+    if material.library:
+        failures.append(f'{material.name}: material is still linked')
+    for node_group in get_group_node_trees(material.node_tree):
+        if node_group.library or node_group != bpy.data.node_groups.get(node_group.name.split('.')[0]):
+            failures.append(f'{material.name}: uses {node_group.name} (linked: {bool(node_group.library)}), '
+                            f'not the shared local node group')
+
+shader_node_group = bpy.data.node_groups.get(SHADER_NODE_GROUP_NAME)
+for node_group in get_group_node_trees(shader_node_group) if shader_node_group else []:
+    is_linked = bool(node_group.library)
+    if is_linked != (node_group.name == UTILITY_NODE_GROUP_NAME):
+        failures.append(f'{SHADER_NODE_GROUP_NAME}: nested {node_group.name} linked: {is_linked}')
+
+assert not failures, '\n'.join(failures)
+print('PASSED: linked shader node groups are made local once per file')
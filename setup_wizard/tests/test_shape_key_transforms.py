@@ -0,0 +1,163 @@
+import bpy
+import numpy
+
+from math import pi
+from mathutils import Matrix
+
+from setup_wizard.character_rig_setup.shape_key_utils import ShapeKeyTransform, add_transformed_shape_key, \
+    get_shape_key_coordinates
+
+'''
+    Builds a synthetic Body (head with two eyes and partially weighted eye vertices) and EyeStar mesh and creates the
+    eye shape keys of rig_script (pupils, pupil-pushback-R/L, EyeStar) twice: with the edit mode operators of
+    rig_script's operator path (vertex_group_select, 3D cursor pivot, transform.resize/translate) and with the
+    data-level shape_key_utils.add_transformed_shape_key, then compares the vertex positions of every shape key.
+    Runs with identity and with imported character (rotated, scaled) object transforms.
+    Without a VIEW_3D area the transform operators scale about the median point instead of the 3D cursor, so the
+    operators get the cursor location as center_override, the pivot they use in the foreground.
+    The operator shape keys are the Blender 3.x ones: from Blender 4.0, rig_script's transform.resize(override, ...)
+    after the pupil pushback translation raises (no positional context override) and the pushback is not scaled.
+    Does not need a character .blend file, unlike test_rig_shape_keys.py.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/test_shape_key_transforms.py
+'''
+
+TOLERANCE = 1e-5  # World units
+LEFT_EYE_GROUP_NAME = '+EyeBone L A02'
+RIGHT_EYE_GROUP_NAME = '+EyeBone R A02'
+EYE_CENTERS = {LEFT_EYE_GROUP_NAME: (0.031, -0.05, 1.52), RIGHT_EYE_GROUP_NAME: (-0.031, -0.05, 1.52)}
+EYE_PIVOTS = {LEFT_EYE_GROUP_NAME: (0.032, -0.045, 1.52), RIGHT_EYE_GROUP_NAME: (-0.032, -0.045, 1.52)}
+PUSHBACK_EYE_PIVOTS = {LEFT_EYE_GROUP_NAME: (0.031, -0.04, 1.52), RIGHT_EYE_GROUP_NAME: (-0.031, -0.04, 1.52)}
+
+# (mesh name, shape key name, is basis, vertex group names, transform type, transformation 1, transformation 2, pivots)
+SHAPE_KEY_SPECS = [
+    ('Body', 'pupils', True, [LEFT_EYE_GROUP_NAME, RIGHT_EYE_GROUP_NAME], 'RESIZE', (0.5, 0.5, 0.5), None,
+        EYE_PIVOTS),
+    ('Body', 'pupil-pushback-R', False, [RIGHT_EYE_GROUP_NAME], 'TRANSLATE', (0, 0.00703, 0), (1.1, 1.1, 1.1),
+        PUSHBACK_EYE_PIVOTS),
+    ('Body', 'pupil-pushback-L', False, [LEFT_EYE_GROUP_NAME], 'TRANSLATE', (0, 0.00703, 0), (1.1, 1.1, 1.1),
+        PUSHBACK_EYE_PIVOTS),
+    ('EyeStar', 'EyeStar', True, [RIGHT_EYE_GROUP_NAME, LEFT_EYE_GROUP_NAME], 'RESIZE', (0, 0, 0), None, EYE_PIVOTS),
+]
+
+# Object transforms: identity, and an imported character (rotated to Z up, scaled down)
+OBJECT_TRANSFORMS = [
+    ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)),
+    ((0.0, 0.0, 0.0), (pi / 2, 0.0, 0.0), (0.01, 0.01, 0.01)),
+]
+
+
+def create_mesh_object(mesh_name, object_transform):
+    location, rotation, scale = object_transform
+    bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=8, radius=0.1, location=(0.0, 0.0, 1.5))
+    head = bpy.context.object
+    eyes = []
+    for group_name, eye_center in EYE_CENTERS.items():
+        bpy.ops.mesh.primitive_uv_sphere_add(segments=12, ring_count=6, radius=0.012, location=eye_center)
+        eyes.append((group_name, bpy.context.object))
+
+    eye_vertex_counts = {}
+    for group_name, eye in eyes:
+        eye_vertex_counts[group_name] = len(eye.data.vertices)
+    for primitive in [head] + [eye for _, eye in eyes]:
+        primitive.data.transform(primitive.matrix_world)  # Vertices in world space, the joined object at the origin
+        primitive.matrix_world = Matrix.Identity(4)
+    bpy.ops.object.select_all(action='DESELECT')
+    for _, eye in eyes:
+        eye.select_set(True)
+    head.select_set(True)
+    bpy.context.view_layer.objects.active = head
+    bpy.ops.object.join()
+
+    mesh_object = bpy.context.object
+    mesh_object.name = mesh_name
+    head_vertex_count = len(mesh_object.data.vertices) - sum(eye_vertex_counts.values())
+    first_vertex_index = head_vertex_count
+    for group_name, _ in eyes:
+        vertex_group = mesh_object.vertex_groups.new(name=group_name)
+        vertex_indices = list(range(first_vertex_index, first_vertex_index + eye_vertex_counts[group_name]))
+        vertex_group.add(vertex_indices[::2], 1.0, 'REPLACE')
+        vertex_group.add(vertex_indices[1::2], 0.3, 'REPLACE')  # Partial weights, selected all the same
+        first_vertex_index += eye_vertex_counts[group_name]
+
+    # Apply the transform to the vertices so the world positions stay the same as the identity case
+    mesh_object.location, mesh_object.rotation_euler, mesh_object.scale = location, rotation, scale
+    bpy.context.view_layer.update()
+    mesh_object.data.transform(mesh_object.matrix_world.inverted())
+    mesh_object.data.update()
+    return mesh_object
+
+
+# The shape key of rig_script's operator path (create_shape_key/create_shape_key2) for one vertex group
+def add_shape_key_with_operators(mesh_object, shape_name, is_basis, vertex_group_names, transform_type,
+                                 transformation_1, transformation_2, pivots):
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.context.view_layer.objects.active = mesh_object
+    mesh_object.select_set(True)
+    if is_basis:
+        mesh_object.shape_key_add(name='Basis')
+    shape_key = mesh_object.shape_key_add(name=shape_name, from_mix=False)
+    shape_key.value = 1
+    mesh_object.active_shape_key_index = mesh_object.data.shape_keys.key_blocks.keys().index(shape_name)
+
+    for vertex_group_name in vertex_group_names:
+        bpy.context.scene.cursor.location = pivots[vertex_group_name]
+        pivot = bpy.context.scene.cursor.location.copy()
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.select_all(action='DESELECT')
+        bpy.context.tool_settings.transform_pivot_point = 'CURSOR'
+        bpy.ops.object.vertex_group_set_active(group=vertex_group_name)
+        bpy.ops.object.vertex_group_select()
+        if transform_type == 'RESIZE':
+            bpy.ops.transform.resize(value=transformation_1, orient_type='LOCAL',
+                                     orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL',
+                                     mirror=False, center_override=pivot)
+        else:
+            bpy.ops.transform.translate(value=transformation_1, orient_type='LOCAL',
+                                        orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='LOCAL',
+                                        constraint_axis=(False, True, False), mirror=True)
+            bpy.ops.transform.resize(value=transformation_2, center_override=pivot)
+        bpy.ops.mesh.select_all(action='DESELECT')
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    shape_key.value = 0.0
+    bpy.context.scene.cursor.location = (0.0, 0.0, 0.0)
+
+
+def add_shape_key_with_data(mesh_object, shape_name, is_basis, vertex_group_names, transform_type,
+                            transformation_1, transformation_2, pivots):
+    add_transformed_shape_key(mesh_object, shape_name, is_basis, [
+        ShapeKeyTransform(vertex_group_name, pivots[vertex_group_name], transform_type, transformation_1,
+                          transformation_2) for vertex_group_name in vertex_group_names
+    ])
+
+
+def create_shape_keys(object_transform, add_shape_key):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    mesh_objects = {mesh_name: create_mesh_object(mesh_name, object_transform) for mesh_name in ['Body', 'EyeStar']}
+    for mesh_name, shape_name, is_basis, vertex_group_names, transform_type, transformation_1, transformation_2, \
+            pivots in SHAPE_KEY_SPECS:
+        add_shape_key(mesh_objects[mesh_name], shape_name, is_basis, vertex_group_names, transform_type,
+                      transformation_1, transformation_2, pivots)
+    return {mesh_name: get_shape_key_coordinates(mesh_object) for mesh_name, mesh_object in mesh_objects.items()}
+
+
+failures = []
+for object_transform in OBJECT_TRANSFORMS:
+    operator_shape_keys = create_shape_keys(object_transform, add_shape_key_with_operators)
+    data_shape_keys = create_shape_keys(object_transform, add_shape_key_with_data)
+
+    for mesh_name, operator_coordinates in operator_shape_keys.items():
+        for shape_key_name, coordinates in operator_coordinates.items():
+            basis_offset = float(numpy.abs(coordinates - operator_coordinates['Basis']).max())
+            max_difference = float(numpy.abs(coordinates - data_shape_keys[mesh_name][shape_key_name]).max())
+            print(f'{object_transform[1]} {mesh_name} "{shape_key_name}": max offset from Basis {basis_offset:.2e}, '
+                  f'max difference {max_difference:.2e}')
+            if shape_key_name != 'Basis' and basis_offset <= TOLERANCE:
+                failures.append(f'{mesh_name} "{shape_key_name}": the operators did not change the shape key')
+            if max_difference > TOLERANCE / min(object_transform[2]):  # Local units
+                failures.append(f'{object_transform[1]} {mesh_name} "{shape_key_name}": {max_difference:.2e}')
+
+assert not failures, '\n'.join(failures)
+print('PASSED: data-level shape keys match the operator shape keys')
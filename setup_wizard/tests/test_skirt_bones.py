@@ -0,0 +1,103 @@
+import sys
+import time
+
+from setup_wizard.character_rig_setup.skirt_bones import BACK, FRONT, SIDE, get_skirt_area, get_skirt_bone_names
+
+'''
+    Builds synthetic skirt hierarchies (front/side/back skirt chains under the pelvis, skirt-named bones under the
+    chest, hair chains) and checks that get_skirt_bone_names finds the same skirt bones, in the same order, as the
+    previous scan of every bone per bone, then compares the time of both on a skeleton with long chains.
+
+    Usage:
+    "blender.exe" -b --python setup_wizard/tests/test_skirt_bones.py -- [chain length]
+'''
+
+argv = sys.argv
+argv = argv[argv.index('--') + 1:] if '--' in argv else []
+
+arg_chain_length = int(argv[0]) if argv else 40
+
+
+class Bone:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+
+
+def add_chain(bones, parent, name_format, length):
+    for index in range(length):
+        parent = Bone(name_format.format(index + 1), parent)
+        bones.append(parent)
+
+
+def create_skeleton(chain_length):
+    root = Bone('DEF-spine')
+    pelvis = Bone('DEF-spine.001', root)
+    spine = Bone('DEF-spine.002', pelvis)
+    chest = Bone('DEF-spine.003', spine)
+    head = Bone('DEF-spine.006', chest)
+    bones = [root, pelvis, spine, chest, head]
+
+    for side in ['L', 'R']:
+        add_chain(bones, pelvis, f'+SkirtF{side} A{{:02d}}', chain_length)
+        add_chain(bones, pelvis, f'+SkirtS{side} A{{:02d}}', chain_length)
+        add_chain(bones, pelvis, f'+HemB{side} A{{:02d}}', chain_length)
+        add_chain(bones, pelvis, f'+OvercoatF{side} B{{:02d}}', chain_length // 2)
+        add_chain(bones, chest, f'+SkirtF{side} C{{:02d}}', chain_length // 2)  # Skirt named, but not a skirt bone
+        add_chain(bones, head, f'+Hair {side} A{{:02d}}', chain_length)
+    add_chain(bones, pelvis, '+VisionPelvisB A{:02d}', 2)
+    add_chain(bones, pelvis, '+PelvisTwist CF A{:02d}', 2)
+    return bones
+
+
+# The skirt bone scan of rig_script before the parent -> children map, scans every bone for the children of each bone
+def get_skirt_bone_names_by_scan(bones, skirt_parent_bone_name, excluded_bone_name):
+    bones_by_name = {bone.name: bone for bone in bones}
+
+    def get_descendant_bones(current):
+        descendant_bones = []
+        for bone in bones:
+            if bone.parent == bones_by_name[current]:
+                descendant_bones.append(bone)
+                descendant_bones.extend(get_descendant_bones(bone.name))
+        return descendant_bones
+
+    excluded_bone_names = [bone.name for bone in get_descendant_bones(excluded_bone_name)]
+    skirt_children = get_descendant_bones(skirt_parent_bone_name)
+    return {
+        area: [
+            bone.name for bone in skirt_children if
+                bone.name not in excluded_bone_names and get_skirt_area(bone.name) == area
+        ] for area in [FRONT, SIDE, BACK]
+    }
+
+
+for chain_length in [1, 3, 10]:
+    bones = create_skeleton(chain_length)
+    expected_skirt_bone_names = get_skirt_bone_names_by_scan(bones, 'DEF-spine.001', 'DEF-spine.003')
+    skirt_bone_names = get_skirt_bone_names(bones, 'DEF-spine.001', excluded_bone_name='DEF-spine.003')
+    assert skirt_bone_names == expected_skirt_bone_names, f'Chain length {chain_length}: {skirt_bone_names}'
+    assert not any('C' in bone_name.split(' ')[-1] for bone_names in skirt_bone_names.values() for
+                   bone_name in bone_names), 'Skirt named bones under the chest are not skirt bones'
+    assert len(skirt_bone_names[FRONT]) == 2 * chain_length + 2 * (chain_length // 2)
+    assert len(skirt_bone_names[SIDE]) == 2 * chain_length
+    assert len(skirt_bone_names[BACK]) == 2 * chain_length + 2
+
+assert get_skirt_area('+SkirtF A01') == FRONT
+assert get_skirt_area('+HemS A01') == SIDE
+assert get_skirt_area('+OvercoatB A01') == BACK
+assert get_skirt_area('+VisionPelvisB A01') == BACK
+assert get_skirt_area('+Skirt') is None
+assert get_skirt_area('+Hair F A01') is None
+
+bones = create_skeleton(arg_chain_length)
+start = time.perf_counter()
+get_skirt_bone_names_by_scan(bones, 'DEF-spine.001', 'DEF-spine.003')
+scan_time = time.perf_counter() - start
+
+start = time.perf_counter()
+get_skirt_bone_names(bones, 'DEF-spine.001', excluded_bone_name='DEF-spine.003')
+children_map_time = time.perf_counter() - start
+
+print(f'{len(bones)} bones: scan {scan_time:.4f}s, parent -> children map {children_map_time:.4f}s')
+print('PASSED: skirt bones match the scan of every bone per bone')
@@ -29,6 +29,48 @@ class UI_Properties:
             default = True
         )
 
+        bpy.types.WindowManager.setup_wizard_incremental_material_data_import_enabled = bpy.props.BoolProperty(
+            name = "Only Apply Changed Values",
+            description = "Re-importing Material Data only writes values that differ from the current material values",
+            default = False
+        )
+
+        bpy.types.WindowManager.setup_wizard_link_shader_enabled = bpy.props.BoolProperty(
+            name = "Link Shader",
+            description = "Link the shader node groups from the shader .blend file instead of appending a copy of them. "
+                "Keeps .blend files smaller and picks up shader updates, but the shader .blend file must stay in place",
+            default = False
+        )
+
+        bpy.types.WindowManager.setup_wizard_shared_outline_materials_enabled = bpy.props.BoolProperty(
+            name = "Shared Outline Materials",
+            description = "After the material data import, shader materials whose outline materials are identical "
+                "(same textures and outline colors) share one outline material instead of each keeping its own copy. "
+                "Reduces the number of materials in the scene",
+            default = False
+        )
+
+        bpy.types.WindowManager.setup_wizard_combined_outlines_modifier_enabled = bpy.props.BoolProperty(
+            name = "Single Outlines Modifier",
+            description = "Combine the Light Vectors and Outlines node groups into one node group so each mesh only "
+                "has a single Outlines modifier to evaluate",
+            default = False
+        )
+
+        bpy.types.WindowManager.setup_wizard_multi_character_enabled = bpy.props.BoolProperty(
+            name = "Multi-Character Scene",
+            description = "Set up more than one character in the scene. Steps only operate on the Target Armature, "
+                "shader node groups and textures are shared and each character's materials are renamed after it",
+            default = False
+        )
+
+        bpy.types.Scene.setup_wizard_target_armature = bpy.props.PointerProperty(
+            name = "Target Armature",
+            description = "Armature of the character being set up. Set automatically when a character model is imported",
+            type = bpy.types.Object,
+            poll = lambda self, object: object.type == 'ARMATURE'
+        )
+
 
 class GI_PT_Setup_Wizard_UI_Layout(Panel):
     bl_label = "Genshin Impact Setup Wizard"
@@ -79,6 +121,10 @@ class GI_PT_Setup_Wizard_UI_Layout(Panel):
 
         settings_box.prop(window_manager, 'setup_wizard_join_meshes_enabled')
         settings_box.prop(window_manager, 'setup_wizard_full_run_rigging_enabled')
+        settings_box.prop(window_manager, 'setup_wizard_link_shader_enabled')
+        settings_box.prop(window_manager, 'setup_wizard_multi_character_enabled')
+        if window_manager.setup_wizard_multi_character_enabled:
+            settings_box.prop(context.scene, 'setup_wizard_target_armature')
 
 class GI_PT_Basic_Setup_Wizard_UI_Layout(Panel):
     bl_label = 'Basic Setup'
@@ -217,6 +263,8 @@ class GI_PT_UI_Outlines_Menu(Panel):
                 'FILE_FOLDER',
                 game_type=GameType.GENSHIN_IMPACT.name,
             )
+            sub_layout.prop(context.window_manager, 'setup_wizard_shared_outline_materials_enabled')
+            sub_layout.prop(context.window_manager, 'setup_wizard_combined_outlines_modifier_enabled')
             OperatorFactory.create(
                 sub_layout,
                 'genshin.setup_geometry_nodes',
@@ -224,6 +272,21 @@ class GI_PT_UI_Outlines_Menu(Panel):
                 'GEOMETRY_NODES',
                 game_type=GameType.GENSHIN_IMPACT.name,
             )
+            OperatorFactory.create(
+                sub_layout,
+                'hoyoverse.bake_outline_normals',
+                'Bake Outline Normals',
+                'NORMALS_VERTEX',
+                game_type=GameType.GENSHIN_IMPACT.name,
+            )
+            OperatorFactory.create(
+                sub_layout,
+                'hoyoverse.set_up_outline_lod',
+                'Set Up Outline LOD',
+                'MOD_DECIM',
+                operator_context='INVOKE_DEFAULT',
+                game_type=GameType.GENSHIN_IMPACT.name,
+            )
             OperatorFactory.create(
                 sub_layout,
                 'genshin.import_outline_lightmaps',
@@ -235,6 +298,7 @@ class GI_PT_UI_Outlines_Menu(Panel):
             sub_layout = layout.box()
             sub_layout.prop_search(scene, 'setup_wizard_material_for_material_data_import', bpy.data, 'materials')
             sub_layout.prop_search(scene, 'setup_wizard_outlines_material_for_material_data_import', bpy.data, 'materials')
+            sub_layout.prop(context.window_manager, 'setup_wizard_incremental_material_data_import_enabled')
             OperatorFactory.create(
                 sub_layout,
                 'genshin.import_material_data',
@@ -243,6 +307,14 @@ class GI_PT_UI_Outlines_Menu(Panel):
                 game_type=GameType.GENSHIN_IMPACT.name,
                 setup_mode='ADVANCED',
             )
+            OperatorFactory.create(
+                sub_layout,
+                'hoyoverse.compile_material_data_bundle',
+                'Compile Material Data Bundle',
+                'PACKAGE',
+                game_type=GameType.GENSHIN_IMPACT.name,
+                operator_context='INVOKE_DEFAULT',
+            )
         else:
             layout.label(text='(Outlines Disabled < v3.3.0)')
 
@@ -320,6 +392,13 @@ class GI_PT_UI_Character_Rig_Setup_Menu(Panel):
         character_rigger_props = context.scene.character_rigger_props
 
         OperatorFactory.create_rig_character_ui(box)
+        OperatorFactory.create(
+            box,
+            'hoyoverse.benchmark_rig_playback',
+            'Benchmark Rig Playback',
+            'TIME',
+            game_type=GameType.GENSHIN_IMPACT.name,
+        )
 
         box = sub_layout.box()        
         box.label(text='Settings')
@@ -340,6 +419,8 @@ class GI_PT_UI_Character_Rig_Setup_Menu(Panel):
         col.prop(character_rigger_props, 'use_leg_ik_poles')
         col.prop(character_rigger_props, 'add_children_of_constraints')
         col.prop(character_rigger_props, 'use_head_tracker')
+        col.prop(character_rigger_props, 'use_rig_cache')
+        col.prop(character_rigger_props, 'use_pupil_bones')
 
 
 class GI_PT_UI_Gran_Turismo_UI_Layout(Panel):
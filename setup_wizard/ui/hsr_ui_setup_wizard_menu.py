@@ -41,6 +41,10 @@ class HSR_PT_Setup_Wizard_UI_Layout(Panel):
             'TRASH',
             game_type=GameType.HONKAI_STAR_RAIL.name,
         )
+        layout.prop(window_manager, 'setup_wizard_link_shader_enabled')
+        layout.prop(window_manager, 'setup_wizard_multi_character_enabled')
+        if window_manager.setup_wizard_multi_character_enabled:
+            layout.prop(context.scene, 'setup_wizard_target_armature')
 
 
 class HSR_PT_Basic_Setup_Wizard_UI_Layout(Panel):
@@ -183,6 +187,7 @@ class HSR_PT_UI_Outlines_Menu(Panel):
                 'FILE_FOLDER',
                 game_type=GameType.HONKAI_STAR_RAIL.name,
             )
+            sub_layout.prop(context.window_manager, 'setup_wizard_shared_outline_materials_enabled')
             OperatorFactory.create(
                 sub_layout,
                 'genshin.setup_geometry_nodes',
@@ -190,6 +195,21 @@ class HSR_PT_UI_Outlines_Menu(Panel):
                 'GEOMETRY_NODES',
                 game_type=GameType.HONKAI_STAR_RAIL.name,
             )
+            OperatorFactory.create(
+                sub_layout,
+                'hoyoverse.bake_outline_normals',
+                'Bake Outline Normals',
+                'NORMALS_VERTEX',
+                game_type=GameType.HONKAI_STAR_RAIL.name,
+            )
+            OperatorFactory.create(
+                sub_layout,
+                'hoyoverse.set_up_outline_lod',
+                'Set Up Outline LOD',
+                'MOD_DECIM',
+                operator_context='INVOKE_DEFAULT',
+                game_type=GameType.HONKAI_STAR_RAIL.name,
+            )
             OperatorFactory.create(
                 sub_layout,
                 'genshin.import_outline_lightmaps',
@@ -197,6 +217,7 @@ class HSR_PT_UI_Outlines_Menu(Panel):
                 'FILE_FOLDER',
                 game_type=GameType.HONKAI_STAR_RAIL.name,
             )
+            sub_layout.prop(context.window_manager, 'setup_wizard_incremental_material_data_import_enabled')
             OperatorFactory.create(
                 sub_layout,
                 'genshin.import_material_data',
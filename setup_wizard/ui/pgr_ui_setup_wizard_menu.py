@@ -32,6 +32,42 @@ class UI_Properties:
             default = True
         )
 
+        bpy.types.WindowManager.setup_wizard_link_shader_enabled = bpy.props.BoolProperty(
+            name = "Link Shader",
+            description = "Link the shader node groups from the shader .blend file instead of appending a copy of them. "
+                "Keeps .blend files smaller and picks up shader updates, but the shader .blend file must stay in place",
+            default = False
+        )
+
+        bpy.types.WindowManager.setup_wizard_shared_outline_materials_enabled = bpy.props.BoolProperty(
+            name = "Shared Outline Materials",
+            description = "After the material data import, shader materials whose outline materials are identical "
+                "(same textures and outline colors) share one outline material instead of each keeping its own copy. "
+                "Reduces the number of materials in the scene",
+            default = False
+        )
+
+        bpy.types.WindowManager.setup_wizard_combined_outlines_modifier_enabled = bpy.props.BoolProperty(
+            name = "Single Outlines Modifier",
+            description = "Combine the Light Vectors and Outlines node groups into one node group so each mesh only "
+                "has a single Outlines modifier to evaluate",
+            default = False
+        )
+
+        bpy.types.WindowManager.setup_wizard_multi_character_enabled = bpy.props.BoolProperty(
+            name = "Multi-Character Scene",
+            description = "Set up more than one character in the scene. Steps only operate on the Target Armature, "
+                "shader node groups and textures are shared and each character's materials are renamed after it",
+            default = False
+        )
+
+        bpy.types.Scene.setup_wizard_target_armature = bpy.props.PointerProperty(
+            name = "Target Armature",
+            description = "Armature of the character being set up. Set automatically when a character model is imported",
+            type = bpy.types.Object,
+            poll = lambda self, object: object.type == 'ARMATURE'
+        )
+
 
 class PGR_PT_Setup_Wizard_UI_Layout(Panel):
     bl_label = "Punishing Gray Raven Setup Wizard"
@@ -83,6 +119,10 @@ class PGR_PT_Setup_Wizard_UI_Layout(Panel):
         # settings_box.prop(window_manager, 'setup_wizard_join_meshes_enabled')
         if rigging_global_settings_feature_flag:
             settings_box.prop(window_manager, 'setup_wizard_full_run_rigging_enabled')
+        settings_box.prop(window_manager, 'setup_wizard_link_shader_enabled')
+        settings_box.prop(window_manager, 'setup_wizard_multi_character_enabled')
+        if window_manager.setup_wizard_multi_character_enabled:
+            settings_box.prop(context.scene, 'setup_wizard_target_armature')
 
 class PGR_PT_Basic_Setup_Wizard_UI_Layout(Panel):
     bl_label = 'Basic Setup'
@@ -260,6 +300,8 @@ class PGR_PT_UI_Outlines_Menu(Panel):
                 'FILE_FOLDER',
                 game_type=GameType.PUNISHING_GRAY_RAVEN.name,
             )
+            sub_layout.prop(context.window_manager, 'setup_wizard_shared_outline_materials_enabled')
+            sub_layout.prop(context.window_manager, 'setup_wizard_combined_outlines_modifier_enabled')
             OperatorFactory.create(
                 sub_layout,
                 'genshin.setup_geometry_nodes',
@@ -267,6 +309,21 @@ class PGR_PT_UI_Outlines_Menu(Panel):
                 'GEOMETRY_NODES',
                 game_type=GameType.PUNISHING_GRAY_RAVEN.name,
             )
+            OperatorFactory.create(
+                sub_layout,
+                'hoyoverse.bake_outline_normals',
+                'Bake Outline Normals',
+                'NORMALS_VERTEX',
+                game_type=GameType.PUNISHING_GRAY_RAVEN.name,
+            )
+            OperatorFactory.create(
+                sub_layout,
+                'hoyoverse.set_up_outline_lod',
+                'Set Up Outline LOD',
+                'MOD_DECIM',
+                operator_context='INVOKE_DEFAULT',
+                game_type=GameType.PUNISHING_GRAY_RAVEN.name,
+            )
             OperatorFactory.create(
                 sub_layout,
                 'genshin.import_outline_lightmaps',
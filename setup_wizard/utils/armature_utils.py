@@ -0,0 +1,85 @@
+import bpy
+
+
+'''
+    The armature of the character being set up.
+    In order: the Target Armature set on the scene, the active/selected armature, the first armature in the scene.
+    With one character in the scene this is always the same armature, in a multi-character scene this scopes each
+    step to one character.
+'''
+def get_target_armature(context=None):
+    context = context or bpy.context
+    scene = context.scene
+
+    target_armature = getattr(scene, 'setup_wizard_target_armature', None)
+    if target_armature and target_armature.name in scene.objects:
+        return target_armature
+
+    active_armature = get_armature_of_object(context.view_layer.objects.active)
+    if active_armature:
+        return active_armature
+
+    selected_armatures = [object for object in context.selected_objects if object.type == 'ARMATURE'] if \
+        hasattr(context, 'selected_objects') else []
+    if selected_armatures:
+        return selected_armatures[0]
+
+    armatures = [object for object in scene.objects if object.type == 'ARMATURE']
+    return armatures[0] if armatures else None
+
+
+def set_target_armature(armature, context=None):
+    context = context or bpy.context
+    if hasattr(context.scene, 'setup_wizard_target_armature'):
+        context.scene.setup_wizard_target_armature = armature
+
+
+def is_multi_character_scene_enabled(context=None):
+    context = context or bpy.context
+    return getattr(context.window_manager, 'setup_wizard_multi_character_enabled', False)
+
+
+'''
+    Objects that belong to the armature: its (nested) children and objects deformed by it through an Armature modifier
+'''
+def get_objects_of_armature(armature, objects):
+    if not armature:
+        return []
+    return [
+        object for object in objects if
+            is_descendant_of(object, armature) or
+            [modifier for modifier in getattr(object, 'modifiers', []) if
+                modifier.type == 'ARMATURE' and modifier.object == armature]
+    ]
+
+
+'''
+    Scene objects the current step should operate on.
+    Multi-Character Scene: only the target character's armature and objects, otherwise every object in the scene.
+'''
+def get_character_objects(context=None):
+    context = context or bpy.context
+    scene_objects = list(context.scene.objects)
+
+    if not is_multi_character_scene_enabled(context):
+        return scene_objects
+
+    armature = get_target_armature(context)
+    return ([armature] if armature else []) + get_objects_of_armature(armature, scene_objects)
+
+
+def get_armature_of_object(object):
+    while object:
+        if object.type == 'ARMATURE':
+            return object
+        object = object.parent
+    return None
+
+
+def is_descendant_of(object, armature):
+    parent = object.parent
+    while parent:
+        if parent == armature:
+            return True
+        parent = parent.parent
+    return False
@@ -0,0 +1,226 @@
+import bpy
+import re
+
+
+'''
+    bpy.data attribute -> datablocks that were loaded, along with the names the .blend file did not have
+'''
+class LoadedDatablocks(dict):
+    def __init__(self, blend_file_path, datablocks, missing_datablock_names):
+        super().__init__(datablocks)
+        self.blend_file_path = blend_file_path
+        self.missing_datablock_names = missing_datablock_names  # bpy.data attribute -> names not in the file
+
+    def get_missing_datablock_names(self, data_attribute):
+        return self.missing_datablock_names.get(data_attribute, [])
+
+
+'''
+    Loads datablocks from a .blend file in a single read using bpy.data.libraries.load.
+    Unlike bpy.ops.wm.append, this does not re-open the .blend file for every datablock and does not need an
+    operator/UI context, so it also works in background mode.
+    Like bpy.ops.wm.append, names that are not in the .blend file are skipped with a warning (callers pass
+    alternative names, ex. the materials of every shader version), check missing_datablock_names if all are required.
+
+    datablock_names: bpy.data attribute -> names to load, ex. { 'materials': [...], 'node_groups': [...] }, or a
+        function that picks them from the names in the .blend file (the data_from of bpy.data.libraries.load), so the
+        names can depend on what the file has without reading the file twice
+    Returns: LoadedDatablocks, bpy.data attribute -> datablocks that were loaded
+'''
+def load_datablocks(blend_file_path, datablock_names, link=False, skip_existing=True):
+    select_datablock_names = datablock_names if callable(datablock_names) else None
+    if not select_datablock_names and skip_existing:
+        datablock_names = get_datablock_names_not_in_current_file(datablock_names)
+        if not any(datablock_names.values()):
+            # Don't open the .blend file
+            return LoadedDatablocks(blend_file_path, {data_attribute: [] for data_attribute in datablock_names.keys()}, {})
+
+    missing_datablock_names = {}
+    with bpy.data.libraries.load(blend_file_path, link=link) as (data_from, data_to):
+        if select_datablock_names:
+            datablock_names = select_datablock_names(data_from)
+            if skip_existing:
+                datablock_names = get_datablock_names_not_in_current_file(datablock_names)
+
+        for data_attribute, names in datablock_names.items():
+            names_in_blend_file = set(getattr(data_from, data_attribute))
+            setattr(data_to, data_attribute, [name for name in names if name in names_in_blend_file])
+            missing_names = [name for name in names if name not in names_in_blend_file]
+            if missing_names:
+                missing_datablock_names[data_attribute] = missing_names
+                print(f'WARNING: Did not find {data_attribute} {missing_names} in "{blend_file_path}"')
+
+    # data_to now holds the loaded datablocks instead of names, None if the datablock failed to load
+    return LoadedDatablocks(blend_file_path, {
+        data_attribute: [datablock for datablock in getattr(data_to, data_attribute) if datablock]
+            for data_attribute in datablock_names.keys()
+    }, missing_datablock_names)
+
+
+def get_datablock_names_not_in_current_file(datablock_names):
+    return {
+        data_attribute: [name for name in names if not getattr(bpy.data, data_attribute).get(name)]
+            for data_attribute, names in datablock_names.items()
+    }
+
+
+'''
+    Link Mode: makes the linked materials local so they can be cloned and have material data applied, along with the
+    given node groups (node groups that receive character specific textures/values) and the node groups nesting them.
+
+    Returns: the local materials
+'''
+def make_linked_materials_local(linked_materials, node_group_names):
+    local_materials = []
+    local_node_groups = {}
+    contains_cache = {}
+
+    for linked_material in linked_materials:
+        local_material = linked_material.make_local()
+        if local_material.node_tree:
+            make_nested_node_groups_local(local_material.node_tree, node_group_names, local_node_groups, contains_cache)
+        local_materials.append(local_material)
+    return local_materials
+
+
+'''
+    Linked node groups are read-only. Makes the given node groups local along with every node group that nests them,
+    top-down, so the setup can write character specific textures/values into them while the rest of the node groups
+    stay linked to the shader .blend file.
+
+    Each linked node group is made local once and every group node using it is pointed at the local node group.
+    make_local() returns a new local copy ('Body Shader.001') when the node group is still used by linked data, ex. by
+    the materials that are not made local yet, so pass the same local_node_groups for every material of the file.
+
+    local_node_groups: node group -> its local node group, filled in by the call
+    Returns: local_node_groups
+'''
+def make_nested_node_groups_local(node_tree, node_group_names, local_node_groups=None, contains_cache=None):
+    local_node_groups = {} if local_node_groups is None else local_node_groups
+    contains_cache = {} if contains_cache is None else contains_cache
+
+    for node in node_tree.nodes:
+        if node.type != 'GROUP' or not node.node_tree or \
+                not contains_node_groups(node.node_tree, node_group_names, contains_cache):
+            continue
+
+        node_group = node.node_tree
+        local_node_group = local_node_groups.get(node_group)
+        if local_node_group is None:
+            local_node_group = node_group.make_local() if node_group.library else node_group
+            local_node_groups[node_group] = local_node_group
+            local_node_groups[local_node_group] = local_node_group
+            node.node_tree = local_node_group
+            make_nested_node_groups_local(local_node_group, node_group_names, local_node_groups, contains_cache)
+        elif node_group != local_node_group:
+            node.node_tree = local_node_group
+    return local_node_groups
+
+
+def contains_node_groups(node_group, node_group_names, contains_cache):
+    cache_key = (node_group.name, node_group.library)
+    if cache_key not in contains_cache:
+        contains_cache[cache_key] = False  # Guard against recursion
+        contains_cache[cache_key] = node_group.name in node_group_names or any(
+            contains_node_groups(node.node_tree, node_group_names, contains_cache) for node in node_group.nodes if
+                node.type == 'GROUP' and node.node_tree
+        )
+    return contains_cache[cache_key]
+
+
+'''
+    Lists the datablock names inside a .blend file without loading any of them.
+
+    data_attributes: bpy.data attributes to list, ex. ['materials', 'node_groups']
+    Returns: bpy.data attribute -> datablock names
+'''
+def list_datablock_names(blend_file_path, data_attributes):
+    with bpy.data.libraries.load(blend_file_path) as (data_from, data_to):
+        return {data_attribute: list(getattr(data_from, data_attribute)) for data_attribute in data_attributes}
+
+
+DUPLICATE_NAME_PATTERN = re.compile(r'^(.+)\.\d{3,}$')
+
+
+'''
+    Loading the same shader .blend file again (ex. for a second character) appends another copy of every node group
+    that already exists ('Body Shader' -> 'Body Shader.001'). Remaps those copies back to the existing node groups so
+    they are shared, then removes the copies.
+    A copy is only shared if it is identical to the existing node group: the same interface, nodes (type, name, input
+    values, nested node groups) and links, so node groups of another shader version that use the same name are kept.
+
+    node_groups: the node groups that were just loaded
+    existing_node_group_names: names of the node groups that existed before loading
+    Returns: number of node groups that were shared instead of duplicated
+'''
+def share_duplicate_node_groups(node_groups, existing_node_group_names):
+    duplicate_node_groups = []
+    node_group_signatures = {}
+    for node_group in node_groups:
+        duplicate_name_match = DUPLICATE_NAME_PATTERN.match(node_group.name)
+        if not duplicate_name_match or duplicate_name_match.group(1) not in existing_node_group_names:
+            continue
+
+        existing_node_group = bpy.data.node_groups.get(duplicate_name_match.group(1))
+        if existing_node_group and get_node_group_signature(existing_node_group, node_group_signatures) == \
+                get_node_group_signature(node_group, node_group_signatures):
+            duplicate_node_groups.append((node_group, existing_node_group))
+
+    for duplicate_node_group, existing_node_group in duplicate_node_groups:
+        duplicate_node_group.user_remap(existing_node_group)
+    for duplicate_node_group, existing_node_group in duplicate_node_groups:
+        bpy.data.node_groups.remove(duplicate_node_group)
+    return len(duplicate_node_groups)
+
+
+'''
+    Hashable description of what a node group does, equal for a node group and its appended copies.
+    Names of the referenced datablocks are compared without their '.001' suffix, nested node groups by their signature.
+    node_group_signatures: node group name -> signature, reused between calls
+'''
+def get_node_group_signature(node_group, node_group_signatures):
+    if node_group.name in node_group_signatures:
+        return node_group_signatures[node_group.name]
+    node_group_signatures[node_group.name] = None  # Recursion guard
+
+    interface = tuple(
+        (item.item_type, item.name, getattr(item, 'in_out', None), getattr(item, 'socket_type', None),
+         get_value_signature(getattr(item, 'default_value', None), node_group_signatures))
+            for item in node_group.interface.items_tree
+    ) if hasattr(node_group, 'interface') else (
+        tuple((socket.bl_idname, socket.name) for socket in node_group.inputs),
+        tuple((socket.bl_idname, socket.name) for socket in node_group.outputs),
+    )
+    nodes = tuple(
+        (
+            node.name,
+            node.bl_idname,
+            get_value_signature(getattr(node, 'node_tree', None), node_group_signatures),
+            get_value_signature(getattr(node, 'image', None), node_group_signatures),
+            tuple(
+                get_value_signature(getattr(socket, 'default_value', None), node_group_signatures)
+                    for socket in (*node.inputs, *node.outputs)
+            ),
+        ) for node in sorted(node_group.nodes, key=lambda node: node.name)
+    )
+    links = frozenset(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+            for link in node_group.links
+    )
+
+    signature = (node_group.bl_idname, interface, nodes, links)
+    node_group_signatures[node_group.name] = signature
+    return signature
+
+
+def get_value_signature(value, node_group_signatures):
+    if isinstance(value, bpy.types.NodeTree):
+        return get_node_group_signature(value, node_group_signatures)
+    if isinstance(value, bpy.types.ID):
+        duplicate_name_match = DUPLICATE_NAME_PATTERN.match(value.name)
+        return duplicate_name_match.group(1) if duplicate_name_match else value.name
+    if isinstance(value, float):
+        return round(value, 6)
+    if hasattr(value, '__len__') and not isinstance(value, str):
+        return tuple(get_value_signature(item, node_group_signatures) for item in value)
+    return value
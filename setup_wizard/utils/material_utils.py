@@ -1,4 +1,80 @@
+import bpy
+
+
 def add_fake_user_to_materials(materials):
     for material in materials:
         if material:
             material.use_fake_user = True
+
+
+# Custom property on a shader material pointing to its outline material when outline materials are shared
+OUTLINES_MATERIAL_PROPERTY_NAME = 'Outlines Material'
+
+
+def get_outlines_material(material):
+    if not material:
+        return None
+    return material.get(OUTLINES_MATERIAL_PROPERTY_NAME) or bpy.data.materials.get(f'{material.name} Outlines')
+
+
+def set_outlines_material(material, outlines_material):
+    material[OUTLINES_MATERIAL_PROPERTY_NAME] = outlines_material
+
+
+'''
+    Shader materials whose outline materials are identical (same nodes, images, links and input values, so also the
+    same Material Data outline colors) share the first of those outline materials, the duplicates are removed.
+    Run after the outline textures and material data are applied, later changes to a shared outline material apply to
+    every shader material sharing it.
+    Returns: (number of shader materials, number of outline materials they use)
+'''
+def share_identical_outlines_materials(shader_materials):
+    outlines_materials_by_signature = {}
+    number_of_shader_materials = 0
+
+    for shader_material in dict.fromkeys(shader_materials):
+        outlines_material = get_outlines_material(shader_material)
+        if not outlines_material:
+            continue
+        number_of_shader_materials += 1
+
+        shared_outlines_material = outlines_materials_by_signature.setdefault(
+            get_material_signature(outlines_material), outlines_material
+        )
+        set_outlines_material(shader_material, shared_outlines_material)
+        if shared_outlines_material != outlines_material:
+            # Modifier inputs and outline material pointers of other shader materials
+            outlines_material.user_remap(shared_outlines_material)
+            bpy.data.materials.remove(outlines_material)
+
+    return number_of_shader_materials, len(outlines_materials_by_signature)
+
+
+def get_material_signature(material):
+    if not material.node_tree:
+        return (material.name,)
+    nodes = tuple(
+        (
+            node.name,
+            node.bl_idname,
+            getattr(getattr(node, 'image', None), 'name', None),
+            getattr(getattr(node, 'node_tree', None), 'name', None),
+            tuple(get_socket_default_value(socket) for socket in (*node.inputs, *node.outputs)),
+        ) for node in sorted(material.node_tree.nodes, key=lambda node: node.name)
+    )
+    links = frozenset(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+            for link in material.node_tree.links
+    )
+    return (nodes, links)
+
+
+def get_socket_default_value(socket):
+    default_value = getattr(socket, 'default_value', None)
+    if hasattr(default_value, '__len__') and not isinstance(default_value, str):
+        return tuple(round(value, 6) for value in default_value)
+    if isinstance(default_value, float):
+        return round(default_value, 6)
+    if isinstance(default_value, bpy.types.ID):
+        return default_value.name
+    return default_value
@@ -0,0 +1,44 @@
+from bisect import bisect_left
+
+
+'''
+    Index of mesh object names, built once per setup step, to find the objects for a body part name without scanning
+    every object in the scene for every body part name.
+
+    find(name) matches the same objects as `object.name == name or f'_{name}' in object.name`:
+    the exact name, or any name containing '_<name>' (ex. 'Body' -> 'Avatar_Body', 'NPC_Body.001').
+    Every text following an underscore is indexed in a sorted list so '_<name>' lookups are a binary search.
+'''
+class MeshNameIndex:
+    def __init__(self, objects):
+        self.mesh_objects = [object for object in objects if object.type == 'MESH']
+        self.position_by_name = {object.name: position for position, object in enumerate(self.mesh_objects)}
+        self.underscore_suffixes = sorted(
+            (object.name[underscore_index + 1:], position) for position, object in enumerate(self.mesh_objects)
+                for underscore_index, character in enumerate(object.name) if character == '_'
+        )
+        self.lowercase_names = [(object.name.lower(), position) for position, object in enumerate(self.mesh_objects)]
+
+    '''
+        Returns: matching mesh objects, in scene order
+    '''
+    def find(self, name):
+        positions = set()
+        if name in self.position_by_name:
+            positions.add(self.position_by_name[name])
+
+        index = bisect_left(self.underscore_suffixes, (name, -1))
+        while index < len(self.underscore_suffixes) and self.underscore_suffixes[index][0].startswith(name):
+            positions.add(self.underscore_suffixes[index][1])
+            index += 1
+        return [self.mesh_objects[position] for position in sorted(positions)]
+
+    '''
+        Case-insensitive substring match (PGR), ex. 'down' -> 'Cloth_Down01'
+    '''
+    def find_containing(self, name):
+        name = name.lower()
+        return [self.mesh_objects[position] for lowercase_name, position in self.lowercase_names if name in lowercase_name]
+
+    def __len__(self):
+        return len(self.mesh_objects)